@@ -78,3 +78,21 @@ async def get_current_user(
         "budget": current_user.budget,
         "preferences": current_user.preferences
     }
+
+async def get_current_admin(
+    authorization: str = Header(None),
+    db: Session = Depends(get_db)
+) -> User:
+    """Dependency for admin-only routes: the authenticated user, who must be an admin."""
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Invalid authorization header")
+    
+    token = authorization.replace("Bearer ", "")
+    current_user = auth_service.get_current_user(db, token)
+    
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if not auth_service.is_admin(current_user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    return current_user
@@ -1,16 +1,107 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
-import re
+from typing import AsyncIterator, List, Optional
+import asyncio
+import json
 
+from app.api.routes.auth import get_current_admin
+from app.core.config import settings
 from app.core.database import get_db
+from app.models.user import User
 from app.services.domain_scoring import domain_scoring_service
-from app.schemas.domain import DomainScore, DomainTradeRequest
+from app.services.name_generator import name_candidate_generator
+from app.services.scoring_config import scoring_config_store
+from app.services.scoring_executor import scoring_executor
+from app.schemas.domain import (
+    DomainScore,
+    DomainTradeRequest,
+    DomainBatchScoreRequest,
+    DomainBatchScoreResponse,
+    DomainRankRequest,
+    DomainRankResponse,
+)
 from app.services.doma_integration import DomaIntegrationService
 
 router = APIRouter()
 doma_service = DomaIntegrationService()
 
+# Longest line accepted by the streaming endpoint (domains are at most 253 chars)
+MAX_STREAM_LINE_BYTES = 1024
+
+class BodyStreamingResponse(StreamingResponse):
+    """StreamingResponse that leaves ``receive`` to a body being read while streaming.
+
+    The stock response listens for client disconnects on ``receive``, which would
+    swallow request body chunks that the body iterator has not read yet.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+async def _iter_request_lines(request: Request) -> AsyncIterator[str]:
+    """Yield the lines of the request body as they arrive, without buffering it.
+    
+    Lines longer than MAX_STREAM_LINE_BYTES are truncated and the rest of the
+    line is skipped, so a body without newlines cannot grow the buffer.
+    """
+    buffer = b""
+    skipping = False
+    async for chunk in request.stream():
+        buffer += chunk
+        lines = buffer.split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            if skipping:
+                skipping = False
+                continue
+            yield line.decode("utf-8", errors="replace")
+        
+        if len(buffer) > MAX_STREAM_LINE_BYTES:
+            if not skipping:
+                yield buffer[:MAX_STREAM_LINE_BYTES].decode("utf-8", errors="replace")
+                skipping = True
+            buffer = b""
+    
+    if buffer and not skipping:
+        yield buffer.decode("utf-8", errors="replace")
+
+async def _score_lines(lines: List[str]) -> List[str]:
+    """Score one micro-batch of lines, returning NDJSON rows in input order."""
+    parsed = [domain_scoring_service.parser.try_parse(line) for line in lines]
+    valid = [record for record in parsed if record is not None]
+    rows = iter([])
+    if valid:
+        batch = await run_in_threadpool(domain_scoring_service.score_domains, valid)
+        rows = batch.iter_rows()
+    
+    output = []
+    for line, record in zip(lines, parsed):
+        if record is not None:
+            output.append(json.dumps(next(rows)) + "\n")
+        else:
+            output.append(json.dumps({"domain": line, "error": "Invalid domain format"}) + "\n")
+    return output
+
+async def _stream_scores(request: Request) -> AsyncIterator[str]:
+    """Read, validate and score uploaded domains in micro-batches."""
+    batch_size = settings.SCORING_STREAM_BATCH_SIZE
+    lines = []
+    async for line in _iter_request_lines(request):
+        line = line.strip()
+        if not line:
+            continue
+        lines.append(line)
+        if len(lines) >= batch_size:
+            yield "".join(await _score_lines(lines))
+            lines = []
+    
+    if lines:
+        yield "".join(await _score_lines(lines))
+
 @router.get("/score", response_model=DomainScore)
 async def get_domain_score(
     domain: str = Query(..., description="Domain name to score"),
@@ -18,11 +109,7 @@ async def get_domain_score(
 ):
     """Get domain score and valuation."""
     try:
-        # Validate domain format
-        if not re.match(r'^[a-zA-Z0-9][a-zA-Z0-9-]{0,61}[a-zA-Z0-9]?\.[a-zA-Z]{2,}$', domain):
-            raise HTTPException(status_code=400, detail="Invalid domain format")
-        
-        # Score the domain
+        # Score the domain (the parser rejects malformed names with ValueError)
         score_result = domain_scoring_service.score_domain(domain)
         
         return score_result
@@ -32,6 +119,125 @@ async def get_domain_score(
     except Exception as e:
         raise HTTPException(status_code=500, detail="Error scoring domain")
 
+@router.post("/score/stream")
+async def stream_domain_scores(request: Request):
+    """Score a newline-delimited upload of domains, streaming back NDJSON rows.
+    
+    The body is read and scored in micro-batches, so memory use stays constant
+    regardless of upload size. Invalid lines produce an ``error`` row in place.
+    """
+    return BodyStreamingResponse(_stream_scores(request), media_type="application/x-ndjson")
+
+@router.get("/candidates", response_model=List[DomainScore])
+async def get_name_candidates(
+    tlds: str = Query("eth", description="Comma-separated TLDs to search, e.g. eth,ai"),
+    max_length: int = Query(6, ge=1, le=15, description="Maximum name length"),
+    limit: int = Query(20, ge=1, le=100),
+    check_availability: bool = Query(False, description="Only return names available on Doma"),
+    db: Session = Depends(get_db)
+):
+    """Find the highest-scoring names up to ``max_length`` characters for the given TLDs."""
+    try:
+        # Over-fetch when filtering, since some of the best names will be taken
+        k = limit * 3 if check_availability else limit
+        candidates = await run_in_threadpool(
+            name_candidate_generator.search_scored, tlds.split(","), max_length=max_length, k=k
+        )
+        
+        if check_availability:
+            infos = await asyncio.gather(
+                *(doma_service.get_domain_info(candidate.domain) for candidate in candidates)
+            )
+            candidates = [
+                candidate for candidate, info in zip(candidates, infos) if info.get("is_available")
+            ]
+        
+        return candidates[:limit]
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Error generating name candidates")
+
+@router.get("/score/cache/stats")
+async def get_score_cache_stats():
+    """Get hit, miss and eviction counters of the domain score cache."""
+    return {
+        "model_version": domain_scoring_service.model_version,
+        "config_version": domain_scoring_service.config.version,
+        "deterministic_valuation": domain_scoring_service.deterministic_valuation,
+        **domain_scoring_service.score_cache.stats(),
+    }
+
+@router.get("/score/config")
+async def get_scoring_config():
+    """Get the scoring config snapshot currently in use."""
+    return scoring_config_store.current.to_dict()
+
+@router.post("/score/config/reload")
+async def reload_scoring_config(admin: User = Depends(get_current_admin)):
+    """Reload the scoring config from SCORING_CONFIG_PATH and swap it in (admins only)."""
+    try:
+        config = await run_in_threadpool(scoring_config_store.reload)
+        return {"version": config.version, "source": config.source, "loaded_at": config.loaded_at.isoformat()}
+    except (ValueError, OSError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid scoring config: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Error reloading scoring config")
+
+def _parse_domains(domains: List[str]) -> list:
+    """Parse every domain, rejecting the request if any of them is malformed."""
+    parser = domain_scoring_service.parser
+    parsed = [parser.try_parse(domain) for domain in domains]
+    invalid = [domain for domain, record in zip(domains, parsed) if record is None]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "Invalid domain format", "domains": invalid[:100]}
+        )
+    return parsed
+
+@router.post("/score/batch", response_model=DomainBatchScoreResponse)
+async def score_domains_batch(
+    request: DomainBatchScoreRequest,
+    db: Session = Depends(get_db)
+):
+    """Score a batch of domains and return the results as columns."""
+    parsed = _parse_domains(request.domains)
+    
+    try:
+        batch = await scoring_executor.score_domains(parsed)
+        return DomainBatchScoreResponse(count=len(batch), **batch.to_dict())
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Error scoring domains")
+
+@router.post("/score/rank", response_model=DomainRankResponse)
+async def rank_domains(
+    request: DomainRankRequest,
+    db: Session = Depends(get_db)
+):
+    """Score a batch of domains and return the ``limit`` best, optionally under one TLD.
+    
+    Results are held in a trait store, so reasoning is only generated for the
+    domains returned.
+    """
+    parsed = _parse_domains(request.domains)
+    
+    try:
+        store = domain_scoring_service.create_trait_store()
+        await scoring_executor.score_domains(parsed, store=store)
+        matched = len(store) if request.tld is None else len(store.filter_by_tld(request.tld))
+        results = [store.get(int(index)) for index in store.top_k(request.limit, request.tld)]
+        return DomainRankResponse(count=len(store), matched=matched, results=results)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Error ranking domains")
+
 @router.get("/doma/domain/{domain_name}")
 async def get_doma_domain_info(
     domain_name: str,
@@ -53,16 +53,27 @@ async def get_domain_recommendation(
 async def submit_recommendation_feedback(
     recommendation_id: int,
     feedback: str = Query(..., pattern="^(buy|sell|hold|ignore)$"),
+    domain: Optional[str] = Query(None, description="Domain, if the recommendation is not stored"),
+    realized_price: Optional[int] = Query(None, ge=0, description="Realized sale price in USD cents"),
     db: Session = Depends(get_db),
     current_user: User = Depends(auth_service.get_current_user)
 ):
     """Submit feedback on a recommendation."""
     try:
-        result = recommendation_service.submit_feedback(
+        row = recommendation_service.submit_feedback(
             db, 
             recommendation_id, 
-            feedback
+            feedback,
+            domain=domain,
+            realized_price=realized_price,
+            user_id=current_user.id if current_user else None
         )
-        return {"success": True, "message": "Feedback submitted successfully"}
+        return {
+            "success": True,
+            "message": "Feedback submitted successfully",
+            "used_for_training": row.features is not None and row.realized_price is not None
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error submitting feedback: {str(e)}")
@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with an optional per-entry TTL."""
+
+    def __init__(self, max_size: int = 10000, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` and mark it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store ``value``, evicting the least recently used entry when full."""
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit, miss, eviction and expiration counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+class AsyncTTLCache:
+    """Async TTL cache with single-flight loads and stale-while-revalidate.
+
+    ``get_or_load`` returns a fresh entry directly. Concurrent misses for one
+    key share a single ``loader`` call. An entry past ``ttl`` but within
+    ``stale_ttl`` more seconds is still returned immediately while one
+    background refresh runs. Values rejected by ``should_cache`` (by default
+    ``None``) and failed loads are never stored, so a failed refresh keeps
+    serving the last good value. Meant for one event loop; not thread-safe.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        stale_ttl: float = 0.0,
+        max_size: int = 1000,
+        should_cache: Callable[[Any], bool] = lambda value: value is not None
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self.should_cache = should_cache
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        refresh: bool = False
+    ) -> Any:
+        """Cached value for ``key``, calling ``loader()`` at most once at a time per key.
+
+        With ``refresh`` the cached entry is ignored and a (shared) load awaited.
+        """
+        entry = None if refresh else self._entries.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            if age < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._load(key, loader)
+                return value
+
+        self.misses += 1
+        # Shielded so one cancelled caller does not cancel the load for the others
+        return await asyncio.shield(self._load(key, loader))
+
+    def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._inflight = {}
+            self._loop = loop
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return task
+
+        self.loads += 1
+        task = loop.create_task(self._run_loader(key, loader))
+        task.add_done_callback(self._log_failure)
+        self._inflight[key] = task
+        return task
+
+    async def _run_loader(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await loader()
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        if self.should_cache(value):
+            self.set(key, value)
+        return value
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task):
+        # Also marks the exception as retrieved for loads nobody awaits anymore
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Error loading cache entry: {str(task.exception())}")
+
+    def set(self, key: Hashable, value: Any):
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry; counters are kept."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit, stale-hit, miss, load and coalescing counters."""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "stale_ttl_seconds": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "loads": self.loads,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "in_flight": len(self._inflight),
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+        }
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
 
 class Settings(BaseSettings):
@@ -15,6 +15,7 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-here"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    ADMIN_WALLET_ADDRESSES: List[str] = []  # wallets allowed to reload configs and swap models
     
     # CORS
     ALLOWED_ORIGINS: List[str] = [
@@ -36,6 +37,63 @@ class Settings(BaseSettings):
     
     # External APIs
     DOMAIN_ORACLE_URL: str = "https://api.domainoracle.com"
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_HOST_TIMEOUTS: Dict[str, float] = {}  # per-host overrides, e.g. {"api.opensea.io": 5}
+    HTTP_MAX_CONNECTIONS: int = 20  # per upstream host
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP2_ENABLED: bool = True  # used when the h2 package is installed
+    MARKET_DATA_CACHE_TTL_SECONDS: float = 300.0
+    MARKET_DATA_CACHE_STALE_SECONDS: float = 900.0  # serve expired entries this long while refreshing
+    MARKET_DATA_CACHE_SIZE: int = 1000
+    MARKET_DATA_UPSTREAM_CONCURRENCY: int = 8  # concurrent calls per upstream API
+    MARKET_DATA_SOURCE_TIMEOUT_SECONDS: float = 5.0  # per analytics source; late sources are left out
+    MARKET_DATA_SOURCE_TIMEOUTS: Dict[str, float] = {}  # per-source overrides, e.g. {"market": 8}
+    MARKET_REFRESH_ENABLED: bool = True  # background refresh of prices, ENS and Doma data
+    MARKET_REFRESH_PRICES_SECONDS: float = 60.0
+    MARKET_REFRESH_ENS_SECONDS: float = 240.0  # keep below MARKET_DATA_CACHE_TTL_SECONDS
+    MARKET_REFRESH_DOMA_SECONDS: float = 120.0
+    MARKET_REFRESH_TRENDS_SECONDS: float = 240.0  # recommendation candidates; their features are precomputed
+    MARKET_REFRESH_JITTER: float = 0.1  # intervals vary by +/- this fraction
+    MARKET_REFRESH_MAX_AGE_INTERVALS: float = 3.0  # older snapshots are refetched instead of served
+    
+    # Domain scoring
+    SCORING_MODEL_VERSION: str = "1"
+    SCORING_CONFIG_PATH: Optional[str] = None  # JSON file overriding the built-in scoring tables
+    SCORING_DETERMINISTIC_VALUATION: bool = True
+    SCORE_CACHE_SIZE: int = 10000
+    SCORE_CACHE_TTL_SECONDS: int = 3600
+    SCORING_WORKERS: Optional[int] = None  # defaults to the number of CPUs
+    SCORING_CHUNK_SIZE: int = 20000
+    SCORING_STREAM_BATCH_SIZE: int = 1000
+    PUBLIC_SUFFIX_LIST_PATH: Optional[str] = None
+    CANDIDATE_SEARCH_MAX_NODES: int = 100000
+    
+    # AI recommendation model
+    AI_MODEL_DIR: str = "models"  # relative paths resolve against the backend directory
+    AI_MODEL_VERSION: Optional[str] = None  # defaults to the version in AI_MODEL_DIR/LATEST
+    AI_MODEL_POLL_SECONDS: float = 60.0  # follow LATEST when another process publishes a model; 0 disables
+    AI_MODEL_REQUIRED: bool = True  # refuse to start without a trained model; false serves heuristic valuations
+    AI_ANALYSIS_WORKERS: int = 4  # threads running synchronous analysis
+    AI_ANALYSIS_MAX_QUEUE: int = 64  # jobs handed to the pool beyond the running ones
+    AI_ANALYSIS_CACHE_SIZE: int = 20000  # domain-level analyses shared across users
+    AI_ANALYSIS_CACHE_TTL_SECONDS: int = 300
+    FEATURE_STORE_PATH: Optional[str] = "data/feature_store.db"  # SQLite file shared by the apps; in-memory when unset
+    FEATURE_STORE_HOT_SIZE: int = 50000
+    AI_RETRAIN_ENABLED: bool = False  # periodic retraining from feedback in main.py; main-real.py follows LATEST
+    AI_RETRAIN_INTERVAL_SECONDS: int = 86400
+    AI_RETRAIN_WINDOW_DAYS: int = 90  # sliding window of realized sales to fit on
+    AI_RETRAIN_MIN_SAMPLES: int = 200  # skip passes with fewer sales in the window
+    AI_RETRAIN_MAX_SAMPLES: int = 100000
+    AI_RETRAIN_N_JOBS: int = 1  # training threads in the retraining process
+    AI_RETRAIN_NICE: int = 10  # niceness increment of the retraining process
+    
+    # Observability
+    METRICS_ENABLED: bool = False  # per-stage span histograms, exported at /metrics
+    PROFILING_ENABLED: bool = False  # sample requests that send an X-Profile header
+    PROFILING_TOKEN: Optional[str] = None  # required X-Profile value when set
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILE_DIR: str = "profiles"  # relative paths resolve against the backend directory
     
     class Config:
         env_file = ".env"
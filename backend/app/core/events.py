@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+class Snapshot(NamedTuple):
+    topic: str
+    data: Any
+    version: int
+    published_at: datetime
+    published_monotonic: float
+
+    def age(self) -> float:
+        return time.monotonic() - self.published_monotonic
+
+class MarketDataBus:
+    """In-process publish/subscribe for market data snapshots.
+
+    ``publish`` keeps the latest snapshot per topic, so request handlers read
+    current data from memory with ``latest``. Subscribers get every new
+    snapshot on their own bounded queue; a slow subscriber loses its oldest
+    queued snapshots instead of blocking the publisher. Meant for one event
+    loop; not thread-safe.
+    """
+
+    def __init__(self, queue_size: int = 16):
+        self.queue_size = queue_size
+        self._latest: Dict[str, Snapshot] = {}
+        self._subscribers: Dict[Optional[str], List[asyncio.Queue]] = {}
+        self.published = 0
+        self.dropped = 0
+
+    def publish(self, topic: str, data: Any) -> Snapshot:
+        previous = self._latest.get(topic)
+        snapshot = Snapshot(
+            topic, data, previous.version + 1 if previous else 1, datetime.utcnow(), time.monotonic()
+        )
+        self._latest[topic] = snapshot
+        self.published += 1
+        for queue in self._subscribers.get(topic, []) + self._subscribers.get(None, []):
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(snapshot)
+        return snapshot
+
+    def latest(self, topic: str, max_age: Optional[float] = None) -> Optional[Snapshot]:
+        """Last snapshot for ``topic``; None if there is none or it is older than ``max_age``."""
+        snapshot = self._latest.get(topic)
+        if snapshot is None or (max_age is not None and snapshot.age() > max_age):
+            return None
+        return snapshot
+
+    def subscribe(self, topic: Optional[str] = None) -> asyncio.Queue:
+        """Queue receiving new snapshots for ``topic`` (every topic if None)."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(topic, []).append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        for topic, queues in list(self._subscribers.items()):
+            if queue in queues:
+                queues.remove(queue)
+                if not queues:
+                    del self._subscribers[topic]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "published": self.published,
+            "dropped": self.dropped,
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            "topics": {
+                topic: {
+                    "version": snapshot.version,
+                    "published_at": snapshot.published_at.isoformat(),
+                    "age_seconds": snapshot.age(),
+                }
+                for topic, snapshot in self._latest.items()
+            },
+        }
+
+# Global instance
+market_data_bus = MarketDataBus()
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (httpx negotiates HTTP/2 only when h2 is installed)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+class HostPool:
+    """Pooled client for one upstream origin plus its request counters."""
+
+    def __init__(self, origin: str, client: httpx.AsyncClient, timeout: float):
+        self.origin = origin
+        self.client = client
+        self.timeout = timeout
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def connections(self) -> Dict[str, int]:
+        """Open and idle connections, read from the underlying httpcore pool."""
+        pool = getattr(getattr(self.client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        return {
+            "open": len(connections),
+            "idle": sum(1 for connection in connections if connection.is_idle()),
+        }
+
+class HTTPClientRegistry:
+    """Application-scoped ``httpx.AsyncClient`` pools, one per upstream origin.
+
+    Requests reuse keep-alive connections (HTTP/2 where the server and the
+    ``h2`` package support it) instead of paying TCP+TLS setup per call.
+    Each origin gets its own pool limits and timeout (``HTTP_HOST_TIMEOUTS``
+    overrides ``HTTP_TIMEOUT_SECONDS`` per host). Each app's lifespan creates
+    the clients for its known upstreams with ``open`` and closes them with
+    ``aclose``; any other origin gets a client on first use.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        timeout: Optional[float] = None,
+        host_timeouts: Optional[Dict[str, float]] = None,
+        http2: Optional[bool] = None
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections or settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=max_keepalive_connections or settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=keepalive_expiry or settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        self.timeout = timeout or settings.HTTP_TIMEOUT_SECONDS
+        self.host_timeouts = dict(host_timeouts if host_timeouts is not None else settings.HTTP_HOST_TIMEOUTS)
+        self.http2 = (settings.HTTP2_ENABLED if http2 is None else http2) and HTTP2_AVAILABLE
+        self._pools: Dict[str, HostPool] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing: Set[asyncio.Future] = set()
+
+    def timeout_for(self, host: str) -> float:
+        return self.host_timeouts.get(host, self.timeout)
+
+    def open(self, urls: Iterable[str]):
+        """Create the pools for ``urls``' origins on the running event loop."""
+        for url in urls:
+            self.pool(url)
+
+    def _bind_loop(self):
+        # Connections belong to the event loop that opened them
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        stale, self._pools = list(self._pools.values()), {}
+        if stale:
+            previous = self._loop
+            if previous is not None and previous.is_running():
+                future = asyncio.run_coroutine_threadsafe(self._close_pools(stale), previous)
+            else:
+                future = loop.create_task(self._close_pools(stale))
+            self._closing.add(future)
+            future.add_done_callback(self._closing.discard)
+        self._loop = loop
+
+    def pool(self, url: str) -> HostPool:
+        """The pool for ``url``'s origin, created on first use."""
+        self._bind_loop()
+        parsed = httpx.URL(url)
+        origin = f"{parsed.scheme}://{parsed.host}" + (f":{parsed.port}" if parsed.port else "")
+        pool = self._pools.get(origin)
+        if pool is None or pool.client.is_closed:
+            timeout = self.timeout_for(parsed.host)
+            client = httpx.AsyncClient(limits=self.limits, timeout=timeout, http2=self.http2)
+            pool = self._pools[origin] = HostPool(origin, client, timeout)
+            logger.info(f"Opened HTTP pool for {origin} (http2={self.http2}, timeout={timeout}s)")
+        return pool
+
+    def client(self, url: str) -> httpx.AsyncClient:
+        """Shared client for ``url``'s origin; do not close it."""
+        return self.pool(url).client
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        pool = self.pool(url)
+        pool.requests += 1
+        pool.in_flight += 1
+        pool.max_in_flight = max(pool.max_in_flight, pool.in_flight)
+        try:
+            return await pool.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            pool.errors += 1
+            raise
+        finally:
+            pool.in_flight -= 1
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self):
+        """Close every pooled client; new ones are created on next use."""
+        pools, self._pools = self._pools, {}
+        await self._close_pools(list(pools.values()))
+
+    async def _close_pools(self, pools: List[HostPool]):
+        for pool in pools:
+            try:
+                await pool.client.aclose()
+            except Exception as e:
+                logger.error(f"Error closing HTTP pool for {pool.origin}: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-origin request counters and connection pool utilization."""
+        return {
+            "http2": self.http2,
+            "max_connections_per_host": self.limits.max_connections,
+            "max_keepalive_per_host": self.limits.max_keepalive_connections,
+            "hosts": {
+                origin: {
+                    "requests": pool.requests,
+                    "errors": pool.errors,
+                    "in_flight": pool.in_flight,
+                    "max_in_flight": pool.max_in_flight,
+                    "timeout_seconds": pool.timeout,
+                    "connections": pool.connections(),
+                }
+                for origin, pool in list(self._pools.items())
+            },
+        }
+
+# Global instance
+http_clients = HTTPClientRegistry()
@@ -0,0 +1,142 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, Optional, Sequence
+
+from app.core.config import settings
+
+# Upper bounds in seconds, from 0.5ms to 10s
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+class Histogram:
+    """Thread-safe fixed-bucket histogram, e.g. for latencies in seconds.
+
+    Observations are counted into cumulative-style buckets like a Prometheus
+    histogram; quantiles are estimated by linear interpolation inside the
+    bucket that contains them.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._lock = threading.Lock()
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the wall time spent in the ``with`` block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated ``q`` quantile (0-1), or None before the first observation."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self.count
+            observed_max = self.max
+        if total == 0:
+            return None
+
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else observed_max
+                upper = min(upper, observed_max)
+                return lower + (upper - lower) * max(0.0, rank - seen) / count
+            seen += count
+        return observed_max
+
+    def stats(self) -> Dict[str, Any]:
+        """Return count, sum, mean, max and p50/p95/p99 estimates."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+    def buckets_snapshot(self) -> Dict[str, int]:
+        """Cumulative count per upper bound (``le``), Prometheus style."""
+        with self._lock:
+            counts = list(self._counts)
+        snapshot = {}
+        cumulative = 0
+        for bound, count in zip(list(self.buckets) + ["+Inf"], counts):
+            cumulative += count
+            snapshot[str(bound)] = cumulative
+        return snapshot
+
+class SpanTimer:
+    """Latency histograms per named stage, filled by ``span`` blocks.
+
+    Opt-in: while disabled, ``span`` hands out a shared no-op context manager,
+    so stages can stay instrumented on hot paths. ``render_prometheus`` exports
+    every histogram in the Prometheus text format.
+    """
+
+    def __init__(self, enabled: bool = False, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self._noop = nullcontext()
+
+    def histogram(self, name: str) -> Histogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram(self.buckets))
+        return histogram
+
+    def span(self, name: str) -> ContextManager[None]:
+        """Time the ``with`` block into the ``name`` histogram when enabled."""
+        if not self.enabled:
+            return self._noop
+        return self.histogram(name).time()
+
+    def observe(self, name: str, seconds: float):
+        if self.enabled:
+            self.histogram(name).observe(seconds)
+
+    def _items(self) -> list:
+        with self._lock:
+            return sorted(self._histograms.items())
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: histogram.stats() for name, histogram in self._items()}
+
+    def render_prometheus(self, metric: str = "doma_span_seconds") -> str:
+        """Every span histogram as ``<metric>{span="..."}`` buckets, sum and count."""
+        lines = [f"# HELP {metric} Wall time per instrumented stage.", f"# TYPE {metric} histogram"]
+        for name, histogram in self._items():
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            for bound, count in histogram.buckets_snapshot().items():
+                lines.append(f'{metric}_bucket{{span="{label}",le="{bound}"}} {count}')
+            lines.append(f'{metric}_sum{{span="{label}"}} {histogram.sum}')
+            lines.append(f'{metric}_count{{span="{label}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+# Global instance
+spans = SpanTimer(enabled=settings.METRICS_ENABLED)
@@ -0,0 +1,115 @@
+import hmac
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+# Requests carrying this header (matching PROFILING_TOKEN, when set) are profiled
+PROFILE_HEADER = "X-Profile"
+PROFILE_SUFFIX = ".folded"
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Leaf frames of threads that are parked rather than working
+IDLE_FRAMES = frozenset({
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+})
+
+class SamplingProfiler:
+    """Samples the Python stacks of every thread at a fixed interval.
+
+    Samples are aggregated into folded stacks (``thread;outer;...;inner count``),
+    the input format of flamegraph.pl, inferno and speedscope. Parked threads
+    (idle event loop, idle pool workers) are skipped, so the profile shows where
+    the process was busy while it ran, including other in-flight requests.
+    """
+
+    def __init__(self, interval: Optional[float] = None, max_depth: int = 128):
+        self.interval = interval or settings.PROFILING_INTERVAL_MS / 1000
+        self.max_depth = max_depth
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = self._stack(frame)
+                if stack:
+                    self._stacks[(names.get(thread_id, str(thread_id)),) + stack] += 1
+            self.samples += 1
+
+    def _stack(self, frame) -> Tuple[str, ...]:
+        code = frame.f_code
+        if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+            return ()
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return tuple(reversed(stack))
+
+    def folded(self) -> str:
+        """Collapsed stacks, one ``frame;frame;... count`` line per distinct stack."""
+        return "".join(
+            f"{';'.join(frame.replace(';', ':') for frame in stack)} {count}\n"
+            for stack, count in self._stacks.most_common()
+        )
+
+def profile_requested(header_value: Optional[str]) -> bool:
+    """Whether a request with this ``X-Profile`` header value should be profiled."""
+    if not settings.PROFILING_ENABLED or not header_value:
+        return False
+    if settings.PROFILING_TOKEN:
+        return hmac.compare_digest(header_value, settings.PROFILING_TOKEN)
+    return True
+
+def profile_dir() -> str:
+    return os.path.join(BACKEND_DIR, settings.PROFILE_DIR)
+
+def save_profile(profiler: SamplingProfiler, label: str) -> str:
+    """Write the folded stacks to ``PROFILE_DIR`` and return the file name."""
+    os.makedirs(profile_dir(), exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", label).strip("-")[:80] or "request"
+    name = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}-{slug}{PROFILE_SUFFIX}"
+    with open(os.path.join(profile_dir(), name), "w", encoding="utf-8") as f:
+        f.write(profiler.folded())
+    return name
+
+def load_profile(name: str) -> str:
+    """Read a saved profile; raises ValueError for names outside ``PROFILE_DIR``."""
+    if os.path.basename(name) != name or not name.endswith(PROFILE_SUFFIX):
+        raise ValueError(f"Invalid profile name: {name!r}")
+    with open(os.path.join(profile_dir(), name), encoding="utf-8") as f:
+        return f.read()
@@ -1,7 +1,7 @@
 from .user import User
 from .domain import Domain
 from .portfolio import Portfolio, PortfolioDomain
-from .recommendation import Recommendation
+from .recommendation import Recommendation, RecommendationFeedback
 
 __all__ = [
     "User",
@@ -9,4 +9,5 @@ __all__ = [
     "Portfolio",
     "PortfolioDomain",
     "Recommendation",
+    "RecommendationFeedback",
 ]
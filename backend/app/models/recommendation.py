@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Text, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -31,3 +31,19 @@ class Recommendation(Base):
     # Relationships
     user = relationship("User")
     domain = relationship("Domain")
+
+class RecommendationFeedback(Base):
+    __tablename__ = "recommendation_feedback"
+
+    id = Column(Integer, primary_key=True, index=True)
+    recommendation_id = Column(Integer, ForeignKey("recommendations.id"), nullable=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    domain = Column(String, index=True, nullable=False)
+    feedback = Column(String, nullable=False)  # buy, sell, hold, ignore
+    realized_price = Column(Integer, nullable=True)  # in USD cents, when the domain traded
+    # Model features the advice was based on, FEATURE_NAMES order; NULL if unknown (not used for training)
+    features = Column(JSON(none_as_null=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    # Relationships
+    recommendation = relationship("Recommendation")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 class DomainTraits(BaseModel):
@@ -9,6 +9,9 @@ class DomainTraits(BaseModel):
     rarity: float
     on_chain_activity: float
 
+    class Config:
+        frozen = True  # shared by cached DomainScore results
+
 class DomainScore(BaseModel):
     domain: str
     score: float = Field(..., ge=0, le=100)
@@ -18,6 +21,31 @@ class DomainScore(BaseModel):
 
     class Config:
         from_attributes = True
+        frozen = True  # score_domain serves the same cached instance to every caller
+
+class DomainBatchScoreRequest(BaseModel):
+    domains: List[str] = Field(..., min_length=1)
+
+class DomainRankRequest(BaseModel):
+    domains: List[str] = Field(..., min_length=1)
+    limit: int = Field(20, ge=1, le=1000)
+    tld: Optional[str] = None  # only rank domains under this TLD
+
+class DomainRankResponse(BaseModel):
+    count: int  # domains scored
+    matched: int  # domains under ``tld``, or all of them without one
+    results: List[DomainScore]
+
+class DomainBatchScoreResponse(BaseModel):
+    count: int
+    domains: List[str]
+    tlds: List[str]
+    lengths: List[int]
+    keyword_values: List[float]
+    rarities: List[float]
+    on_chain_activity: List[float]
+    scores: List[float]
+    valuations: List[int]  # in USD cents
 
 class DomainResponse(BaseModel):
     id: int
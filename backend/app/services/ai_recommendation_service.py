@@ -1,124 +1,208 @@
 import asyncio
+import copy
+import heapq
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Hashable, List, Mapping, NamedTuple, Optional
 from datetime import datetime, timedelta
 import json
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
-import pickle
-import os
+from functools import partial
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.metrics import spans
+from app.services.analysis_executor import analysis_executor
+from app.services.feature_store import extract_features, feature_store, get_keyword_value, get_tld_popularity
+from app.services.model_registry import model_registry
+from app.services.scoring_config import ScoringConfig, scoring_config_store
+from app.services.scoring_executor import scoring_executor
 
 logger = logging.getLogger(__name__)
 
+def calculate_domain_score(
+    domain_data: Dict[str, Any],
+    feature_weights: Optional[Mapping[str, float]] = None,
+    config: Optional[ScoringConfig] = None
+) -> float:
+    """Calculate a comprehensive domain score (0-100)."""
+    try:
+        config = config or scoring_config_store.current
+        feature_weights = feature_weights or config.feature_weights
+        score = 0
+
+        # Length score (shorter = better)
+        name = domain_data.get("name", "")
+        if "." in name:
+            base_name = name.split(".")[0]
+            length_score = max(0, 100 - (len(base_name) - 3) * 5)  # 3 chars = 100, 20+ chars = 0
+            score += length_score * feature_weights["length"]
+
+        # TLD popularity score
+        tld = name.split(".")[-1] if "." in name else ""
+        tld_popularity = get_tld_popularity(tld, config)
+        score += tld_popularity * 100 * feature_weights["tld_popularity"]
+
+        # Keyword value score
+        keyword_value = get_keyword_value(domain_data, config)
+        score += keyword_value * 100 * feature_weights["keyword_value"]
+
+        # Market volume score
+        market_volume = domain_data.get("market_volume", 0)
+        if market_volume > 0:
+            volume_score = min(100, np.log(market_volume / 1000) * 20)
+            score += volume_score * feature_weights["market_volume"]
+
+        # Price trend score
+        price_trend = domain_data.get("price_change_24h", 0)
+        trend_score = 50 + (price_trend * 10)  # -50% = 0, +50% = 100
+        trend_score = max(0, min(100, trend_score))
+        score += trend_score * feature_weights["price_trend"]
+
+        # Social sentiment score
+        social_sentiment = domain_data.get("social_sentiment", 0)
+        sentiment_score = 50 + (social_sentiment * 50)  # -1 = 0, +1 = 100
+        sentiment_score = max(0, min(100, sentiment_score))
+        score += sentiment_score * feature_weights["social_sentiment"]
+
+        return min(100, max(0, score))
+
+    except Exception as e:
+        logger.error(f"Error calculating domain score: {str(e)}")
+        return 50.0
+
+def score_market_data_chunk(
+    market_data: List[Dict[str, Any]],
+    feature_weights: Optional[Mapping[str, float]] = None,
+    config_version: Optional[str] = None
+) -> List[float]:
+    """Scoring-pool entry point: score a chunk of candidates with one config snapshot."""
+    config = scoring_config_store.ensure_version(config_version)
+    return [calculate_domain_score(domain_data, feature_weights, config) for domain_data in market_data]
+
+def analysis_fingerprint(domain_data: Dict[str, Any]) -> Hashable:
+    """Hashable snapshot of every input field of a domain's analysis."""
+    items = tuple(sorted(domain_data.items(), key=lambda item: item[0]))
+    try:
+        hash(items)
+        return items
+    except TypeError:
+        # Nested lists/dicts from upstream APIs
+        return repr(items)
+
+class CachedAnalysis(NamedTuple):
+    score: float
+    valuation: float
+    analysis: Optional[Dict[str, Any]]  # built on first use; ranking only needs score and valuation
+
 class AIRecommendationService:
     def __init__(self):
-        self.model_path = "models/domain_recommendation_model.pkl"
-        self.scaler_path = "models/domain_scaler.pkl"
-        self.model = None
-        self.scaler = None
+        self.registry = model_registry
+        self.feature_store = feature_store
         
-        # Load or initialize the model
-        self._load_model()
+        # Domain-level analysis does not depend on the user, so it is shared
+        # across requests; per-user scoring is applied on top of it
+        self.analysis_cache = LRUCache(
+            max_size=settings.AI_ANALYSIS_CACHE_SIZE,
+            ttl=settings.AI_ANALYSIS_CACHE_TTL_SECONDS,
+        )
         
-        # Feature weights for scoring
-        self.feature_weights = {
-            "length": 0.15,
-            "tld_popularity": 0.20,
-            "keyword_value": 0.25,
-            "market_volume": 0.20,
-            "price_trend": 0.10,
-            "social_sentiment": 0.10
-        }
+        # Load the trained model (see app/services/model_training.py)
+        self._load_model()
+    
+    @property
+    def feature_weights(self) -> Mapping[str, float]:
+        """Feature weights of the current scoring config snapshot."""
+        return scoring_config_store.current.feature_weights
+    
+    @property
+    def model_version(self) -> Optional[str]:
+        """Version of the live model, or None when using heuristic valuations."""
+        return self.registry.version
     
     def _load_model(self):
-        """Load the trained ML model and scaler."""
+        """Activate the configured model in the registry; never trains inline."""
+        if self.registry.live is not None:
+            return
         try:
-            # Create models directory if it doesn't exist
-            os.makedirs("models", exist_ok=True)
-            
-            if os.path.exists(self.model_path) and os.path.exists(self.scaler_path):
-                with open(self.model_path, 'rb') as f:
-                    self.model = pickle.load(f)
-                with open(self.scaler_path, 'rb') as f:
-                    self.scaler = pickle.load(f)
-                logger.info("ML model loaded successfully")
-            else:
-                logger.info("No existing model found, will train new one")
-                self._train_model()
+            model = self.registry.activate(settings.AI_MODEL_VERSION, persist=False)
+            logger.info(f"ML model {model.version} loaded from {self.registry.model_dir}")
                 
-        except Exception as e:
-            logger.error(f"Error loading model: {str(e)}")
-            self._train_model()
+        except (OSError, ValueError) as e:
+            if settings.AI_MODEL_REQUIRED:
+                raise RuntimeError(
+                    f"No usable AI model in {self.registry.model_dir} ({str(e)}); "
+                    "train one with `python -m app.services.model_training`"
+                ) from e
+            logger.error(f"Error loading model, falling back to heuristic valuations: {str(e)}")
     
-    def _train_model(self):
-        """Train a new ML model with synthetic data (in production, use real historical data)."""
+    async def analyze_domain(self, domain_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze a domain and provide comprehensive insights (runs on the analysis pool)."""
+        return await analysis_executor.run(self.analyze_domain_sync, domain_data)
+    
+    async def get_investment_recommendations(
+        self, 
+        user_profile: Dict[str, Any], 
+        market_data: List[Dict[str, Any]],
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Get personalized investment recommendations (runs on the analysis pool)."""
+        return await analysis_executor.run(
+            self.get_investment_recommendations_sync, user_profile, market_data, limit
+        )
+    
+    def analyze_domain_sync(self, domain_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze a domain and provide comprehensive insights."""
         try:
-            # Generate synthetic training data
-            # In production, this would use real historical domain sales data
-            np.random.seed(42)
-            n_samples = 1000
-            
-            # Generate synthetic features
-            lengths = np.random.randint(3, 20, n_samples)
-            tld_popularities = np.random.uniform(0.1, 1.0, n_samples)
-            keyword_values = np.random.uniform(0.1, 1.0, n_samples)
-            market_volumes = np.random.uniform(1000, 100000, n_samples)
-            price_trends = np.random.uniform(-0.3, 0.5, n_samples)
-            social_sentiments = np.random.uniform(-1.0, 1.0, n_samples)
-            
-            # Generate synthetic target (domain value)
-            # This is a simplified formula - in production, use real pricing data
-            base_value = 1000
-            target_values = (
-                base_value * 
-                (1 + 0.1 * (20 - lengths)) *  # Shorter names are more valuable
-                (1 + 0.5 * tld_popularities) *  # Popular TLDs are more valuable
-                (1 + 0.8 * keyword_values) *  # High keyword value increases price
-                (1 + 0.3 * np.log(market_volumes / 1000)) *  # Market volume impact
-                (1 + 0.2 * price_trends) *  # Price trend impact
-                (1 + 0.1 * social_sentiments)  # Social sentiment impact
-            )
-            
-            # Add some noise
-            target_values += np.random.normal(0, 0.1 * target_values)
-            target_values = np.maximum(target_values, 100)  # Minimum value
-            
-            # Prepare features
-            X = np.column_stack([
-                lengths, tld_popularities, keyword_values, 
-                market_volumes, price_trends, social_sentiments
-            ])
-            y = target_values
-            
-            # Scale features
-            self.scaler = StandardScaler()
-            X_scaled = self.scaler.fit_transform(X)
-            
-            # Train Random Forest model
-            self.model = RandomForestRegressor(
-                n_estimators=100,
-                max_depth=10,
-                random_state=42,
-                n_jobs=-1
-            )
-            self.model.fit(X_scaled, y)
-            
-            # Save model and scaler
-            with open(self.model_path, 'wb') as f:
-                pickle.dump(self.model, f)
-            with open(self.scaler_path, 'wb') as f:
-                pickle.dump(self.scaler, f)
-            
-            logger.info("New ML model trained and saved successfully")
+            config = scoring_config_store.current
+            cache_key = self._analysis_cache_key(domain_data, config)
+            entry = self.analysis_cache.get(cache_key)
+            if entry is None:
+                # Calculate domain score
+                with spans.span("ai.score"):
+                    score = calculate_domain_score(domain_data, config.feature_weights, config)
+                
+                # Calculate valuation
+                valuation = self._calculate_valuations([domain_data], [score], config)[0]
+                entry = CachedAnalysis(score, valuation, None)
+            
+            return self._cached_analysis(cache_key, entry, domain_data)
             
         except Exception as e:
-            logger.error(f"Error training model: {str(e)}")
-            self.model = None
-            self.scaler = None
+            logger.error(f"Error analyzing domain: {str(e)}")
+            return {"error": str(e)}
     
-    async def analyze_domain(self, domain_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze a domain and provide comprehensive insights."""
+    def _analysis_cache_key(self, domain_data: Dict[str, Any], config: ScoringConfig) -> tuple:
+        """Cache key of a domain's analysis: model, scoring config and every input field."""
+        return (self.model_version, config.version, analysis_fingerprint(domain_data))
+    
+    def _cached_analysis(
+        self,
+        cache_key: tuple,
+        entry: CachedAnalysis,
+        domain_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Full analysis of a cache entry, built and cached on first use.
+        
+        Returns a deep copy stamped with the current time, so callers never
+        mutate the cached dict or the dicts and lists nested in it.
+        """
+        if entry.analysis is not None:
+            analysis = copy.deepcopy(entry.analysis)
+            analysis["timestamp"] = datetime.utcnow().isoformat()
+            return analysis
+        with spans.span("ai.analysis"):
+            analysis = self._build_analysis(domain_data, entry.score, entry.valuation)
+        if "error" not in analysis:
+            self.analysis_cache.set(cache_key, entry._replace(analysis=copy.deepcopy(analysis)))
+        return analysis
+    
+    def _build_analysis(
+        self,
+        domain_data: Dict[str, Any],
+        score: float,
+        valuation: float
+    ) -> Dict[str, Any]:
+        """Assemble the full analysis of a domain from its score and valuation."""
         try:
             analysis = {
                 "domain": domain_data.get("name", "Unknown"),
@@ -131,28 +215,23 @@ class AIRecommendationService:
                 "technical_analysis": {}
             }
             
-            # Calculate domain score
-            score = await self._calculate_domain_score(domain_data)
             analysis["score"] = score
-            
-            # Calculate valuation
-            valuation = await self._calculate_valuation(domain_data, score)
             analysis["valuation"] = valuation
             
             # Risk assessment
-            risk_assessment = await self._assess_risk(domain_data, score)
+            risk_assessment = self._assess_risk(domain_data, score)
             analysis["risk_assessment"] = risk_assessment
             
             # Generate recommendations
-            recommendations = await self._generate_recommendations(domain_data, score, risk_assessment)
+            recommendations = self._generate_recommendations(domain_data, score, risk_assessment)
             analysis["recommendations"] = recommendations
             
             # Market analysis
-            market_analysis = await self._analyze_market(domain_data)
+            market_analysis = self._analyze_market(domain_data)
             analysis["market_analysis"] = market_analysis
             
             # Technical analysis
-            technical_analysis = await self._analyze_technical(domain_data)
+            technical_analysis = self._analyze_technical(domain_data)
             analysis["technical_analysis"] = technical_analysis
             
             return analysis
@@ -161,7 +240,7 @@ class AIRecommendationService:
             logger.error(f"Error analyzing domain: {str(e)}")
             return {"error": str(e)}
     
-    async def get_investment_recommendations(
+    def get_investment_recommendations_sync(
         self, 
         user_profile: Dict[str, Any], 
         market_data: List[Dict[str, Any]],
@@ -169,30 +248,57 @@ class AIRecommendationService:
     ) -> List[Dict[str, Any]]:
         """Get personalized investment recommendations based on user profile and market data."""
         try:
+            # Phase 1: score and value every candidate up front (the model runs
+            # once on the feature matrix of the cache misses) and rank them by
+            # confidence, which only depends on score, valuation and the user profile
+            config = scoring_config_store.current
+            cache_keys = [self._analysis_cache_key(domain_data, config) for domain_data in market_data]
+            entries = [self.analysis_cache.get(cache_key) for cache_key in cache_keys]
+            
+            misses = [index for index, entry in enumerate(entries) if entry is None]
+            if misses:
+                missed_data = [market_data[index] for index in misses]
+                with spans.span("ai.score"):
+                    scores = self._score_candidates(missed_data, config)
+                valuations = self._calculate_valuations(missed_data, scores, config)
+                for index, score, valuation in zip(misses, scores, valuations):
+                    entries[index] = CachedAnalysis(score, valuation, None)
+                    self.analysis_cache.set(cache_keys[index], entries[index])
+            
+            with spans.span("ai.rank"):
+                ranked = [
+                    (-self._calculate_recommendation_score(
+                        {"score": entry.score, "valuation": entry.valuation}, user_profile
+                    ), index)
+                    for index, entry in enumerate(entries)
+                ]
+                heapq.heapify(ranked)
+            
+            # Phase 2: full analysis (cached per domain) and per-user reasoning,
+            # popping candidates best first until ``limit`` analyses succeed
             recommendations = []
-            
-            for domain_data in market_data:
-                # Analyze domain
-                analysis = await self.analyze_domain(domain_data)
+            while ranked and len(recommendations) < limit:
+                negative_confidence, index = heapq.heappop(ranked)
+                confidence = -negative_confidence
+                domain_data = market_data[index]
+                analysis = self._cached_analysis(cache_keys[index], entries[index], domain_data)
                 
                 if "error" not in analysis:
-                    # Calculate recommendation score based on user profile
-                    recommendation_score = await self._calculate_recommendation_score(
-                        analysis, user_profile
-                    )
-                    
                     # Determine action based on analysis and user profile
-                    action = await self._determine_action(analysis, user_profile)
+                    action = self._determine_action(analysis, user_profile)
                     
                     # Calculate expected return and risk
-                    expected_return = await self._calculate_expected_return(analysis, user_profile)
+                    expected_return = self._calculate_expected_return(analysis, user_profile)
                     risk_level = analysis.get("risk_assessment", {}).get("overall_risk", "medium")
                     
+                    with spans.span("ai.reasoning"):
+                        reasoning = self._generate_reasoning(analysis, user_profile)
+                    
                     recommendation = {
                         "domain": analysis["domain"],
                         "action": action,
-                        "confidence": recommendation_score,
-                        "reasoning": await self._generate_reasoning(analysis, user_profile),
+                        "confidence": confidence,
+                        "reasoning": reasoning,
                         "expected_return": expected_return,
                         "risk_level": risk_level,
                         "price_target": analysis.get("valuation", 0),
@@ -201,79 +307,61 @@ class AIRecommendationService:
                     
                     recommendations.append(recommendation)
             
-            # Sort by recommendation score and return top results
-            recommendations.sort(key=lambda x: x["confidence"], reverse=True)
-            return recommendations[:limit]
+            return recommendations
             
         except Exception as e:
             logger.error(f"Error generating recommendations: {str(e)}")
             return []
     
-    async def _calculate_domain_score(self, domain_data: Dict[str, Any]) -> float:
+    def _calculate_domain_score(self, domain_data: Dict[str, Any]) -> float:
         """Calculate a comprehensive domain score (0-100)."""
-        try:
-            score = 0
-            
-            # Length score (shorter = better)
-            name = domain_data.get("name", "")
-            if "." in name:
-                base_name = name.split(".")[0]
-                length_score = max(0, 100 - (len(base_name) - 3) * 5)  # 3 chars = 100, 20+ chars = 0
-                score += length_score * self.feature_weights["length"]
-            
-            # TLD popularity score
-            tld = name.split(".")[-1] if "." in name else ""
-            tld_popularity = self._get_tld_popularity(tld)
-            score += tld_popularity * 100 * self.feature_weights["tld_popularity"]
-            
-            # Keyword value score
-            keyword_value = domain_data.get("keyword_value", 0.5)
-            score += keyword_value * 100 * self.feature_weights["keyword_value"]
-            
-            # Market volume score
-            market_volume = domain_data.get("market_volume", 0)
-            if market_volume > 0:
-                volume_score = min(100, np.log(market_volume / 1000) * 20)
-                score += volume_score * self.feature_weights["market_volume"]
-            
-            # Price trend score
-            price_trend = domain_data.get("price_change_24h", 0)
-            trend_score = 50 + (price_trend * 10)  # -50% = 0, +50% = 100
-            trend_score = max(0, min(100, trend_score))
-            score += trend_score * self.feature_weights["price_trend"]
-            
-            # Social sentiment score
-            social_sentiment = domain_data.get("social_sentiment", 0)
-            sentiment_score = 50 + (social_sentiment * 50)  # -1 = 0, +1 = 100
-            sentiment_score = max(0, min(100, sentiment_score))
-            score += sentiment_score * self.feature_weights["social_sentiment"]
-            
-            return min(100, max(0, score))
-            
-        except Exception as e:
-            logger.error(f"Error calculating domain score: {str(e)}")
-            return 50.0
+        return calculate_domain_score(domain_data, self.feature_weights)
     
-    async def _calculate_valuation(self, domain_data: Dict[str, Any], score: float) -> float:
+    def _score_candidates(self, market_data: List[Dict[str, Any]], config: ScoringConfig) -> List[float]:
+        """Score candidates, sharding sets larger than one chunk across the scoring process pool."""
+        if len(market_data) <= scoring_executor.chunk_size:
+            return [calculate_domain_score(domain_data, config.feature_weights, config) for domain_data in market_data]
+        chunk_scores = scoring_executor.map_chunks_sync(
+            partial(
+                score_market_data_chunk,
+                feature_weights=dict(config.feature_weights),
+                config_version=config.version,
+            ),
+            market_data
+        )
+        return [score for scores in chunk_scores for score in scores]
+    
+    def _calculate_valuation(self, domain_data: Dict[str, Any], score: float) -> float:
         """Calculate domain valuation using ML model or heuristics."""
+        return self._calculate_valuations([domain_data], [score])[0]
+    
+    def _calculate_valuations(
+        self,
+        market_data: List[Dict[str, Any]],
+        scores: List[float],
+        config: Optional[ScoringConfig] = None
+    ) -> List[float]:
+        """Value many domains with one scaler transform and one model prediction."""
+        if not market_data:
+            return []
         try:
-            if self.model and self.scaler:
-                # Use ML model for prediction
-                features = self._extract_features(domain_data)
-                features_scaled = self.scaler.transform([features])
-                prediction = self.model.predict(features_scaled)[0]
-                return max(100, prediction)
+            if self.registry.live is not None:
+                # Use ML model for prediction (live registry model, shadow sampled)
+                with spans.span("ai.features"):
+                    features = self.feature_store.get_matrix(market_data, config)
+                predictions = self.registry.predict(features)
+                return np.maximum(predictions, 100).tolist()
             else:
                 # Fallback to heuristic calculation
                 base_value = 1000
-                multiplier = 1 + (score - 50) / 50  # 0-100 score maps to 0.5-1.5x multiplier
-                return base_value * multiplier
+                # 0-100 score maps to 0.5-1.5x multiplier
+                return [base_value * (1 + (score - 50) / 50) for score in scores]
                 
         except Exception as e:
             logger.error(f"Error calculating valuation: {str(e)}")
-            return 1000.0
+            return [1000.0] * len(market_data)
     
-    async def _assess_risk(self, domain_data: Dict[str, Any], score: float) -> Dict[str, Any]:
+    def _assess_risk(self, domain_data: Dict[str, Any], score: float) -> Dict[str, Any]:
         """Assess various risk factors for the domain."""
         try:
             risk_factors = {
@@ -319,7 +407,7 @@ class AIRecommendationService:
             logger.error(f"Error assessing risk: {str(e)}")
             return {"overall_risk": "medium"}
     
-    async def _generate_recommendations(
+    def _generate_recommendations(
         self, 
         domain_data: Dict[str, Any], 
         score: float, 
@@ -358,7 +446,7 @@ class AIRecommendationService:
             logger.error(f"Error generating recommendations: {str(e)}")
             return ["Unable to generate specific recommendations"]
     
-    async def _analyze_market(self, domain_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_market(self, domain_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze market conditions for the domain."""
         try:
             market_analysis = {
@@ -395,7 +483,7 @@ class AIRecommendationService:
             logger.error(f"Error analyzing market: {str(e)}")
             return {"trend": "neutral"}
     
-    async def _analyze_technical(self, domain_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_technical(self, domain_data: Dict[str, Any]) -> Dict[str, Any]:
         """Perform technical analysis on the domain."""
         try:
             technical_analysis = {
@@ -441,34 +529,21 @@ class AIRecommendationService:
     
     def _get_tld_popularity(self, tld: str) -> float:
         """Get TLD popularity score (0-1)."""
-        tld_popularity = {
-            "eth": 1.0, "crypto": 0.9, "nft": 0.8, "dao": 0.7,
-            "com": 0.6, "org": 0.5, "net": 0.4, "io": 0.3
-        }
-        return tld_popularity.get(tld.lower(), 0.2)
+        return get_tld_popularity(tld)
     
-    def _extract_features(self, domain_data: Dict[str, Any]) -> List[float]:
+    def _get_keyword_value(self, domain_data: Dict[str, Any]) -> float:
+        """Get keyword value from upstream data, or derive it from the domain name."""
+        return get_keyword_value(domain_data)
+    
+    def _extract_features(
+        self,
+        domain_data: Dict[str, Any],
+        config: Optional[ScoringConfig] = None
+    ) -> List[float]:
         """Extract features for ML model prediction."""
-        try:
-            name = domain_data.get("name", "")
-            base_name = name.split(".")[0] if "." in name else name
-            
-            features = [
-                len(base_name),  # length
-                self._get_tld_popularity(name.split(".")[-1] if "." in name else ""),  # tld_popularity
-                domain_data.get("keyword_value", 0.5),  # keyword_value
-                domain_data.get("market_volume", 10000),  # market_volume
-                domain_data.get("price_change_24h", 0),  # price_trend
-                domain_data.get("social_sentiment", 0)  # social_sentiment
-            ]
-            
-            return features
-            
-        except Exception as e:
-            logger.error(f"Error extracting features: {str(e)}")
-            return [10, 0.5, 0.5, 10000, 0, 0]
+        return extract_features(domain_data, config)
     
-    async def _calculate_recommendation_score(
+    def _calculate_recommendation_score(
         self, 
         analysis: Dict[str, Any], 
         user_profile: Dict[str, Any]
@@ -504,7 +579,7 @@ class AIRecommendationService:
             logger.error(f"Error calculating recommendation score: {str(e)}")
             return 50.0
     
-    async def _determine_action(
+    def _determine_action(
         self, 
         analysis: Dict[str, Any], 
         user_profile: Dict[str, Any]
@@ -540,7 +615,7 @@ class AIRecommendationService:
             logger.error(f"Error determining action: {str(e)}")
             return "hold"
     
-    async def _calculate_expected_return(
+    def _calculate_expected_return(
         self, 
         analysis: Dict[str, Any], 
         user_profile: Dict[str, Any]
@@ -583,7 +658,7 @@ class AIRecommendationService:
             logger.error(f"Error calculating expected return: {str(e)}")
             return 0.0
     
-    async def _generate_reasoning(
+    def _generate_reasoning(
         self, 
         analysis: Dict[str, Any], 
         user_profile: Dict[str, Any]
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+class AnalysisExecutor:
+    """Bounded thread pool that runs synchronous AI analysis off the event loop.
+
+    At most ``max_workers`` jobs run at once and at most ``max_queue`` more are
+    handed to the pool; further callers wait (without blocking the loop) until
+    a slot frees up. Queue depth, queue wait and run time are tracked for the
+    stats endpoint.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: Optional[int] = None):
+        self.max_workers = max_workers or settings.AI_ANALYSIS_WORKERS
+        self.max_queue = max_queue if max_queue is not None else settings.AI_ANALYSIS_MAX_QUEUE
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_queued = 0
+        self.queue_wait = Histogram()
+        self.run_time = Histogram()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ai-analysis")
+            logger.info(f"Started analysis pool (workers={self.max_workers}, max_queue={self.max_queue})")
+        return self._pool
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # The semaphore's waiters belong to the event loop that created it
+        loop = asyncio.get_running_loop()
+        if self._slots is None or loop is not self._slots_loop:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_queue)
+            self._slots_loop = loop
+        return self._slots
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker threads; the pool is recreated on next use."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+        self._slots = None
+        self._slots_loop = None
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(*args)`` on the pool and return its result."""
+        job = [time.perf_counter(), False]  # enqueue time, left the queue
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+        try:
+            async with self._get_slots():
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._get_pool(), self._call, job, fn, args)
+        finally:
+            # A caller cancelled before its job started still leaves the queue
+            self._dequeue(job)
+
+    def _dequeue(self, job: list) -> bool:
+        with self._lock:
+            if job[1]:
+                return False
+            job[1] = True
+            self.queued -= 1
+            return True
+
+    def _call(self, job: list, fn: Callable[..., Any], args: tuple) -> Any:
+        started = time.perf_counter()
+        if self._dequeue(job):
+            self.queue_wait.observe(started - job[0])
+        with self._lock:
+            self.running += 1
+        try:
+            result = fn(*args)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            self.run_time.observe(time.perf_counter() - started)
+            with self._lock:
+                self.running -= 1
+        with self._lock:
+            self.completed += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, job counters and latency histograms."""
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "queue_depth": self.queued,
+            "max_queue_depth": self.max_queued,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "queue_wait_seconds": self.queue_wait.stats(),
+            "run_time_seconds": self.run_time.stats(),
+        }
+
+# Global instance
+analysis_executor = AnalysisExecutor()
@@ -72,3 +72,8 @@ class AuthService:
         
         user = db.query(User).filter(User.wallet_address == wallet_address).first()
         return user
+
+    def is_admin(self, user: User) -> bool:
+        """Whether the user's wallet is listed in ADMIN_WALLET_ADDRESSES."""
+        admins = {address.lower() for address in settings.ADMIN_WALLET_ADDRESSES}
+        return user.wallet_address.lower() in admins
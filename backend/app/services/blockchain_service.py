@@ -1,5 +1,4 @@
 import asyncio
-import httpx
 from typing import Dict, Any, List, Optional
 from web3 import Web3
 from eth_account import Account
@@ -7,6 +6,8 @@ import logging
 from datetime import datetime, timedelta
 import json
 
+from app.core.http import http_clients
+
 logger = logging.getLogger(__name__)
 
 class BlockchainService:
@@ -97,33 +98,32 @@ class BlockchainService:
                     break
             
             # Query Unstoppable Domains API for real data
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"https://api.unstoppabledomains.com/resolve/{domain}",
-                    headers={
-                        "Authorization": "Bearer YOUR_API_KEY"  # Replace with actual API key
-                    }
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    return {
-                        "name": domain,
-                        "owner": data.get("owner"),
-                        "records": data.get("records", {}),
-                        "is_available": False,  # If we can resolve it, it's not available
-                        "chain": "polygon",
-                        "last_updated": datetime.utcnow().isoformat()
-                    }
-                else:
-                    # Domain might be available
-                    return {
-                        "name": domain,
-                        "owner": None,
-                        "is_available": True,
-                        "chain": "polygon",
-                        "last_updated": datetime.utcnow().isoformat()
-                    }
+            response = await http_clients.get(
+                f"https://api.unstoppabledomains.com/resolve/{domain}",
+                headers={
+                    "Authorization": "Bearer YOUR_API_KEY"  # Replace with actual API key
+                }
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                return {
+                    "name": domain,
+                    "owner": data.get("owner"),
+                    "records": data.get("records", {}),
+                    "is_available": False,  # If we can resolve it, it's not available
+                    "chain": "polygon",
+                    "last_updated": datetime.utcnow().isoformat()
+                }
+            else:
+                # Domain might be available
+                return {
+                    "name": domain,
+                    "owner": None,
+                    "is_available": True,
+                    "chain": "polygon",
+                    "last_updated": datetime.utcnow().isoformat()
+                }
                     
         except Exception as e:
             logger.error(f"Error fetching Unstoppable domain info for {domain}: {str(e)}")
@@ -231,26 +231,25 @@ class BlockchainService:
     async def _get_opensea_data(self, domain: str) -> Dict[str, Any]:
         """Get OpenSea data for ENS domains."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"https://api.opensea.io/api/v1/assets?collection=ens&search={domain}",
-                    headers={
-                        "X-API-KEY": "YOUR_OPENSEA_API_KEY"  # Replace with actual API key
+            response = await http_clients.get(
+                f"https://api.opensea.io/api/v1/assets?collection=ens&search={domain}",
+                headers={
+                    "X-API-KEY": "YOUR_OPENSEA_API_KEY"  # Replace with actual API key
+                }
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('assets'):
+                    asset = data['assets'][0]
+                    return {
+                        "opensea_url": asset.get('permalink'),
+                        "last_sale_price": asset.get('last_sale', {}).get('total_price'),
+                        "last_sale_currency": asset.get('last_sale', {}).get('payment_token', {}).get('symbol'),
+                        "floor_price": asset.get('collection', {}).get('stats', {}).get('floor_price')
                     }
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('assets'):
-                        asset = data['assets'][0]
-                        return {
-                            "opensea_url": asset.get('permalink'),
-                            "last_sale_price": asset.get('last_sale', {}).get('total_price'),
-                            "last_sale_currency": asset.get('last_sale', {}).get('payment_token', {}).get('symbol'),
-                            "floor_price": asset.get('collection', {}).get('stats', {}).get('floor_price')
-                        }
-                
-                return {}
+            
+            return {}
                 
         except Exception as e:
             logger.error(f"Error fetching OpenSea data: {str(e)}")
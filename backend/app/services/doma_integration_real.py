@@ -1,6 +1,5 @@
 import os
 import asyncio
-import httpx
 from typing import Dict, List, Any, Optional
 from web3 import Web3
 from eth_account import Account
@@ -8,6 +7,8 @@ import logging
 from datetime import datetime
 import json
 
+from app.core.http import http_clients
+
 logger = logging.getLogger(__name__)
 
 class DomaIntegrationService:
@@ -97,26 +98,24 @@ class DomaIntegrationService:
         """Get real domain information from Doma testnet."""
         try:
             # Query the Doma API for domain information
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.config['testnet']['api']}/domains/{domain}",
-                    timeout=10.0
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    # Fallback to basic domain info
-                    return {
-                        "domain": domain,
-                        "status": "unknown",
-                        "owner": None,
-                        "resolver": None,
-                        "ttl": None,
-                        "records": [],
-                        "source": "doma_testnet_api",
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
+            response = await http_clients.get(
+                f"{self.config['testnet']['api']}/domains/{domain}"
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            else:
+                # Fallback to basic domain info
+                return {
+                    "domain": domain,
+                    "status": "unknown",
+                    "owner": None,
+                    "resolver": None,
+                    "ttl": None,
+                    "records": [],
+                    "source": "doma_testnet_api",
+                    "timestamp": datetime.utcnow().isoformat()
+                }
         except Exception as e:
             logger.error(f"Error getting domain info for {domain}: {str(e)}")
             return {
@@ -130,17 +129,15 @@ class DomaIntegrationService:
         """Get domain pricing information from Doma testnet."""
         try:
             # Query the Doma API for pricing
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.config['testnet']['api']}/pricing/{domain}",
-                    timeout=10.0
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    # Fallback pricing based on domain characteristics
-                    return self._calculate_fallback_price(domain)
+            response = await http_clients.get(
+                f"{self.config['testnet']['api']}/pricing/{domain}"
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            else:
+                # Fallback pricing based on domain characteristics
+                return self._calculate_fallback_price(domain)
         except Exception as e:
             logger.error(f"Error getting domain price for {domain}: {str(e)}")
             return self._calculate_fallback_price(domain)
@@ -173,17 +170,15 @@ class DomaIntegrationService:
         """Get real market data from Doma testnet."""
         try:
             # Query the Doma API for market data
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.config['testnet']['api']}/market",
-                    timeout=10.0
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    # Fallback market data
-                    return self._get_fallback_market_data()
+            response = await http_clients.get(
+                f"{self.config['testnet']['api']}/market"
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            else:
+                # Fallback market data
+                return self._get_fallback_market_data()
         except Exception as e:
             logger.error(f"Error getting market data: {str(e)}")
             return self._get_fallback_market_data()
@@ -209,18 +204,16 @@ class DomaIntegrationService:
         """Get trending domains from Doma testnet."""
         try:
             # Query the Doma API for trending domains
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.config['testnet']['api']}/trending",
-                    params={"limit": limit},
-                    timeout=10.0
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    # Fallback trending data
-                    return self._get_fallback_trending_domains(limit)
+            response = await http_clients.get(
+                f"{self.config['testnet']['api']}/trending",
+                params={"limit": limit}
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            else:
+                # Fallback trending data
+                return self._get_fallback_trending_domains(limit)
         except Exception as e:
             logger.error(f"Error getting trending domains: {str(e)}")
             return self._get_fallback_trending_domains(limit)
@@ -321,27 +314,25 @@ class DomaIntegrationService:
         """Get cross-chain status for a domain."""
         try:
             # Query cross-chain gateway for domain status
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.config['testnet']['api']}/cross-chain/{domain}",
-                    timeout=10.0
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    # Fallback cross-chain status
-                    return {
-                        "domain": domain,
-                        "cross_chain_enabled": True,
-                        "supported_chains": [
-                            {"chain_id": 97476, "name": "Doma Testnet", "status": "active"},
-                            {"chain_id": 11155111, "name": "Sepolia", "status": "active"},
-                            {"chain_id": 84532, "name": "Base Sepolia", "status": "active"}
-                        ],
-                        "bridge_status": "operational",
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
+            response = await http_clients.get(
+                f"{self.config['testnet']['api']}/cross-chain/{domain}"
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            else:
+                # Fallback cross-chain status
+                return {
+                    "domain": domain,
+                    "cross_chain_enabled": True,
+                    "supported_chains": [
+                        {"chain_id": 97476, "name": "Doma Testnet", "status": "active"},
+                        {"chain_id": 11155111, "name": "Sepolia", "status": "active"},
+                        {"chain_id": 84532, "name": "Base Sepolia", "status": "active"}
+                    ],
+                    "bridge_status": "operational",
+                    "timestamp": datetime.utcnow().isoformat()
+                }
         except Exception as e:
             logger.error(f"Error getting cross-chain status: {str(e)}")
             return {
@@ -382,35 +373,32 @@ class DomaIntegrationService:
     async def _check_api_health(self) -> bool:
         """Check if Doma API endpoint is healthy."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.config['testnet']['api']}/health",
-                    timeout=5.0
-                )
-                return response.status_code == 200
+            response = await http_clients.get(
+                f"{self.config['testnet']['api']}/health",
+                timeout=5.0
+            )
+            return response.status_code == 200
         except:
             return False
     
     async def _check_subgraph_health(self) -> bool:
         """Check if Doma Subgraph endpoint is healthy."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.config['testnet']['subgraph']}/health",
-                    timeout=5.0
-                )
-                return response.status_code == 200
+            response = await http_clients.get(
+                f"{self.config['testnet']['subgraph']}/health",
+                timeout=5.0
+            )
+            return response.status_code == 200
         except:
             return False
     
     async def _check_bridge_health(self) -> bool:
         """Check if Doma Bridge endpoint is healthy."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.config['testnet']['bridge']}/health",
-                    timeout=5.0
-                )
-                return response.status_code == 200
+            response = await http_clients.get(
+                f"{self.config['testnet']['bridge']}/health",
+                timeout=5.0
+            )
+            return response.status_code == 200
         except:
             return False
@@ -0,0 +1,269 @@
+import logging
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Multi-label public suffixes from the Public Suffix List that are common in
+# practice. Single-label TLDs need no entry: the PSL default rule ("*") makes
+# any unlisted last label a suffix. Point PUBLIC_SUFFIX_LIST_PATH at a copy of
+# https://publicsuffix.org/list/public_suffix_list.dat to load the full list.
+BUNDLED_SUFFIXES = (
+    "ac.uk", "co.uk", "gov.uk", "ltd.uk", "me.uk", "net.uk", "nhs.uk", "org.uk", "plc.uk", "sch.uk",
+    "com.au", "edu.au", "gov.au", "id.au", "net.au", "org.au",
+    "ac.nz", "co.nz", "geek.nz", "gen.nz", "net.nz", "org.nz", "school.nz",
+    "ac.jp", "co.jp", "ed.jp", "go.jp", "gr.jp", "lg.jp", "ne.jp", "or.jp",
+    "ac.kr", "co.kr", "go.kr", "ne.kr", "or.kr", "re.kr",
+    "com.br", "edu.br", "gov.br", "net.br", "org.br",
+    "com.cn", "edu.cn", "gov.cn", "net.cn", "org.cn",
+    "com.hk", "edu.hk", "gov.hk", "net.hk", "org.hk",
+    "com.tw", "edu.tw", "gov.tw", "net.tw", "org.tw",
+    "ac.in", "co.in", "edu.in", "firm.in", "gen.in", "gov.in", "ind.in", "net.in", "org.in",
+    "ac.za", "co.za", "gov.za", "net.za", "org.za", "web.za",
+    "com.ar", "com.co", "com.ec", "com.mx", "com.pe", "com.uy", "com.ve",
+    "com.sg", "edu.sg", "gov.sg", "net.sg", "org.sg",
+    "com.my", "com.ph", "com.pk", "com.vn", "co.id", "or.id", "web.id", "co.th", "in.th",
+    "co.il", "org.il", "com.tr", "gen.tr", "org.tr", "com.sa", "com.eg", "com.ng", "co.ke",
+    "com.ua", "org.ua", "com.pl", "net.pl", "org.pl", "co.at", "or.at", "com.es", "com.pt",
+    "github.io", "gitlab.io", "herokuapp.com", "netlify.app", "pages.dev", "vercel.app", "workers.dev",
+)
+
+# Web3 naming-system TLDs (ENS, Unstoppable Domains and similar)
+WEB3_TLDS = (
+    "eth", "crypto", "nft", "dao", "wallet", "blockchain", "bitcoin", "coin", "888", "x",
+    "klever", "hi", "kresus", "polygon", "anime", "manga", "binanceus", "zil",
+)
+
+# ASCII (punycode) form of a full domain: LDH labels of at most 63 chars with no
+# leading/trailing hyphen, ending in an alphanumeric or punycode last label.
+ASCII_DOMAIN_PATTERN = re.compile(
+    r'^(?:(?!-)[a-z0-9-]{1,63}(?<!-)\.)+(?:[a-z0-9]{1,63}|xn--[a-z0-9-]{1,59})$'
+)
+
+MAX_DOMAIN_LENGTH = 253
+MAX_LABEL_LENGTH = 63
+
+_TERMINAL = ""
+
+class ParsedDomain(NamedTuple):
+    domain: str        # normalized Unicode form, e.g. "shop.münchen.co.uk"
+    ascii_domain: str  # punycode form, e.g. "shop.xn--mnchen-3ya.co.uk"
+    subdomain: str     # labels left of the registrable name ("" if none)
+    name: str          # registrable label, scored as the domain name
+    tld: str           # public suffix, possibly multi-label ("co.uk")
+    is_idn: bool
+
+class DomainParser:
+    """Splits domains into subdomain, name and public suffix using a suffix trie.
+
+    The trie is keyed by labels from right to left and supports the Public
+    Suffix List rule syntax (plain, ``*.`` wildcard and ``!`` exception rules).
+    Build it once and reuse it; ``parse`` does one walk per domain.
+    """
+
+    def __init__(self, suffixes: Iterable[str]):
+        self._trie: Dict[str, dict] = {}
+        self.rule_count = 0
+        for suffix in suffixes:
+            self.add_rule(suffix)
+
+    @classmethod
+    def default(cls, extra_suffixes: Iterable[str] = (), suffix_list_path: Optional[str] = None) -> "DomainParser":
+        """Build a parser from the bundled suffixes, Web3 TLDs and an optional PSL file."""
+        parser = cls(BUNDLED_SUFFIXES)
+        for suffix in WEB3_TLDS:
+            parser.add_rule(suffix)
+        for suffix in extra_suffixes:
+            parser.add_rule(suffix)
+
+        if suffix_list_path:
+            try:
+                with open(suffix_list_path, encoding="utf-8") as f:
+                    for line in f:
+                        parser.add_rule(line)
+            except OSError as e:
+                logger.error(f"Error loading public suffix list from {suffix_list_path}: {str(e)}")
+
+        return parser
+
+    def add_rule(self, rule: str):
+        """Add one rule in Public Suffix List syntax; comments and blanks are ignored."""
+        rule = rule.strip().split()[0].lower() if rule.strip() else ""
+        if not rule or rule.startswith("//"):
+            return
+
+        exception = rule.startswith("!")
+        labels = rule.lstrip("!").split(".")
+        node = self._trie
+        for label in reversed(labels[1:] if exception else labels):
+            node = node.setdefault(label, {})
+
+        if exception:
+            node.setdefault("!" + labels[0], {})
+        else:
+            node[_TERMINAL] = {}
+        self.rule_count += 1
+
+    def parse(self, domain: str) -> ParsedDomain:
+        """Parse a domain, raising ValueError if it is not a valid registrable name."""
+        domain = domain.strip().lower().rstrip(".")
+        if domain.isascii():
+            ascii_domain = domain
+            if "xn--" in domain:
+                labels = [self._to_unicode(label) for label in domain.split(".")]
+                domain = ".".join(labels)
+            else:
+                labels = domain.split(".")
+        else:
+            labels = domain.split(".")
+            ascii_domain = ".".join(self._to_ascii(label) for label in labels)
+
+        if len(ascii_domain) > MAX_DOMAIN_LENGTH or not ASCII_DOMAIN_PATTERN.match(ascii_domain):
+            raise ValueError("Invalid domain format")
+        
+        # Numeric last labels are only valid as explicit suffixes (e.g. ".888"), not IPs
+        if labels[-1].isdigit() and labels[-1] not in self._trie:
+            raise ValueError("Invalid domain format")
+
+        suffix_length = self._suffix_length(labels)
+        if len(labels) <= suffix_length:
+            raise ValueError("Invalid domain format")
+
+        name_index = len(labels) - suffix_length - 1
+        return ParsedDomain(
+            domain,
+            ascii_domain,
+            ".".join(labels[:name_index]) if name_index else "",
+            labels[name_index],
+            labels[-1] if suffix_length == 1 else ".".join(labels[name_index + 1:]),
+            ascii_domain != domain,
+        )
+
+    def split_plain(self, domains: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized ``parse`` for plain ASCII ``name.tld`` strings.
+
+        Returns the indices of the domains it handled plus their normalized
+        domain, name and TLD arrays. Everything else (subdomains, multi-label
+        suffixes, IDNs and punycode, whitespace, invalid names and TLDs with
+        wildcard or exception rules) is left for ``parse``.
+        """
+        empty = np.empty(0, dtype=str)
+        values = np.asarray(domains, dtype=str)
+        width = values.dtype.itemsize // 4
+        if len(values) == 0 or width < 3:
+            return np.empty(0, dtype=np.intp), empty, empty, empty
+        wide_codes = values.view(np.uint32).reshape(len(values), width)
+        lengths = np.char.str_len(values)
+        
+        # ASCII letters, digits and hyphens around exactly one dot; NULs are invalid
+        # but NumPy drops trailing ones, so compare with the Python lengths too
+        plain = np.fromiter(map(len, domains), dtype=lengths.dtype, count=len(values)) == lengths
+        plain &= (wide_codes < 128).all(axis=1)
+        codes = wide_codes.astype(np.uint8)
+        lower = codes | (((codes >= ord("A")) & (codes <= ord("Z"))).view(np.uint8) << 5)
+        digits = (codes >= ord("0")) & (codes <= ord("9"))
+        hyphens = codes == ord("-")
+        dots = codes == ord(".")
+        padding = codes == 0
+        plain &= ((lower >= ord("a")) & (lower <= ord("z")) | digits | hyphens | dots | padding).all(axis=1)
+        plain &= np.where(padding.any(axis=1), padding.argmax(axis=1), width) >= lengths
+        dot = dots.argmax(axis=1)
+        plain &= dots.any(axis=1) & (dot == width - 1 - dots[:, ::-1].argmax(axis=1))
+        
+        # Name of 1-63 chars without a hyphen at either end and not punycode ("xn--");
+        # the TLD is checked once per distinct value below
+        rows = np.arange(len(values))
+        plain &= (dot >= 1) & (dot <= MAX_LABEL_LENGTH) & (dot < lengths - 1)
+        plain &= ~hyphens[:, 0] & ~hyphens[rows, np.maximum(dot - 1, 0)]
+        if width >= 4:
+            plain &= ~(hyphens[:, 2] & hyphens[:, 3])
+        
+        indices = np.flatnonzero(plain)
+        lower, dot, lengths = lower[indices], dot[indices], lengths[indices]
+        positions = np.arange(width)
+        as_strings = lambda matrix: np.ascontiguousarray(matrix, dtype=np.uint32).view(f"<U{width}").ravel()
+        domains = as_strings(lower)
+        names = as_strings(np.where(positions < dot[:, None], lower, 0))
+        tld_positions = dot[:, None] + 1 + positions
+        tlds = as_strings(np.where(
+            tld_positions < lengths[:, None],
+            np.take_along_axis(lower, np.minimum(tld_positions, width - 1), axis=1),
+            0
+        ))
+        
+        # Drop invalid TLDs and names the suffix rules do not split as name + single-label TLD
+        full_parse_tlds, clashing_domains = [], []
+        for tld in set(tlds.tolist()):
+            clashes = None if "-" in tld or tld.isdigit() or len(tld) > MAX_LABEL_LENGTH else self._plain_clashes(tld)
+            if clashes is None:
+                full_parse_tlds.append(tld)
+            else:
+                clashing_domains.extend(f"{label}.{tld}" for label in clashes)
+        keep = ~np.isin(tlds, full_parse_tlds) & ~np.isin(domains, clashing_domains)
+        return indices[keep], domains[keep], names[keep], tlds[keep]
+
+    def _plain_clashes(self, tld: str) -> Optional[FrozenSet[str]]:
+        """Labels that are themselves suffixes under ``tld``; None if ``tld`` needs ``parse``."""
+        node = self._trie.get(tld)
+        if node is None:
+            return None if "!" + tld in self._trie or "*" in self._trie else frozenset()
+        if "*" in node:
+            return None
+        return frozenset(
+            label for label, child in node.items()
+            if label and not label.startswith("!") and _TERMINAL in child
+        )
+
+    def try_parse(self, domain: str) -> Optional[ParsedDomain]:
+        """Parse a domain, returning None instead of raising for invalid input."""
+        try:
+            return self.parse(domain)
+        except ValueError:
+            return None
+
+    def is_valid(self, domain: str) -> bool:
+        return self.try_parse(domain) is not None
+
+    def _suffix_length(self, labels: List[str]) -> int:
+        """Number of trailing labels that form the public suffix (at least one)."""
+        node = self._trie
+        suffix_length = 1  # PSL default rule "*"
+        depth = 0
+        for label in reversed(labels):
+            child = node.get(label)
+            if child is None:
+                if "!" + label in node:
+                    return depth
+                child = node.get("*")
+                if child is None:
+                    break
+            node = child
+            depth += 1
+            if _TERMINAL in node:
+                suffix_length = depth
+        return suffix_length
+
+    def _to_ascii(self, label: str) -> str:
+        return label if label.isascii() else _idna_to_ascii(label)
+
+    def _to_unicode(self, label: str) -> str:
+        return _idna_to_unicode(label) if label.startswith("xn--") else label
+
+# IDNA conversion (nameprep + punycode) is pure Python and costs far more than
+# the rest of a parse; IDN labels repeat across names, so conversions are memoized
+@lru_cache(maxsize=65536)
+def _idna_to_ascii(label: str) -> str:
+    try:
+        return label.encode("idna").decode("ascii")
+    except UnicodeError:
+        raise ValueError("Invalid domain format")
+
+@lru_cache(maxsize=65536)
+def _idna_to_unicode(label: str) -> str:
+    try:
+        return label.encode("ascii").decode("idna")
+    except UnicodeError:
+        raise ValueError("Invalid domain format")
@@ -1,81 +1,370 @@
 import re
-import hashlib
-from typing import Dict, Any, Tuple
+import math
+from functools import partial
+from dataclasses import dataclass, fields
+from typing import Dict, Any, FrozenSet, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 import numpy as np
+from app.core.cache import LRUCache
+from app.core.config import settings
 from app.schemas.domain import DomainScore, DomainTraits
+from app.services.domain_parser import DomainParser, ParsedDomain
+from app.services.keyword_matcher import KeywordMatcher
+from app.services.scoring_config import ScoringConfig, scoring_config_store
+from app.services.trait_store import DomainTraitStore
+
+# Deterministic market variation seeds: 64-bit FNV-1a over the domain's code
+# points, finished with splitmix64 into the two words Box-Muller needs. Both
+# the per-name and the NumPy path compute it, so they agree exactly.
+FNV_OFFSET = 0xcbf29ce484222325
+FNV_PRIME = 0x100000001b3
+GOLDEN_GAMMA = 0x9e3779b97f4a7c15
+MASK_64 = (1 << 64) - 1
+
+def _splitmix64(value: int) -> int:
+    value = ((value ^ (value >> 30)) * 0xbf58476d1ce4e5b9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94d049bb133111eb) & MASK_64
+    return value ^ (value >> 31)
+
+def _splitmix64_array(values: np.ndarray) -> np.ndarray:
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xbf58476d1ce4e5b9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94d049bb133111eb)
+    return values ^ (values >> np.uint64(31))
+
+def domain_hash_words(domain: str) -> Tuple[int, int]:
+    """Two 64-bit words derived from ``domain``."""
+    value = FNV_OFFSET
+    for char in domain:
+        value = ((value ^ ord(char)) * FNV_PRIME) & MASK_64
+    return _splitmix64(value), _splitmix64((value + GOLDEN_GAMMA) & MASK_64)
+
+def domain_hash_words_array(domains: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """``domain_hash_words`` of every string in a NumPy unicode array."""
+    width = domains.dtype.itemsize // 4
+    codes = domains.view(np.uint32).reshape(len(domains), width)
+    values = np.full(len(domains), FNV_OFFSET, dtype=np.uint64)
+    prime = np.uint64(FNV_PRIME)
+    for position in range(width):
+        column = codes[:, position].astype(np.uint64)
+        # Shorter strings are NUL-padded; padding leaves the hash unchanged
+        values = np.where(column != 0, (values ^ column) * prime, values)
+    return _splitmix64_array(values), _splitmix64_array(values + np.uint64(GOLDEN_GAMMA))
+
+@dataclass
+class DomainScoreBatch:
+    """Columnar scoring result, one NumPy array per field."""
+    domains: np.ndarray
+    tlds: np.ndarray
+    lengths: np.ndarray
+    keyword_values: np.ndarray
+    rarities: np.ndarray
+    on_chain_activity: np.ndarray
+    scores: np.ndarray
+    valuations: np.ndarray  # in USD cents
+
+    def __len__(self) -> int:
+        return len(self.domains)
+
+    @classmethod
+    def concatenate(cls, batches: Sequence["DomainScoreBatch"]) -> "DomainScoreBatch":
+        """Join batches end to end, preserving their order."""
+        if len(batches) == 1:
+            return batches[0]
+        return cls(**{
+            field.name: np.concatenate([getattr(batch, field.name) for batch in batches])
+            for field in fields(cls)
+        })
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """Yield one dict per domain, shaped like ``DomainScore`` without reasoning."""
+        columns = zip(
+            self.domains.tolist(), self.scores.tolist(), self.valuations.tolist(),
+            self.lengths.tolist(), self.tlds.tolist(), self.keyword_values.tolist(),
+            self.rarities.tolist(), self.on_chain_activity.tolist(),
+        )
+        for domain, score, valuation, length, tld, keyword_value, rarity, activity in columns:
+            yield {
+                "domain": domain,
+                "score": score,
+                "valuation": valuation,
+                "traits": {
+                    "length": length,
+                    "tld": tld,
+                    "keyword_value": keyword_value,
+                    "rarity": rarity,
+                    "on_chain_activity": activity,
+                },
+            }
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """Convert the columns to plain lists for JSON serialization."""
+        return {field.name: getattr(self, field.name).tolist() for field in fields(self)}
 
 class DomainScoringService:
     def __init__(self):
-        # Predefined keyword values (in practice, this would come from ML model)
-        self.keyword_values = {
-            'crypto': 0.9, 'blockchain': 0.85, 'nft': 0.8, 'defi': 0.8,
-            'tech': 0.7, 'ai': 0.8, 'web3': 0.85, 'metaverse': 0.8,
-            'finance': 0.6, 'banking': 0.6, 'trading': 0.7,
-            'gaming': 0.6, 'play': 0.5, 'game': 0.6,
-            'shop': 0.5, 'store': 0.5, 'buy': 0.5, 'sell': 0.5,
-            'app': 0.6, 'api': 0.7, 'dev': 0.6, 'code': 0.6,
-        }
-        
-        # TLD rarity scores
-        self.tld_rarity = {
-            'com': 0.3, 'net': 0.4, 'org': 0.4, 'io': 0.7,
-            'eth': 0.9, 'crypto': 0.9, 'nft': 0.9, 'dao': 0.9,
-            'ai': 0.8, 'app': 0.7, 'dev': 0.7, 'tech': 0.6,
-        }
+        # Deterministic valuations make results reproducible and therefore cacheable
+        self.deterministic_valuation = settings.SCORING_DETERMINISTIC_VALUATION
+        self.model_version = settings.SCORING_MODEL_VERSION
+        self.score_cache = LRUCache(
+            max_size=settings.SCORE_CACHE_SIZE,
+            ttl=settings.SCORE_CACHE_TTL_SECONDS,
+        )
+        
+        # Keyword values, TLD rarity and weights live in a hot-reloadable snapshot
+        self.config_store = scoring_config_store
+
+    @property
+    def config(self) -> ScoringConfig:
+        """Current scoring config snapshot; read it once per operation."""
+        return self.config_store.current
+
+    @property
+    def keyword_values(self) -> Mapping[str, float]:
+        return self.config.keyword_values
+
+    @property
+    def keyword_matcher(self) -> KeywordMatcher:
+        return self.config.keyword_matcher
+
+    @property
+    def tld_rarity(self) -> Mapping[str, float]:
+        return self.config.tld_rarity
+
+    @property
+    def crypto_tlds(self) -> FrozenSet[str]:
+        return self.config.crypto_tlds
+
+    @property
+    def score_weights(self) -> Mapping[str, float]:
+        return self.config.score_weights
+
+    @property
+    def parser(self) -> DomainParser:
+        return self.config.parser
 
     def score_domain(self, domain: str) -> DomainScore:
         """Score a domain and return comprehensive analysis."""
-        domain = domain.lower().strip()
+        config = self.config
+        parsed = config.parser.parse(domain)
+        domain = parsed.domain
+        
+        # Serve repeated names from the cache when valuations are reproducible
+        cache_key = (self.model_version, config.version, domain)
+        if self.deterministic_valuation:
+            cached = self.score_cache.get(cache_key)
+            if cached is not None:
+                return cached
         
         # Extract components
-        name, tld = self._extract_components(domain)
+        name, tld = parsed.name, parsed.tld
         
         # Calculate traits
-        traits = self._calculate_traits(name, tld)
+        traits = self._calculate_traits(name, tld, config)
         
         # Calculate overall score
-        score = self._calculate_score(traits)
+        score = self._calculate_score(traits, config)
         
         # Calculate valuation
-        valuation = self._calculate_valuation(score, traits)
+        valuation = self._calculate_valuation(domain, score, traits, config)
         
         # Generate reasoning
-        reasoning = self._generate_reasoning(domain, score, traits)
+        reasoning = self._generate_reasoning(domain, score, traits, config)
         
-        return DomainScore(
+        result = DomainScore(
             domain=domain,
             score=score,
             valuation=valuation,
             traits=traits,
             reasoning=reasoning
         )
+        
+        if self.deterministic_valuation:
+            self.score_cache.set(cache_key, result)
+        
+        return result
 
-    def _extract_components(self, domain: str) -> Tuple[str, str]:
-        """Extract domain name and TLD."""
-        parts = domain.split('.')
-        if len(parts) != 2:
-            raise ValueError("Invalid domain format")
+    def create_trait_store(self) -> DomainTraitStore:
+        """Create an empty trait store whose entries get this service's reasoning."""
+        config = self.config
+        return DomainTraitStore(partial(self._generate_reasoning, config=config))
+
+    def score_domains(self, domains: Sequence[Union[str, ParsedDomain]]) -> DomainScoreBatch:
+        """Score many domains at once, computing every trait as a NumPy column.
+
+        Accepts raw strings or records already returned by ``self.parser``.
+        Produces the same traits, scores and valuations as calling
+        ``score_domain`` per name, minus the reasoning text. Use
+        ``scoring_executor.score_domains`` to also fill a trait store.
+        """
+        config = self.config
         
-        name, tld = parts
-        return name, tld
+        # Extract components
+        domains, names, tlds = self._batch_components(domains, config.parser)
+        lengths = np.char.str_len(names).astype(np.int64)
+        
+        # Calculate traits
+        keyword_values = self._batch_keyword_values(names, config)
+        rarities = self._batch_rarity(names, lengths)
+        tld_rarities, crypto_tlds = self._batch_tld_lookup(tlds, config)
+        on_chain_activity = np.minimum(
+            1.0,
+            0.5
+            + 0.3 * crypto_tlds
+            + 0.2 * (lengths <= 4)
+            + 0.2 * (keyword_values > 0.5)
+        )
+        
+        # Calculate overall score
+        weights = config.score_weights
+        length_scores = np.maximum(0, 10 - np.abs(lengths - 6)) / 10.0
+        scores = (
+            weights['length'] * length_scores +
+            weights['keyword_value'] * keyword_values +
+            weights['rarity'] * rarities +
+            weights['tld_rarity'] * tld_rarities +
+            weights['on_chain_activity'] * on_chain_activity
+        )
+        scores = np.clip(scores * 100, 0.0, 100.0)
+        
+        # Calculate valuation
+        length_multipliers = np.select(
+            [lengths <= 4, lengths <= 6, lengths <= 8], [2.0, 1.5, 1.2], default=0.8
+        )
+        valuations = (
+            scores * 100
+            * (1 + keyword_values * 2)
+            * (1 + rarities * 1.5)
+            * (1 + tld_rarities * 2)
+            * length_multipliers
+        )
+        valuations *= np.maximum(0.5, self._batch_market_variation(domains))
+        
+        batch = DomainScoreBatch(
+            domains=domains,
+            tlds=tlds,
+            lengths=lengths,
+            keyword_values=keyword_values,
+            rarities=rarities,
+            on_chain_activity=on_chain_activity,
+            scores=scores,
+            valuations=(valuations * 100).astype(np.int64),
+        )
+        return batch
+
+    def _batch_components(
+        self,
+        domains: Sequence[Union[str, ParsedDomain]],
+        parser: DomainParser
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Domain, name and TLD arrays; plain ``name.tld`` strings skip the per-name trie walk."""
+        if all(type(domain) is str for domain in domains):
+            string_indices = range(len(domains))
+            strings = domains
+        else:
+            string_indices = [index for index, domain in enumerate(domains) if not isinstance(domain, ParsedDomain)]
+            strings = [domains[index] for index in string_indices]
+        plain_positions, plain_domains, plain_names, plain_tlds = parser.split_plain(strings)
+        plain_indices = np.asarray(string_indices, dtype=np.intp)[plain_positions]
+        if len(plain_indices) == len(domains):
+            return plain_domains, plain_names, plain_tlds
+        
+        # Subdomains, multi-label suffixes, IDNs and parsed records take the full path
+        other = np.ones(len(domains), dtype=bool)
+        other[plain_indices] = False
+        other_indices = np.flatnonzero(other)
+        records = [
+            domain if isinstance(domain, ParsedDomain) else parser.parse(domain)
+            for domain in (domains[index] for index in other_indices.tolist())
+        ]
+        domain_list, _, _, name_list, tld_list, _ = zip(*records)
+        columns = []
+        for plain_column, other_column in (
+            (plain_domains, domain_list), (plain_names, name_list), (plain_tlds, tld_list)
+        ):
+            other_column = np.asarray(other_column, dtype=str)
+            column = np.empty(len(domains), dtype=np.result_type(plain_column, other_column))
+            column[plain_indices] = plain_column
+            column[other_indices] = other_column
+            columns.append(column)
+        return tuple(columns)
 
-    def _calculate_traits(self, name: str, tld: str) -> DomainTraits:
+    def _batch_market_variation(self, domains: np.ndarray) -> np.ndarray:
+        """Vectorized ``_market_variation`` over an array of domains."""
+        if not self.deterministic_valuation:
+            return np.random.normal(1.0, 0.2, len(domains))
+        
+        if len(domains) == 0:
+            return np.ones(0)
+        first, second = domain_hash_words_array(domains)
+        u1 = (first.astype(np.float64) + 1.0) / 2.0**64
+        u2 = second.astype(np.float64) / 2.0**64
+        return 1.0 + 0.2 * np.sqrt(-2.0 * np.log(u1)) * np.cos(2.0 * np.pi * u2)
+
+    def _batch_keyword_values(self, names: np.ndarray, config: ScoringConfig) -> np.ndarray:
+        """Keyword values for an array of (lowercase) names, one automaton step per character column."""
+        values = config.keyword_matcher.max_values(names)
+        
+        # Bonus for exact matches
+        keyword_values = config.keyword_values
+        for index in np.flatnonzero(np.isin(names, list(keyword_values))).tolist():
+            values[index] = max(values[index], keyword_values[str(names[index])] + 0.1)
+        return values
+
+    def _batch_rarity(self, names: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """Vectorized ``_calculate_rarity`` using a code point matrix of the names."""
+        width = names.dtype.itemsize // 4
+        if len(names) == 0 or width == 0:
+            return np.clip(np.ones(len(names)), 0.0, 1.0)
+        codes = names.view(np.uint32).reshape(len(names), width)
+        
+        # Runs of repeated characters, counted like re.findall(r'(.)\1+')
+        same = (codes[:, 1:] == codes[:, :-1]) & (codes[:, 1:] != 0)
+        run_starts = same.copy()
+        run_starts[:, 1:] &= ~same[:, :-1]
+        repeated_chars = run_starts.sum(axis=1)
+        
+        numeric_chars = ((codes >= ord('0')) & (codes <= ord('9'))).sum(axis=1)
+        has_special = ((codes == ord('-')) | (codes == ord('_'))).any(axis=1)
+        
+        rarity = 1.0 - repeated_chars * 0.1
+        rarity += np.where((numeric_chars == 1) & (lengths <= 4), 0.2, 0.0)
+        rarity -= np.where(numeric_chars > 2, 0.2, 0.0)
+        rarity -= np.where(has_special, 0.1, 0.0)
+        return np.clip(rarity, 0.0, 1.0)
+
+    def _batch_tld_lookup(self, tlds: np.ndarray, config: ScoringConfig) -> Tuple[np.ndarray, np.ndarray]:
+        """Look up TLD rarity and crypto-TLD flags for an array of TLDs."""
+        tld_list = tlds.tolist()
+        tld_rarity = config.tld_rarity
+        rarity = np.fromiter(
+            (tld_rarity.get(tld, 0.5) for tld in tld_list), dtype=float, count=len(tld_list)
+        )
+        crypto_tlds = config.crypto_tlds
+        crypto = np.fromiter((tld in crypto_tlds for tld in tld_list), dtype=bool, count=len(tld_list))
+        return rarity, crypto
+
+    def _extract_components(self, domain: str) -> Tuple[str, str]:
+        """Extract domain name and TLD (public suffix, e.g. "co.uk")."""
+        parsed = self.config.parser.parse(domain)
+        return parsed.name, parsed.tld
+
+    def _calculate_traits(self, name: str, tld: str, config: Optional[ScoringConfig] = None) -> DomainTraits:
         """Calculate domain traits."""
+        config = config or self.config
         # Length score (shorter is better, but not too short)
         length = len(name)
         length_score = max(0, 10 - abs(length - 6))  # Optimal length around 6
         
         # TLD rarity
-        tld_rarity = self.tld_rarity.get(tld, 0.5)
+        tld_rarity = config.tld_rarity.get(tld, 0.5)
         
         # Keyword value
-        keyword_value = self._calculate_keyword_value(name)
+        keyword_value = self._calculate_keyword_value(name, config)
         
         # Rarity based on character patterns
         rarity = self._calculate_rarity(name)
         
         # On-chain activity (simulated)
-        on_chain_activity = self._simulate_on_chain_activity(name, tld)
+        on_chain_activity = self._simulate_on_chain_activity(name, tld, keyword_value, config)
         
         return DomainTraits(
             length=length,
@@ -85,18 +374,15 @@ class DomainScoringService:
             on_chain_activity=on_chain_activity
         )
 
-    def _calculate_keyword_value(self, name: str) -> float:
+    def _calculate_keyword_value(self, name: str, config: Optional[ScoringConfig] = None) -> float:
         """Calculate keyword value based on predefined keywords."""
+        config = config or self.config
         name_lower = name.lower()
-        max_value = 0.0
-        
-        for keyword, value in self.keyword_values.items():
-            if keyword in name_lower:
-                max_value = max(max_value, value)
+        max_value = config.keyword_matcher.max_value(name_lower)
         
         # Bonus for exact matches
-        if name_lower in self.keyword_values:
-            max_value = max(max_value, self.keyword_values[name_lower] + 0.1)
+        if name_lower in config.keyword_values:
+            max_value = max(max_value, config.keyword_values[name_lower] + 0.1)
         
         return max_value
 
@@ -130,15 +416,22 @@ class DomainScoringService:
         
         return max(0.0, min(1.0, rarity))
 
-    def _simulate_on_chain_activity(self, name: str, tld: str) -> float:
+    def _simulate_on_chain_activity(
+        self,
+        name: str,
+        tld: str,
+        keyword_value: Optional[float] = None,
+        config: Optional[ScoringConfig] = None
+    ) -> float:
         """Simulate on-chain activity based on domain characteristics."""
+        config = config or self.config
         # This would normally query blockchain data
         # For now, simulate based on domain characteristics
         
         activity = 0.5  # Base activity
         
         # Higher activity for crypto-related domains
-        if tld in ['eth', 'crypto', 'nft', 'dao']:
+        if tld in config.crypto_tlds:
             activity += 0.3
         
         # Higher activity for short domains
@@ -146,27 +439,25 @@ class DomainScoringService:
             activity += 0.2
         
         # Higher activity for keyword domains
-        if self._calculate_keyword_value(name) > 0.5:
+        if keyword_value is None:
+            keyword_value = self._calculate_keyword_value(name, config)
+        if keyword_value > 0.5:
             activity += 0.2
         
         return min(1.0, activity)
 
-    def _calculate_score(self, traits: DomainTraits) -> float:
+    def _calculate_score(self, traits: DomainTraits, config: Optional[ScoringConfig] = None) -> float:
         """Calculate overall domain score."""
+        config = config or self.config
+        
         # Weighted combination of traits
-        weights = {
-            'length': 0.15,
-            'keyword_value': 0.25,
-            'rarity': 0.20,
-            'tld_rarity': 0.20,
-            'on_chain_activity': 0.20,
-        }
+        weights = config.score_weights
         
         # Normalize length (shorter is better, but not too short)
         length_score = max(0, 10 - abs(traits.length - 6)) / 10.0
         
         # Get TLD rarity
-        tld_rarity = self.tld_rarity.get(traits.tld, 0.5)
+        tld_rarity = config.tld_rarity.get(traits.tld, 0.5)
         
         # Calculate weighted score
         score = (
@@ -179,15 +470,23 @@ class DomainScoringService:
         
         return min(100.0, max(0.0, score * 100))
 
-    def _calculate_valuation(self, score: float, traits: DomainTraits) -> int:
+    def _calculate_valuation(
+        self,
+        domain: str,
+        score: float,
+        traits: DomainTraits,
+        config: Optional[ScoringConfig] = None
+    ) -> int:
         """Calculate domain valuation in USD cents."""
+        config = config or self.config
+        
         # Base valuation based on score
         base_value = score * 100  # $1 per point
         
         # Multipliers based on traits
         keyword_multiplier = 1 + (traits.keyword_value * 2)
         rarity_multiplier = 1 + (traits.rarity * 1.5)
-        tld_multiplier = 1 + (self.tld_rarity.get(traits.tld, 0.5) * 2)
+        tld_multiplier = 1 + (config.tld_rarity.get(traits.tld, 0.5) * 2)
         
         # Length bonus/penalty
         if traits.length <= 4:
@@ -202,14 +501,36 @@ class DomainScoringService:
         # Calculate final valuation
         valuation = base_value * keyword_multiplier * rarity_multiplier * tld_multiplier * length_multiplier
         
-        # Add some randomness to simulate market variation
-        variation = np.random.normal(1.0, 0.2)
+        # Add market variation (seeded per name in deterministic mode)
+        variation = self._market_variation(domain)
         valuation *= max(0.5, variation)
         
         return int(valuation * 100)  # Convert to cents
 
-    def _generate_reasoning(self, domain: str, score: float, traits: DomainTraits) -> str:
+    def _market_variation(self, domain: str) -> float:
+        """Draw a N(1.0, 0.2) market variation factor for a domain.
+        
+        In deterministic mode the draw is seeded by a hash of the domain name
+        (Box-Muller over ``domain_hash_words``), so the same name always gets
+        the same value.
+        """
+        if not self.deterministic_valuation:
+            return np.random.normal(1.0, 0.2)
+        
+        first, second = domain_hash_words(domain)
+        u1 = (float(first) + 1.0) / 2.0**64
+        u2 = float(second) / 2.0**64
+        return 1.0 + 0.2 * math.sqrt(-2.0 * math.log(u1)) * math.cos(2.0 * math.pi * u2)
+
+    def _generate_reasoning(
+        self,
+        domain: str,
+        score: float,
+        traits: DomainTraits,
+        config: Optional[ScoringConfig] = None
+    ) -> str:
         """Generate human-readable reasoning for the score."""
+        config = config or self.config
         reasons = []
         
         # Length reasoning
@@ -229,7 +550,7 @@ class DomainScoringService:
             reasons.append("Contains valuable keywords")
         
         # TLD reasoning
-        tld_rarity = self.tld_rarity.get(traits.tld, 0.5)
+        tld_rarity = config.tld_rarity.get(traits.tld, 0.5)
         if tld_rarity > 0.8:
             reasons.append("Rare and valuable TLD")
         elif tld_rarity > 0.6:
@@ -0,0 +1,241 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.events import MarketDataBus
+from app.services.model_registry import BACKEND_DIR, FEATURE_NAMES
+from app.services.scoring_config import ScoringConfig, scoring_config_store
+
+logger = logging.getLogger(__name__)
+
+# Used when feature extraction fails for a candidate
+DEFAULT_FEATURES = (10.0, 0.5, 0.5, 10000.0, 0.0, 0.0)
+
+def get_tld_popularity(tld: str, config: Optional[ScoringConfig] = None) -> float:
+    """Get TLD popularity score (0-1)."""
+    config = config or scoring_config_store.current
+    return config.tld_popularity.get(tld.lower(), 0.2)
+
+def get_keyword_value(domain_data: Dict[str, Any], config: Optional[ScoringConfig] = None) -> float:
+    """Get keyword value from upstream data, or derive it from the domain name."""
+    if "keyword_value" in domain_data:
+        return domain_data["keyword_value"]
+
+    config = config or scoring_config_store.current
+    name = domain_data.get("name", "")
+    base_name = name.split(".")[0] if "." in name else name
+    keyword_value = config.keyword_matcher.max_value(base_name)
+    return keyword_value if keyword_value > 0 else 0.5
+
+def extract_features(domain_data: Dict[str, Any], config: Optional[ScoringConfig] = None) -> List[float]:
+    """Derive the model feature vector (``FEATURE_NAMES`` order) from raw domain data."""
+    try:
+        name = domain_data.get("name", "")
+        base_name = name.split(".")[0] if "." in name else name
+
+        return [
+            len(base_name),  # length
+            get_tld_popularity(name.split(".")[-1] if "." in name else "", config),  # tld_popularity
+            get_keyword_value(domain_data, config),  # keyword_value
+            domain_data.get("market_volume", 10000),  # market_volume
+            domain_data.get("price_change_24h", 0),  # price_trend
+            domain_data.get("social_sentiment", 0)  # social_sentiment
+        ]
+
+    except Exception as e:
+        logger.error(f"Error extracting features: {str(e)}")
+        return list(DEFAULT_FEATURES)
+
+def domain_key(domain_data: Dict[str, Any]) -> str:
+    """Row key for ``domain_data``; trend records carry the name under ``domain``."""
+    return domain_data.get("name") or domain_data.get("domain", "")
+
+# A row is stale once the scoring config or any upstream field its features
+# are derived from changes
+def source_fingerprint(domain_data: Dict[str, Any], config: ScoringConfig) -> str:
+    """Stable digest of everything a domain's features are derived from."""
+    get = domain_data.get
+    source = (config.version, get("keyword_value"), get("market_volume"),
+              get("price_change_24h"), get("social_sentiment"))
+    # Hashed rather than stored as JSON so values JSON cannot round-trip
+    # (Decimal, datetime) still compare equal after a reload
+    return hashlib.sha256(json.dumps(source, default=repr).encode("utf-8")).hexdigest()
+
+class FeatureRow(NamedTuple):
+    features: tuple
+    fingerprint: str
+    updated_at: float
+
+class FeatureStore:
+    """Precomputed model features per domain: SQLite table plus an LRU hot tier.
+
+    Each row holds the latest ``FEATURE_NAMES`` values for a domain and the
+    fingerprint of the upstream data they came from. ``get_matrix`` serves rows
+    whose fingerprint still matches and re-derives only the stale or missing
+    ones, writing them back in one batch, so repeated candidates cost a lookup
+    instead of a feature extraction. ``start_following`` refreshes rows from
+    market data bus snapshots, so most requests find them already current.
+    """
+
+    def __init__(self, path: Optional[str] = None, hot_size: Optional[int] = None):
+        self.path = os.path.join(BACKEND_DIR, path) if path else ":memory:"
+        if path:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.hot = LRUCache(max_size=hot_size or settings.FEATURE_STORE_HOT_SIZE)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS domain_features ("
+            "domain TEXT PRIMARY KEY, "
+            + ", ".join(f"{name} REAL NOT NULL" for name in FEATURE_NAMES)
+            + ", fingerprint TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self.refreshed = 0
+        self._follow_tasks: List[asyncio.Task] = []
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM domain_features").fetchone()[0]
+
+    def get(self, domain: str) -> Optional[FeatureRow]:
+        """Stored row for ``domain`` (hot tier first), whether or not it is current."""
+        row = self.hot.get(domain)
+        if row is None:
+            row = self._load([domain]).get(domain)
+            if row is not None:
+                self.hot.set(domain, row)
+        return row
+
+    def get_matrix(
+        self,
+        market_data: Sequence[Dict[str, Any]],
+        config: Optional[ScoringConfig] = None
+    ) -> np.ndarray:
+        """Feature matrix for ``market_data``, refreshing only rows whose source changed."""
+        config = config or scoring_config_store.current
+        matrix = np.empty((len(market_data), len(FEATURE_NAMES)), dtype=np.float64)
+        fingerprints = [source_fingerprint(domain_data, config) for domain_data in market_data]
+
+        missing = []
+        for index, (domain_data, fingerprint) in enumerate(zip(market_data, fingerprints)):
+            row = self.hot.get(domain_key(domain_data))
+            if row is not None and row.fingerprint == fingerprint:
+                matrix[index] = row.features
+            else:
+                missing.append(index)
+        if not missing:
+            return matrix
+
+        # Second tier: rows persisted by this or an earlier process
+        stored = self._load([domain_key(market_data[index]) for index in missing])
+        stale = []
+        for index in missing:
+            domain = domain_key(market_data[index])
+            row = stored.get(domain)
+            if row is not None and row.fingerprint == fingerprints[index]:
+                matrix[index] = row.features
+                self.hot.set(domain, row)
+            else:
+                stale.append(index)
+
+        if stale:
+            rows = {}
+            for index in stale:
+                try:
+                    features = tuple(float(value) for value in extract_features(market_data[index], config))
+                except (TypeError, ValueError) as e:
+                    logger.error(f"Error extracting features: {str(e)}")
+                    features = DEFAULT_FEATURES
+                matrix[index] = features
+                rows[domain_key(market_data[index])] = FeatureRow(features, fingerprints[index], time.time())
+            self._store(rows)
+        return matrix
+
+    def refresh(self, market_data: Sequence[Dict[str, Any]], config: Optional[ScoringConfig] = None) -> int:
+        """Push new upstream data; returns how many rows actually changed."""
+        before = self.refreshed
+        self.get_matrix(market_data, config)
+        return self.refreshed - before
+
+    async def _follow(self, bus: MarketDataBus, topic: str):
+        queue = bus.subscribe(topic)
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                snapshot = await queue.get()
+                try:
+                    changed = await loop.run_in_executor(None, self.refresh, snapshot.data)
+                    logger.debug(f"Refreshed {changed} feature rows from {topic} v{snapshot.version}")
+                except Exception as e:
+                    logger.error(f"Error refreshing features from {topic}: {str(e)}")
+        finally:
+            bus.unsubscribe(queue)
+
+    def start_following(self, bus: MarketDataBus, topics: Sequence[str]):
+        """Refresh rows from every snapshot published on ``topics`` (lists of domain records)."""
+        if any(not task.done() for task in self._follow_tasks):
+            return
+        loop = asyncio.get_running_loop()
+        self._follow_tasks = [loop.create_task(self._follow(bus, topic)) for topic in topics]
+        logger.info(f"Refreshing features from {', '.join(topics)}")
+
+    async def stop_following(self):
+        for task in self._follow_tasks:
+            task.cancel()
+        await asyncio.gather(*self._follow_tasks, return_exceptions=True)
+        self._follow_tasks = []
+
+    def _load(self, domains: List[str]) -> Dict[str, FeatureRow]:
+        rows = {}
+        columns = ", ".join(FEATURE_NAMES)
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(domains), 500):
+                chunk = domains[start:start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor = self._conn.execute(
+                    f"SELECT domain, {columns}, fingerprint, updated_at "
+                    f"FROM domain_features WHERE domain IN ({placeholders})",
+                    chunk,
+                )
+                for record in cursor:
+                    rows[record[0]] = FeatureRow(tuple(record[1:-2]), record[-2], record[-1])
+        return rows
+
+    def _store(self, rows: Dict[str, FeatureRow]):
+        placeholders = ", ".join("?" * (len(FEATURE_NAMES) + 3))
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO domain_features VALUES ({placeholders})",
+                [
+                    (domain, *row.features, row.fingerprint, row.updated_at)
+                    for domain, row in rows.items()
+                ],
+            )
+            self._conn.commit()
+            self.refreshed += len(rows)
+        for domain, row in rows.items():
+            self.hot.set(domain, row)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "rows": len(self),
+            "refreshed": self.refreshed,
+            "hot": self.hot.stats(),
+        }
+
+# Global instance
+feature_store = FeatureStore(settings.FEATURE_STORE_PATH)
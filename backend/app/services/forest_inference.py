@@ -0,0 +1,156 @@
+import json
+import os
+from typing import Optional
+
+import numpy as np
+
+# One .npy file per array so every array can be memory-mapped on its own
+FOREST_ARRAYS = ("feature", "threshold", "children", "value", "roots", "scaler_mean", "scaler_scale")
+FOREST_META_FILE = "forest.json"
+
+def _float32_floor(thresholds: np.ndarray) -> np.ndarray:
+    """Largest float32 <= each float64 threshold.
+
+    For float32 inputs ``x <= t`` and ``x <= floor32(t)`` agree, so the walk can
+    compare in float32 and still follow sklearn's splits exactly.
+    """
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    rounded = thresholds.astype(np.float32)
+    above = rounded.astype(np.float64) > thresholds
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+class FlatForest:
+    """RandomForestRegressor flattened into NumPy arrays for batch inference.
+
+    All trees share one node table (``feature``, ``threshold``, ``value`` and
+    ``children``, which interleaves left/right child per node); ``roots`` holds
+    each tree's first node. Leaves point at themselves, so every row walks every
+    tree for a fixed ``depth`` steps with flat array indexing and no per-row
+    Python work. The fitted ``StandardScaler`` is folded in as
+    ``scaler_mean``/``scaler_scale``.
+
+    ``save`` writes one ``.npy`` per array; ``load`` memory-maps them read-only,
+    so uvicorn workers on one host share a single copy of the model pages.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        children: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        scaler_mean: np.ndarray,
+        scaler_scale: np.ndarray,
+        depth: int
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.scaler_mean = scaler_mean
+        self.scaler_scale = scaler_scale
+        self.depth = depth
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_features(self) -> int:
+        return len(self.scaler_mean)
+
+    @classmethod
+    def from_sklearn(cls, model, scaler=None) -> "FlatForest":
+        """Flatten a fitted ``RandomForestRegressor`` (and optional ``StandardScaler``)."""
+        features, thresholds, children, values, roots = [], [], [], [], []
+        offset = 0
+        depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count, dtype=np.intp) + offset
+            leaf = tree.children_left < 0
+
+            features.append(np.where(leaf, 0, tree.feature).astype(np.intp))
+            thresholds.append(_float32_floor(np.where(leaf, 0.0, tree.threshold)))
+            left = np.where(leaf, nodes, tree.children_left + offset)
+            right = np.where(leaf, nodes, tree.children_right + offset)
+            children.append(np.column_stack([left, right]).astype(np.intp).ravel())
+            values.append(tree.value[:, 0, 0].astype(np.float64))
+            roots.append(offset)
+
+            depth = max(depth, tree.max_depth)
+            offset += tree.node_count
+
+        n_features = model.n_features_in_
+        if scaler is not None:
+            scaler_mean = np.asarray(scaler.mean_, dtype=np.float64)
+            scaler_scale = np.asarray(scaler.scale_, dtype=np.float64)
+        else:
+            scaler_mean = np.zeros(n_features, dtype=np.float64)
+            scaler_scale = np.ones(n_features, dtype=np.float64)
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            children=np.concatenate(children),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.intp),
+            scaler_mean=scaler_mean,
+            scaler_scale=scaler_scale,
+            depth=depth,
+        )
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """Apply the folded-in scaler, like ``StandardScaler.transform``."""
+        X = np.array(X, dtype=np.float64)
+        X -= self.scaler_mean
+        X /= self.scaler_scale
+        return X
+
+    def predict(self, X: np.ndarray, scaled: bool = False) -> np.ndarray:
+        """Predict raw (unscaled unless ``scaled``) feature rows; returns one value per row."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected rows of {self.n_features} features, got shape {X.shape}")
+        if len(X) == 0:
+            return np.empty(0, dtype=np.float64)
+        if not scaled:
+            X = self.transform(X)
+        # sklearn casts features to float32 before comparing against thresholds
+        n_rows = len(X)
+        values = X.astype(np.float32).ravel()
+
+        # nodes[i * n_trees + t]: current node of row i in tree t
+        row_offsets = np.repeat(np.arange(n_rows, dtype=np.intp) * self.n_features, self.n_trees)
+        nodes = np.tile(np.asarray(self.roots, dtype=np.intp), n_rows)
+        feature, threshold, children = self.feature, self.threshold, self.children
+        for _ in range(self.depth):
+            goes_right = values[row_offsets + feature[nodes]] > threshold[nodes]
+            nodes = children[2 * nodes + goes_right]
+
+        return self.value[nodes].reshape(n_rows, self.n_trees).mean(axis=1)
+
+    def save(self, path: str) -> None:
+        """Write the arrays as ``.npy`` files under the directory ``path``."""
+        os.makedirs(path, exist_ok=True)
+        for name in FOREST_ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(path, FOREST_META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"depth": self.depth, "n_trees": self.n_trees, "n_features": self.n_features}, f)
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: Optional[str] = "r") -> "FlatForest":
+        """Load a saved forest; arrays are memory-mapped read-only by default."""
+        with open(os.path.join(path, FOREST_META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+            for name in FOREST_ARRAYS
+        }
+        forest = cls(depth=int(meta["depth"]), **arrays)
+        if forest.n_trees != meta["n_trees"] or forest.n_features != meta["n_features"]:
+            raise ValueError(f"Forest arrays in {path} do not match {FOREST_META_FILE}")
+        return forest
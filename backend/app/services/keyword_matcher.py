@@ -0,0 +1,197 @@
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+class KeywordMatch(NamedTuple):
+    keyword: str
+    start: int
+    end: int
+    value: float
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a keyword dictionary.
+
+    The automaton is compiled once from ``{keyword: value}`` and then finds every
+    keyword occurring in a text in a single pass, independent of dictionary size.
+    Matching is case-insensitive.
+    """
+
+    def __init__(self, keyword_values: Mapping[str, float]):
+        self.keywords: List[str] = []
+        self.values: List[float] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[Tuple[int, ...]] = [()]
+        self._best: List[float] = [0.0]
+        self._depth: List[int] = [0]
+        self._dfa: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+        for keyword, value in keyword_values.items():
+            keyword = keyword.lower()
+            if keyword:
+                self._add(keyword, float(value))
+        self._build()
+
+    @classmethod
+    def from_keywords(cls, keywords: Iterable[str], value: float = 1.0) -> "KeywordMatcher":
+        """Build a matcher where every keyword carries the same value."""
+        return cls({keyword: value for keyword in keywords})
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        """Return every keyword occurrence in ``text`` with its [start, end) span."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        matches = []
+        node = 0
+        for position, char in enumerate(text.lower()):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in outputs[node]:
+                keyword = self.keywords[index]
+                matches.append(KeywordMatch(
+                    keyword, position + 1 - len(keyword), position + 1, self.values[index]
+                ))
+        return matches
+
+    def max_value(self, text: str) -> float:
+        """Return the highest value of any keyword in ``text`` (0.0 if none match)."""
+        goto, fail, best = self._goto, self._fail, self._best
+        max_value = 0.0
+        node = 0
+        for char in text.lower():
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if best[node] > max_value:
+                max_value = best[node]
+        return max_value
+
+    def max_values(self, texts: np.ndarray) -> np.ndarray:
+        """``max_value`` of every string in a NumPy unicode array of lowercase texts.
+
+        Runs the automaton as a dense transition table over all texts at once,
+        one character column per step, instead of one Python loop per text.
+        """
+        texts = np.asarray(texts)
+        if texts.dtype.kind != "U":
+            texts = texts.astype(str)
+        width = texts.dtype.itemsize // 4
+        if len(texts) == 0 or width == 0:
+            return np.zeros(len(texts))
+
+        delta, char_classes, best = self._dense_automaton()
+        n_classes = delta.shape[1]
+        transitions = delta.ravel()
+        codes = texts.view(np.uint32).reshape(len(texts), width)
+        # Characters outside every keyword (and the NUL padding) map to class 0
+        classes = char_classes[np.minimum(codes, len(char_classes) - 1)]
+
+        state = np.zeros(len(texts), dtype=np.intp)
+        values = np.zeros(len(texts))
+        for position in range(width):
+            state = transitions[state * n_classes + classes[:, position]]
+            np.maximum(values, best[state], out=values)
+        return values
+
+    def _dense_automaton(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Transition table ``[state, char class]`` with failure links folded in."""
+        if self._dfa is None:
+            alphabet = sorted({char for edges in self._goto for char in edges})
+            char_classes = np.zeros(
+                max((ord(char) for char in alphabet), default=0) + 2,
+                dtype=np.uint8 if len(alphabet) < 256 else np.intp
+            )
+            for index, char in enumerate(alphabet, start=1):
+                char_classes[ord(char)] = index
+
+            delta = np.zeros((len(self._goto), len(alphabet) + 1), dtype=np.intp)
+            # Breadth-first, so a node's failure target already has its row
+            order = [0]
+            for node in order:
+                order.extend(self._goto[node].values())
+            for node in order:
+                if node:
+                    delta[node] = delta[self._fail[node]]
+                for char, child in self._goto[node].items():
+                    delta[node, char_classes[ord(char)]] = child
+            self._dfa = (delta, char_classes, np.asarray(self._best, dtype=np.float64))
+        return self._dfa
+
+    def advance(self, state: int, text: str) -> Tuple[int, float]:
+        """Continue a scan from automaton ``state`` (0 = start) over ``text``.
+
+        Returns the new state and the highest value of any keyword ending inside
+        ``text``, so a growing string can be matched without rescanning it.
+        """
+        goto, fail, best = self._goto, self._fail, self._best
+        max_value = 0.0
+        node = state
+        for char in text.lower():
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if best[node] > max_value:
+                max_value = best[node]
+        return node, max_value
+
+    def state_depth(self, state: int) -> int:
+        """Length of the longest text suffix that is still a keyword prefix in ``state``."""
+        return self._depth[state]
+
+    def contains_any(self, text: str) -> bool:
+        """Return True if at least one keyword occurs in ``text``."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        node = 0
+        for char in text.lower():
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if outputs[node]:
+                return True
+        return False
+
+    def _add(self, keyword: str, value: float):
+        """Insert a keyword into the trie, keeping the highest value for duplicates."""
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append(())
+                self._best.append(0.0)
+                self._depth.append(self._depth[node] + 1)
+            node = next_node
+
+        if self._outputs[node]:
+            index = self._outputs[node][0]
+            self.values[index] = max(self.values[index], value)
+        else:
+            self._outputs[node] = (len(self.keywords),)
+            self.keywords.append(keyword)
+            self.values.append(value)
+
+    def _build(self):
+        """Compute failure links and merge outputs along them (breadth-first)."""
+        for index, keyword_index in enumerate(self._outputs):
+            if keyword_index:
+                self._best[index] = self.values[keyword_index[0]]
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                fail_node = self._goto[fallback].get(char, 0)
+                self._fail[child] = fail_node
+                self._outputs[child] = self._outputs[child] + self._outputs[fail_node]
+                self._best[child] = max(self._best[child], self._best[fail_node])
+                queue.append(child)
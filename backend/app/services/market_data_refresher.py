@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.events import MarketDataBus, Snapshot, market_data_bus
+from app.core.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+class RefreshJob:
+    """One market data source refreshed on an interval, with its counters."""
+
+    def __init__(self, topic: str, fetch: Callable[[], Awaitable[Any]], interval: float):
+        self.topic = topic
+        self.fetch = fetch
+        self.interval = interval
+        self.task: Optional[asyncio.Task] = None
+        self.inflight: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.empty = 0
+        self.failed = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.fetch_time = Histogram()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "interval_seconds": self.interval,
+            "scheduled": self.task is not None and not self.task.done(),
+            "runs": self.runs,
+            "empty": self.empty,
+            "failed": self.failed,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_error": self.last_error,
+            "fetch_time_seconds": self.fetch_time.stats(),
+        }
+
+class MarketDataRefresher:
+    """Refreshes market data off the request path and publishes it on a bus.
+
+    Each job fetches on its own interval, scaled by a random factor in
+    ``1 ± jitter`` so sources (and app instances) do not hit upstreams in
+    lockstep. Non-empty results are published to the bus; empty or failed
+    fetches keep the previous snapshot. Handlers read ``latest``, which only
+    serves snapshots younger than ``max_age_intervals`` job intervals and
+    refreshes inline otherwise (cold start, or the job kept failing).
+    """
+
+    def __init__(
+        self,
+        bus: Optional[MarketDataBus] = None,
+        jitter: Optional[float] = None,
+        max_age_intervals: Optional[float] = None
+    ):
+        self.bus = bus or market_data_bus
+        self.jitter = settings.MARKET_REFRESH_JITTER if jitter is None else jitter
+        self.max_age_intervals = (
+            settings.MARKET_REFRESH_MAX_AGE_INTERVALS if max_age_intervals is None else max_age_intervals
+        )
+        self.jobs: Dict[str, RefreshJob] = {}
+
+    def add_job(self, topic: str, fetch: Callable[[], Awaitable[Any]], interval: float):
+        """Register (or replace) the fetcher publishing ``topic`` every ``interval`` seconds."""
+        self.jobs[topic] = RefreshJob(topic, fetch, interval)
+
+    def max_age(self, topic: str) -> float:
+        """Oldest snapshot of ``topic`` that ``latest`` still serves, in seconds."""
+        return self.jobs[topic].interval * self.max_age_intervals
+
+    async def latest(self, topic: str) -> Optional[Snapshot]:
+        """Latest snapshot of ``topic`` within ``max_age``, refreshing it inline otherwise."""
+        snapshot = self.bus.latest(topic, max_age=self.max_age(topic))
+        if snapshot is None:
+            snapshot = await self.refresh(topic)
+        return snapshot
+
+    async def refresh(self, topic: str) -> Optional[Snapshot]:
+        """Fetch ``topic`` now and publish it; concurrent calls share one fetch.
+
+        Returns the published snapshot, or None when the fetch failed or came back empty.
+        """
+        job = self.jobs[topic]
+        if job.inflight is None or job.inflight.done():
+            job.inflight = asyncio.get_running_loop().create_task(self._run(job))
+        return await asyncio.shield(job.inflight)
+
+    async def _run(self, job: RefreshJob) -> Optional[Snapshot]:
+        started = time.perf_counter()
+        job.runs += 1
+        job.last_run_at = datetime.utcnow()
+        try:
+            data = await job.fetch()
+        except Exception as e:
+            job.failed += 1
+            job.last_error = str(e)
+            logger.error(f"Error refreshing {job.topic}: {str(e)}")
+            return None
+        finally:
+            job.fetch_time.observe(time.perf_counter() - started)
+        if data:
+            job.last_error = None
+            return self.bus.publish(job.topic, data)
+        if self.bus.latest(job.topic) is not None:
+            # Fetchers swallow upstream errors and return nothing; once the
+            # topic has had data, an empty result means the source is down
+            job.failed += 1
+            job.last_error = "empty result"
+            logger.error(f"Error refreshing {job.topic}: empty result")
+        else:
+            job.empty += 1
+        return None
+
+    def _next_delay(self, interval: float) -> float:
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _run_forever(self, job: RefreshJob):
+        # Spread the first fetches too, so jobs started together do not fire together
+        await asyncio.sleep(random.uniform(0, job.interval * self.jitter))
+        while True:
+            await self.refresh(job.topic)
+            await asyncio.sleep(self._next_delay(job.interval))
+
+    def start(self):
+        """Schedule every job on the running event loop."""
+        loop = asyncio.get_running_loop()
+        for job in self.jobs.values():
+            if job.task is None or job.task.done():
+                job.task = loop.create_task(self._run_forever(job))
+        logger.info(f"Refreshing market data: {', '.join(f'{t} every {j.interval}s' for t, j in self.jobs.items())}")
+
+    async def stop(self):
+        """Cancel every scheduled job."""
+        tasks = [job.task for job in self.jobs.values() if job.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self.jobs.values():
+            job.task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "jitter": self.jitter,
+            "max_age_intervals": self.max_age_intervals,
+            "jobs": {
+                topic: {**job.stats(), "fresh": self.bus.latest(topic, max_age=self.max_age(topic)) is not None}
+                for topic, job in self.jobs.items()
+            },
+            "bus": self.bus.stats(),
+        }
+
+# Global instance
+market_data_refresher = MarketDataRefresher()
@@ -0,0 +1,330 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import Histogram, spans
+from app.services.forest_inference import FlatForest
+
+logger = logging.getLogger(__name__)
+
+# Artifact layout: <model_dir>/<version>/{metadata.json, forest/*.npy} and
+# <model_dir>/LATEST naming the version to serve
+FEATURE_NAMES = [
+    "length", "tld_popularity", "keyword_value", "market_volume", "price_trend", "social_sentiment",
+]
+LATEST_POINTER = "LATEST"
+METADATA_FILE = "metadata.json"
+FOREST_DIR = "forest"
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class LoadedModel(NamedTuple):
+    version: str
+    forest: FlatForest
+    metadata: Dict[str, Any]
+    loaded_at: datetime
+
+class ShadowStats:
+    """Latency and prediction differences of a shadow model against the live one."""
+
+    def __init__(self, live_version: str, shadow_version: str, sample_rate: float):
+        self.live_version = live_version
+        self.shadow_version = shadow_version
+        self.sample_rate = sample_rate
+        self.live_latency = Histogram()
+        self.shadow_latency = Histogram()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.rows = 0
+        self.errors = 0
+        self.abs_diff_sum = 0.0
+        self.rel_diff_sum = 0.0
+        self.max_abs_diff = 0.0
+
+    def record(self, live: np.ndarray, shadow: np.ndarray, live_seconds: float, shadow_seconds: float):
+        diff = np.abs(shadow - live)
+        rel = diff / np.maximum(np.abs(live), 1e-9)
+        self.live_latency.observe(live_seconds)
+        self.shadow_latency.observe(shadow_seconds)
+        with self._lock:
+            self.requests += 1
+            self.rows += len(live)
+            self.abs_diff_sum += float(diff.sum())
+            self.rel_diff_sum += float(rel.sum())
+            self.max_abs_diff = max(self.max_abs_diff, float(diff.max(initial=0.0)))
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "live_version": self.live_version,
+            "shadow_version": self.shadow_version,
+            "sample_rate": self.sample_rate,
+            "requests": self.requests,
+            "rows": self.rows,
+            "errors": self.errors,
+            "mean_abs_diff": self.abs_diff_sum / self.rows if self.rows else 0.0,
+            "mean_rel_diff": self.rel_diff_sum / self.rows if self.rows else 0.0,
+            "max_abs_diff": self.max_abs_diff,
+            "live_latency_seconds": self.live_latency.stats(),
+            "shadow_latency_seconds": self.shadow_latency.stats(),
+        }
+
+def resolve_model_dir(model_dir: Optional[str] = None) -> str:
+    """Absolute artifact directory; relative paths are taken from the backend directory."""
+    return os.path.join(BACKEND_DIR, model_dir or settings.AI_MODEL_DIR)
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """Write ``data`` to ``path`` so readers see either the old or the new file."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class ModelRegistry:
+    """Versioned valuation models with atomic activation and shadow evaluation.
+
+    Artifacts are ``metadata.json`` plus the flat forest as ``.npy`` arrays
+    (memory-mapped, never unpickled). The live model is one reference that
+    ``activate`` swaps in a single assignment, so in-flight predictions finish
+    on the model they started with. A candidate set with ``set_shadow`` is run
+    next to the live model on a sample of ``predict`` calls; only the live
+    predictions are returned.
+    """
+
+    def __init__(self, model_dir: Optional[str] = None):
+        self.model_dir = resolve_model_dir(model_dir)
+        self._lock = threading.Lock()
+        self._live: Optional[LoadedModel] = None
+        self._shadow: Optional[LoadedModel] = None
+        self._shadow_stats: Optional[ShadowStats] = None
+        self._watch_task: Optional[asyncio.Task] = None
+        self.latency = Histogram()
+
+    @property
+    def live(self) -> Optional[LoadedModel]:
+        return self._live
+
+    @property
+    def version(self) -> Optional[str]:
+        live = self._live
+        return live.version if live else None
+
+    def list_versions(self) -> List[Dict[str, Any]]:
+        """Metadata of every artifact in ``model_dir``, oldest first."""
+        if not os.path.isdir(self.model_dir):
+            return []
+        latest = self.latest_version()
+        live, shadow = self.version, self._shadow.version if self._shadow else None
+        versions = []
+        for name in sorted(os.listdir(self.model_dir)):
+            metadata_path = os.path.join(self.model_dir, name, METADATA_FILE)
+            if name.startswith(".") or not os.path.isfile(metadata_path):
+                continue
+            try:
+                with open(metadata_path, encoding="utf-8") as f:
+                    metadata = json.load(f)
+            except (OSError, ValueError) as e:
+                metadata = {"error": str(e)}
+            versions.append({
+                **metadata,
+                "version": name,
+                "live": name == live,
+                "shadow": name == shadow,
+                "latest": name == latest,
+            })
+        return versions
+
+    def latest_version(self) -> Optional[str]:
+        """The version LATEST points at, if any."""
+        try:
+            with open(os.path.join(self.model_dir, LATEST_POINTER), encoding="utf-8") as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def load(self, version: str) -> LoadedModel:
+        """Load and validate one artifact; raises OSError/ValueError on failure."""
+        if not version or os.sep in version or version.startswith("."):
+            raise ValueError(f"Invalid model version: {version!r}")
+        version_dir = os.path.join(self.model_dir, version)
+        with open(os.path.join(version_dir, METADATA_FILE), encoding="utf-8") as f:
+            metadata = json.load(f)
+        if metadata.get("features") != FEATURE_NAMES:
+            raise ValueError(f"Model {version} was trained on features {metadata.get('features')}")
+        forest_dir = os.path.join(version_dir, FOREST_DIR)
+        if not os.path.isdir(forest_dir):
+            raise ValueError(f"Model {version} has no {FOREST_DIR}/ arrays; retrain it")
+        forest = FlatForest.load(forest_dir)
+        if forest.n_features != len(FEATURE_NAMES):
+            raise ValueError(f"Model {version} expects {forest.n_features} features")
+        return LoadedModel(version, forest, metadata, datetime.utcnow())
+
+    def activate(self, version: Optional[str] = None, persist: bool = True) -> LoadedModel:
+        """Load ``version`` (default: LATEST) and make it the live model.
+
+        With ``persist`` LATEST is updated too, so restarts keep serving it. If
+        loading fails the current live model stays in place.
+        """
+        with self._lock:
+            version = version or self.latest_version()
+            if not version:
+                raise ValueError(f"No model version given and no {LATEST_POINTER} in {self.model_dir}")
+            model = self.load(version)
+            previous = self._live
+            self._live = model
+            if self._shadow is not None and self._shadow.version == version:
+                self._shadow = None
+                self._shadow_stats = None
+            if persist and self.latest_version() != version:
+                _write_atomic(os.path.join(self.model_dir, LATEST_POINTER), f"{version}\n".encode())
+        logger.info(f"Live model: {previous.version if previous else None} -> {version}")
+        return model
+
+    def sync_latest(self) -> bool:
+        """Activate the version LATEST points at if another process moved it.
+
+        Returns whether the live model changed; a version that fails to load
+        is logged and the current live model stays in place.
+        """
+        latest = self.latest_version()
+        if not latest or latest == self.version:
+            return False
+        try:
+            self.activate(latest, persist=False)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading model {latest} from {LATEST_POINTER}: {str(e)}")
+            return False
+        return True
+
+    async def _watch_latest(self, interval: float):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            await loop.run_in_executor(None, self.sync_latest)
+
+    def start_watching(self, interval: float):
+        """Poll LATEST every ``interval`` seconds on the running event loop and hot-swap to it."""
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.get_running_loop().create_task(self._watch_latest(interval))
+            logger.info(f"Watching {LATEST_POINTER} in {self.model_dir} every {interval}s")
+
+    async def stop_watching(self):
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+    def set_shadow(self, version: str, sample_rate: float = 0.1) -> LoadedModel:
+        """Run ``version`` in shadow on ``sample_rate`` of predict calls."""
+        if not 0.0 < sample_rate <= 1.0:
+            raise ValueError("Shadow sample_rate must be in (0, 1]")
+        with self._lock:
+            if self._live is None:
+                raise ValueError("Activate a live model before adding a shadow")
+            model = self.load(version)
+            self._shadow_stats = ShadowStats(self._live.version, version, sample_rate)
+            self._shadow = model
+        logger.info(f"Shadow model {version} at sample rate {sample_rate}")
+        return model
+
+    def clear_shadow(self) -> Optional[Dict[str, Any]]:
+        """Stop shadowing and return the final comparison."""
+        with self._lock:
+            stats = self._shadow_stats
+            self._shadow = None
+            self._shadow_stats = None
+        return stats.stats() if stats else None
+
+    def predict(self, features: np.ndarray) -> Optional[np.ndarray]:
+        """Predict with the live model (None if there is none), sampling the shadow."""
+        live = self._live
+        if live is None:
+            return None
+        start = time.perf_counter()
+        with spans.span("ai.scale"):
+            scaled = live.forest.transform(features)
+        with spans.span("ai.predict"):
+            predictions = live.forest.predict(scaled, scaled=True)
+        live_seconds = time.perf_counter() - start
+        self.latency.observe(live_seconds)
+
+        shadow, shadow_stats = self._shadow, self._shadow_stats
+        if shadow is not None and shadow_stats is not None and random.random() < shadow_stats.sample_rate:
+            try:
+                start = time.perf_counter()
+                shadow_predictions = shadow.forest.predict(features)
+                shadow_stats.record(predictions, shadow_predictions, live_seconds, time.perf_counter() - start)
+            except Exception as e:
+                shadow_stats.record_error()
+                logger.error(f"Error running shadow model {shadow.version}: {str(e)}")
+        return predictions
+
+    def stats(self) -> Dict[str, Any]:
+        live, shadow_stats = self._live, self._shadow_stats
+        return {
+            "model_dir": self.model_dir,
+            "live_version": live.version if live else None,
+            "live_loaded_at": live.loaded_at.isoformat() if live else None,
+            "latest_version": self.latest_version(),
+            "predict_latency_seconds": self.latency.stats(),
+            "shadow": shadow_stats.stats() if shadow_stats else None,
+        }
+
+def save_artifact(
+    forest: FlatForest,
+    model_dir: str,
+    version: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    activate: bool = True
+) -> str:
+    """Write a versioned artifact directory and optionally point LATEST at it."""
+    model_dir = resolve_model_dir(model_dir)
+    version = version or datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    version_dir = os.path.join(model_dir, version)
+    if os.path.exists(version_dir):
+        raise ValueError(f"Model version {version} already exists in {model_dir}")
+
+    # Build the version in a temporary directory and rename it into place
+    os.makedirs(model_dir, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(dir=model_dir, prefix=f".{version}-")
+    os.chmod(staging_dir, 0o755)
+    forest.save(os.path.join(staging_dir, FOREST_DIR))
+    with open(os.path.join(staging_dir, METADATA_FILE), "w", encoding="utf-8") as f:
+        json.dump({
+            "version": version,
+            "trained_at": datetime.utcnow().isoformat(),
+            "features": FEATURE_NAMES,
+            "n_trees": forest.n_trees,
+            "depth": forest.depth,
+            **(metadata or {}),
+        }, f, indent=2)
+    os.rename(staging_dir, version_dir)
+
+    if activate:
+        _write_atomic(os.path.join(model_dir, LATEST_POINTER), f"{version}\n".encode())
+    return version_dir
+
+# Global instance
+model_registry = ModelRegistry()
@@ -0,0 +1,288 @@
+"""Periodic retraining of the valuation model from recommendation feedback.
+
+Feedback stored with a ``realized_price`` and ``features``
+(``RecommendationService.submit_feedback``) is a real sale of a domain with the
+model features its advice was based on. The retrainer refits the forest on a
+sliding window of those sales (``AI_RETRAIN_WINDOW_DAYS``, newest
+``AI_RETRAIN_MAX_SAMPLES`` rows), publishes it as a new registry version and
+activates it. Fitting runs in a single low-priority worker process with
+``AI_RETRAIN_N_JOBS`` threads, so serving keeps its CPUs and keeps answering on
+the previous model until the swap.
+
+Run one pass by hand or from cron, from the backend directory:
+
+    python -m app.services.model_retraining
+    python -m app.services.model_retraining --window-days 30 --no-activate
+
+``main.py`` runs it every ``AI_RETRAIN_INTERVAL_SECONDS`` when
+``AI_RETRAIN_ENABLED=true``. Activation moves LATEST, which ``main-real.py``
+(the process serving ``/api/ai/*``) polls and hot-swaps to.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import Histogram
+from app.models.recommendation import RecommendationFeedback
+from app.services.forest_inference import FlatForest
+from app.services.model_registry import FEATURE_NAMES, model_registry, save_artifact
+from app.services.model_training import train_model
+
+logger = logging.getLogger(__name__)
+
+def load_feedback_window(db, window_days: int, max_samples: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Features and realized prices (USD) of the newest sales inside the window."""
+    cutoff = datetime.utcnow() - timedelta(days=window_days)
+    rows = (
+        db.query(RecommendationFeedback.features, RecommendationFeedback.realized_price)
+        .filter(RecommendationFeedback.realized_price.isnot(None))
+        .filter(RecommendationFeedback.features.isnot(None))
+        .filter(RecommendationFeedback.created_at >= cutoff)
+        .order_by(RecommendationFeedback.created_at.desc())
+        .limit(max_samples)
+        .all()
+    )
+    rows = [(features, price) for features, price in rows if features and len(features) == len(FEATURE_NAMES)]
+    if not rows:
+        return np.empty((0, len(FEATURE_NAMES))), np.empty(0)
+
+    X = np.array([features for features, _ in rows], dtype=np.float64)
+    y = np.array([price for _, price in rows], dtype=np.float64) / 100  # cents -> USD
+    return X, y
+
+def _lower_priority():
+    """Retraining-pool initializer: yield the CPU to serving processes."""
+    try:
+        os.nice(settings.AI_RETRAIN_NICE)
+    except (AttributeError, OSError) as e:
+        logger.warning(f"Could not lower retraining priority: {str(e)}")
+
+def fit_and_save(
+    X: np.ndarray,
+    y: np.ndarray,
+    model_dir: str,
+    n_jobs: int,
+    metadata: Dict[str, Any],
+    n_estimators: int = 100,
+    max_depth: int = 10,
+    seed: int = 42
+) -> str:
+    """Retraining-pool entry point: fit on ``X``/``y`` and write an unactivated artifact."""
+    model, scaler = train_model(
+        X, y,
+        n_estimators=n_estimators,
+        max_depth=max_depth,
+        n_jobs=n_jobs,
+        random_state=seed
+    )
+    version_dir = save_artifact(
+        FlatForest.from_sklearn(model, scaler), model_dir,
+        metadata={
+            **metadata,
+            "n_samples": len(y),
+            "params": {"n_estimators": n_estimators, "max_depth": max_depth, "seed": seed},
+        },
+        activate=False
+    )
+    return os.path.basename(version_dir)
+
+class ModelRetrainer:
+    """Refits the valuation model on recent sales and hot-swaps it in.
+
+    A pass is skipped while fewer than ``min_samples`` sales are in the window.
+    New versions go through ``save_artifact`` and ``ModelRegistry.activate``,
+    so LATEST moves with them and in-flight predictions finish on the old model.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: Optional[int] = None,
+        window_days: Optional[int] = None,
+        min_samples: Optional[int] = None,
+        max_samples: Optional[int] = None,
+        n_jobs: Optional[int] = None,
+        registry=None,
+        session_factory=SessionLocal
+    ):
+        self.interval_seconds = interval_seconds or settings.AI_RETRAIN_INTERVAL_SECONDS
+        self.window_days = window_days or settings.AI_RETRAIN_WINDOW_DAYS
+        self.min_samples = min_samples if min_samples is not None else settings.AI_RETRAIN_MIN_SAMPLES
+        self.max_samples = max_samples or settings.AI_RETRAIN_MAX_SAMPLES
+        self.n_jobs = n_jobs or settings.AI_RETRAIN_N_JOBS
+        self.registry = registry or model_registry
+        self.session_factory = session_factory
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.skipped = 0
+        self.failed = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_version: Optional[str] = None
+        self.last_samples = 0
+        self.last_error: Optional[str] = None
+        self.run_time = Histogram(buckets=(1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0))
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=1, initializer=_lower_priority)
+            logger.info(f"Started retraining pool (n_jobs={self.n_jobs})")
+        return self._pool
+
+    def _load_window(self) -> Tuple[np.ndarray, np.ndarray]:
+        db = self.session_factory()
+        try:
+            return load_feedback_window(db, self.window_days, self.max_samples)
+        finally:
+            db.close()
+
+    def _fit_args(self, X: np.ndarray, y: np.ndarray) -> tuple:
+        metadata = {
+            "data_source": "feedback",
+            "window_days": self.window_days,
+            "base_version": self.registry.version,
+        }
+        return X, y, self.registry.model_dir, self.n_jobs, metadata
+
+    def _should_skip(self, n_samples: int) -> bool:
+        self.last_samples = n_samples
+        if n_samples < self.min_samples:
+            logger.info(f"Skipping retraining: {n_samples} sales in window, need {self.min_samples}")
+            self.skipped += 1
+            return True
+        return False
+
+    def _record(self, started: float, version: Optional[str] = None, error: Optional[Exception] = None):
+        self.run_time.observe(time.perf_counter() - started)
+        self.last_run_at = datetime.utcnow()
+        self.runs += 1
+        if error is not None:
+            self.failed += 1
+            self.last_error = str(error)
+            logger.error(f"Error retraining model: {str(error)}")
+        elif version is not None:
+            self.last_version = version
+            self.last_error = None
+            logger.info(f"Retrained model {version} on {self.last_samples} sales")
+
+    def retrain_sync(self, activate: bool = True) -> Optional[str]:
+        """One blocking pass in this process (CLI/cron); returns the new version, if any."""
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A retraining pass is already running")
+        started = time.perf_counter()
+        try:
+            X, y = self._load_window()
+            if self._should_skip(len(y)):
+                return None
+            version = fit_and_save(*self._fit_args(X, y))
+            if activate:
+                self.registry.activate(version)
+        except Exception as e:
+            self._record(started, error=e)
+            raise
+        finally:
+            self._lock.release()
+        self._record(started, version)
+        return version
+
+    async def retrain(self) -> Optional[str]:
+        """One pass off the event loop, fitting in the low-priority worker process."""
+        if not self._lock.acquire(blocking=False):
+            logger.info("Retraining pass already running; skipping")
+            return None
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            X, y = await loop.run_in_executor(None, self._load_window)
+            if self._should_skip(len(y)):
+                return None
+            version = await loop.run_in_executor(self._get_pool(), fit_and_save, *self._fit_args(X, y))
+            await loop.run_in_executor(None, self.registry.activate, version)
+        except Exception as e:
+            self._record(started, error=e)
+            return None
+        finally:
+            self._lock.release()
+        self._record(started, version)
+        return version
+
+    async def _run_forever(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.retrain()
+
+    def start(self):
+        """Schedule a pass every ``interval_seconds`` on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run_forever())
+            logger.info(f"Model retraining every {self.interval_seconds}s on a {self.window_days}-day window")
+
+    async def stop(self):
+        """Cancel the schedule and stop the worker process."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "scheduled": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval_seconds,
+            "window_days": self.window_days,
+            "min_samples": self.min_samples,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_version": self.last_version,
+            "last_samples": self.last_samples,
+            "last_error": self.last_error,
+            "run_time_seconds": self.run_time.stats(),
+        }
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Retrain the valuation model from recommendation feedback.")
+    parser.add_argument("--window-days", type=int, default=settings.AI_RETRAIN_WINDOW_DAYS)
+    parser.add_argument("--min-samples", type=int, default=settings.AI_RETRAIN_MIN_SAMPLES)
+    parser.add_argument("--max-samples", type=int, default=settings.AI_RETRAIN_MAX_SAMPLES)
+    parser.add_argument("--n-jobs", type=int, default=settings.AI_RETRAIN_N_JOBS,
+                        help="training threads (default: %(default)s)")
+    parser.add_argument("--no-activate", action="store_true",
+                        help="write the artifact without pointing LATEST at it")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+
+    retrainer = ModelRetrainer(
+        window_days=args.window_days,
+        min_samples=args.min_samples,
+        max_samples=args.max_samples,
+        n_jobs=args.n_jobs
+    )
+    version = retrainer.retrain_sync(activate=not args.no_activate)
+    return 0 if version or retrainer.skipped else 1
+
+# Global instance
+model_retrainer = ModelRetrainer()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""Offline trainer for the AI recommendation valuation model.
+
+Run from the backend directory:
+
+    python -m app.services.model_training                  # train and publish a new version
+    python -m app.services.model_training --version 2024-06 --n-jobs 4
+    python -m app.services.model_training --no-activate    # write the artifact only
+
+Each run writes ``<AI_MODEL_DIR>/<version>/`` with the flattened forest
+(``forest/*.npy``, scaler folded in) and a ``metadata.json``, then points
+``<AI_MODEL_DIR>/LATEST`` at that version. Running servers switch to it via
+``POST /api/ai/models/{version}/activate``; the API never trains.
+"""
+import argparse
+import logging
+import sys
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.forest_inference import FlatForest
+from app.services.model_registry import save_artifact
+
+logger = logging.getLogger(__name__)
+
+def generate_synthetic_training_data(n_samples: int = 1000, seed: int = 42) -> Tuple[np.ndarray, np.ndarray]:
+    """Synthetic (features, price) pairs; in production, use real historical sales data."""
+    rng = np.random.RandomState(seed)
+
+    # Generate synthetic features
+    lengths = rng.randint(3, 20, n_samples)
+    tld_popularities = rng.uniform(0.1, 1.0, n_samples)
+    keyword_values = rng.uniform(0.1, 1.0, n_samples)
+    market_volumes = rng.uniform(1000, 100000, n_samples)
+    price_trends = rng.uniform(-0.3, 0.5, n_samples)
+    social_sentiments = rng.uniform(-1.0, 1.0, n_samples)
+
+    # Generate synthetic target (domain value)
+    # This is a simplified formula - in production, use real pricing data
+    base_value = 1000
+    target_values = (
+        base_value *
+        (1 + 0.1 * (20 - lengths)) *  # Shorter names are more valuable
+        (1 + 0.5 * tld_popularities) *  # Popular TLDs are more valuable
+        (1 + 0.8 * keyword_values) *  # High keyword value increases price
+        (1 + 0.3 * np.log(market_volumes / 1000)) *  # Market volume impact
+        (1 + 0.2 * price_trends) *  # Price trend impact
+        (1 + 0.1 * social_sentiments)  # Social sentiment impact
+    )
+
+    # Add some noise
+    target_values += rng.normal(0, 0.1 * target_values)
+    target_values = np.maximum(target_values, 100)  # Minimum value
+
+    X = np.column_stack([
+        lengths, tld_popularities, keyword_values,
+        market_volumes, price_trends, social_sentiments
+    ])
+    return X, target_values
+
+def train_model(
+    X: np.ndarray,
+    y: np.ndarray,
+    n_estimators: int = 100,
+    max_depth: int = 10,
+    n_jobs: int = -1,
+    random_state: int = 42
+):
+    """Fit the scaler and the RandomForest valuation model."""
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X)
+    model = RandomForestRegressor(
+        n_estimators=n_estimators,
+        max_depth=max_depth,
+        random_state=random_state,
+        n_jobs=n_jobs
+    )
+    model.fit(X_scaled, y)
+    return model, scaler
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Train the AI recommendation valuation model.")
+    parser.add_argument("--model-dir", default=settings.AI_MODEL_DIR,
+                        help="artifact directory (default: %(default)s)")
+    parser.add_argument("--version", help="artifact version (default: UTC timestamp)")
+    parser.add_argument("--samples", type=int, default=1000, help="synthetic training samples")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--max-depth", type=int, default=10)
+    parser.add_argument("--n-jobs", type=int, default=-1,
+                        help="training processes (default: all cores)")
+    parser.add_argument("--no-activate", action="store_true",
+                        help="write the artifact without pointing LATEST at it")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+
+    X, y = generate_synthetic_training_data(args.samples, args.seed)
+    model, scaler = train_model(
+        X, y,
+        n_estimators=args.n_estimators,
+        max_depth=args.max_depth,
+        n_jobs=args.n_jobs,
+        random_state=args.seed
+    )
+    version_dir = save_artifact(
+        FlatForest.from_sklearn(model, scaler), args.model_dir,
+        version=args.version,
+        metadata={
+            "n_samples": len(y),
+            "data_source": "synthetic",
+            "params": {"n_estimators": args.n_estimators, "max_depth": args.max_depth, "seed": args.seed},
+        },
+        activate=not args.no_activate
+    )
+    logger.info(f"Model written to {version_dir}" + ("" if args.no_activate else " and activated"))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
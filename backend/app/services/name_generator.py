@@ -0,0 +1,299 @@
+import heapq
+import logging
+import string
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.schemas.domain import DomainScore
+from app.services.domain_scoring import DomainScoringService, domain_scoring_service
+from app.services.scoring_config import ScoringConfig
+
+logger = logging.getLogger(__name__)
+
+# Single characters compose every short pattern ("x7", "abc", "888")
+PATTERN_CHARS = string.ascii_lowercase + string.digits
+
+class NameCandidate(NamedTuple):
+    domain: str
+    name: str
+    tld: str
+    score: float
+
+class _Prefix(NamedTuple):
+    """Incremental scoring state of a partially built name."""
+    name: str
+    state: int          # keyword automaton state after ``name``
+    keyword_value: float
+    runs: int           # runs of repeated characters, as in _calculate_rarity
+    in_run: bool
+    digits: int
+    special: bool
+
+class _SearchTables:
+    """Search tables derived from one scoring config snapshot."""
+
+    def __init__(self, config: ScoringConfig):
+        self.config = config
+        self.matcher = config.keyword_matcher
+        self.weights = config.score_weights
+        self.tokens = sorted(config.keyword_values) + list(PATTERN_CHARS)
+        # (automaton state, token) -> (next state, best keyword value), filled lazily
+        self.transitions: Dict[Tuple[int, str], Tuple[int, float]] = {}
+
+        # Best keyword value among keywords of at most a given length, and the
+        # best exact-match value (with bonus) among keywords of exactly that length
+        keyword_values = config.keyword_values
+        longest = max((len(keyword) for keyword in keyword_values), default=0)
+        self.best_keyword_by_length = [0.0] * (longest + 1)
+        self.best_exact_at_length = [0.0] * (longest + 1)
+        for keyword, value in keyword_values.items():
+            self.best_keyword_by_length[len(keyword)] = max(self.best_keyword_by_length[len(keyword)], value)
+            self.best_exact_at_length[len(keyword)] = max(self.best_exact_at_length[len(keyword)], value + 0.1)
+        for length in range(1, longest + 1):
+            self.best_keyword_by_length[length] = max(
+                self.best_keyword_by_length[length], self.best_keyword_by_length[length - 1]
+            )
+
+class NameCandidateGenerator:
+    """Branch-and-bound search for the highest-scoring names over given TLDs.
+
+    Names are built from keyword and single-character tokens while the traits
+    are updated incrementally. Prefixes are expanded best upper bound first (the
+    length, keyword, rarity, TLD and activity traits are all bounded), and a
+    branch is pruned as soon as its bound cannot beat the current top K.
+    """
+
+    def __init__(self, scoring_service: DomainScoringService = domain_scoring_service):
+        self.service = scoring_service
+        self._tables: Optional[_SearchTables] = None
+
+    def _tables_for(self, config: ScoringConfig) -> _SearchTables:
+        """Tables for ``config``, rebuilt when the scoring config is reloaded."""
+        tables = self._tables
+        if tables is None or tables.config.version != config.version:
+            tables = self._tables = _SearchTables(config)
+        return tables
+
+    def search(
+        self,
+        tlds: Sequence[str],
+        max_length: int = 6,
+        k: int = 20,
+        min_length: int = 1,
+        is_available: Optional[Callable[[str], bool]] = None,
+        max_nodes: Optional[int] = None,
+    ) -> List[NameCandidate]:
+        """Return the ``k`` best ``name.tld`` candidates, best first.
+
+        ``is_available`` is consulted only for names that would enter the top K.
+        The search stops after ``max_nodes`` prefixes (settings default).
+        """
+        tables = self._tables_for(self.service.config)
+        tld_terms = self._tld_terms(tlds, tables.config)
+        max_nodes = max_nodes or settings.CANDIDATE_SEARCH_MAX_NODES
+        top: List[Tuple[float, str, str, str]] = []  # min-heap of the best K so far
+        in_top = set()
+        unavailable = set()
+        bounds: Dict[tuple, float] = {}
+        # Keyword tokens can also be spelled character by character; expand each name once
+        visited = set()
+        explored = 0
+        frontier = [(-100.0, 0, "", _Prefix("", 0, 0.0, 0, False, 0, False))]
+
+        while frontier and explored < max_nodes:
+            negative_bound, _, _, prefix = heapq.heappop(frontier)
+            threshold = top[0][0] if len(top) >= k else -1.0
+            # Prefixes are expanded best bound first, so nothing left can beat the top K
+            if -negative_bound <= threshold:
+                frontier = []
+                break
+            explored += 1
+
+            if len(prefix.name) >= min_length:
+                for tld, tld_rarity, crypto in tld_terms:
+                    score = self._score(prefix, tld_rarity, crypto, tables)
+                    if score <= threshold:
+                        continue
+                    domain = f"{prefix.name}.{tld}"
+                    if domain in in_top or domain in unavailable:
+                        continue
+                    if is_available is not None and not is_available(domain):
+                        unavailable.add(domain)
+                        continue
+                    entry = (score, domain, prefix.name, tld)
+                    if len(top) < k:
+                        heapq.heappush(top, entry)
+                    else:
+                        in_top.discard(heapq.heapreplace(top, entry)[1])
+                    in_top.add(domain)
+                    threshold = top[0][0] if len(top) >= k else -1.0
+
+            remaining = max_length - len(prefix.name)
+            for token in tables.tokens:
+                name = prefix.name + token
+                if len(token) > remaining or name in visited:
+                    continue
+                visited.add(name)
+                child = self._extend(prefix, token, tables)
+                bound = self._upper_bound(child, max_length, tld_terms, bounds, tables)
+                if bound > threshold:
+                    # Among equal bounds, go deeper first to complete names sooner
+                    heapq.heappush(frontier, (-bound, -len(name), name, child))
+
+        if frontier:
+            logger.info(f"Candidate search stopped after {explored} prefixes (max_nodes={max_nodes})")
+
+        ranked = sorted(top, key=lambda entry: (-entry[0], entry[1]))
+        return [NameCandidate(domain, name, tld, score) for score, domain, name, tld in ranked]
+
+    def search_scored(self, tlds: Sequence[str], **kwargs) -> List[DomainScore]:
+        """Like ``search``, but return full ``DomainScore`` results."""
+        return [self.service.score_domain(candidate.domain) for candidate in self.search(tlds, **kwargs)]
+
+    def _tld_terms(self, tlds: Sequence[str], config: ScoringConfig) -> List[Tuple[str, float, bool]]:
+        terms = []
+        for tld in tlds:
+            tld = tld.strip().lower().lstrip(".")
+            if tld:
+                terms.append((tld, config.tld_rarity.get(tld, 0.5), tld in config.crypto_tlds))
+        if not terms:
+            raise ValueError("At least one TLD is required")
+        return terms
+
+    def _extend(self, prefix: _Prefix, token: str, tables: _SearchTables) -> _Prefix:
+        """Append ``token`` to ``prefix``, updating every trait incrementally."""
+        transition = tables.transitions.get((prefix.state, token))
+        if transition is None:
+            transition = tables.transitions[(prefix.state, token)] = tables.matcher.advance(prefix.state, token)
+        state, keyword_value = transition
+        keyword_value = max(prefix.keyword_value, keyword_value)
+        runs, in_run, digits, special = prefix.runs, prefix.in_run, prefix.digits, prefix.special
+        last = prefix.name[-1:] or None
+
+        if len(token) == 1:
+            if token == last:
+                if not in_run:
+                    runs += 1
+                    in_run = True
+            else:
+                in_run = False
+            if token.isdigit():
+                digits += 1
+            return _Prefix(prefix.name + token, state, keyword_value, runs, in_run, digits, special)
+
+        for char in token:
+            if char == last:
+                if not in_run:
+                    runs += 1
+                    in_run = True
+            else:
+                in_run = False
+            if char.isdigit():
+                digits += 1
+            elif char in "-_":
+                special = True
+            last = char
+        return _Prefix(prefix.name + token, state, keyword_value, runs, in_run, digits, special)
+
+    def _score(self, prefix: _Prefix, tld_rarity: float, crypto: bool, tables: _SearchTables) -> float:
+        """Exact score of ``prefix`` as a complete name, as ``_calculate_score`` computes it."""
+        length = len(prefix.name)
+        keyword_value = prefix.keyword_value
+        exact = tables.config.keyword_values.get(prefix.name)
+        if exact is not None:
+            keyword_value = max(keyword_value, exact + 0.1)
+
+        rarity = 1.0 - prefix.runs * 0.1
+        if prefix.digits == 1 and length <= 4:
+            rarity += 0.2
+        elif prefix.digits > 2:
+            rarity -= 0.2
+        if prefix.special:
+            rarity -= 0.1
+        rarity = max(0.0, min(1.0, rarity))
+
+        activity = min(1.0, 0.5 + (0.3 if crypto else 0) + (0.2 if length <= 4 else 0)
+                       + (0.2 if keyword_value > 0.5 else 0))
+        return self._combine(tables.weights, max(0, 10 - abs(length - 6)) / 10.0,
+                             keyword_value, rarity, tld_rarity, activity)
+
+    def _upper_bound(
+        self,
+        prefix: _Prefix,
+        max_length: int,
+        tld_terms: List[Tuple[str, float, bool]],
+        bounds: Dict[tuple, float],
+        tables: _SearchTables
+    ) -> float:
+        """Highest score any name starting with ``prefix`` (up to ``max_length``) can reach.
+
+        The bound only depends on a few traits of the prefix, so it is memoized
+        in ``bounds`` (one dict per search) under that key.
+        """
+        length = len(prefix.name)
+        depth = tables.matcher.state_depth(prefix.state)
+        exact = tables.config.keyword_values.get(prefix.name)
+        key = (length, depth, prefix.keyword_value, exact, prefix.runs, prefix.special, min(prefix.digits, 3))
+        bound = bounds.get(key)
+        if bound is None:
+            bound = bounds[key] = self._compute_upper_bound(prefix, depth, exact, max_length, tld_terms, tables)
+        return bound
+
+    def _compute_upper_bound(
+        self,
+        prefix: _Prefix,
+        depth: int,
+        exact: Optional[float],
+        max_length: int,
+        tld_terms: List[Tuple[str, float, bool]],
+        tables: _SearchTables
+    ) -> float:
+        length = len(prefix.name)
+        longest = len(tables.best_keyword_by_length) - 1
+
+        # Repeated runs, hyphens and a third digit never go away once present
+        base_rarity = 1.0 - prefix.runs * 0.1
+        if prefix.special:
+            base_rarity -= 0.1
+
+        best = 0.0
+        for final_length in range(max(length, 1), max_length + 1):
+            # A future keyword can only reuse the suffix that is still a keyword prefix,
+            # and the exact-match bonus needs the whole name to be a keyword prefix
+            extra = final_length - length
+            keyword_value = prefix.keyword_value
+            if extra:
+                keyword_value = max(keyword_value, tables.best_keyword_by_length[min(depth + extra, longest)])
+                if depth == length and final_length <= longest:
+                    keyword_value = max(keyword_value, tables.best_exact_at_length[final_length])
+            elif exact is not None:
+                keyword_value = max(keyword_value, exact + 0.1)
+
+            rarity = base_rarity
+            if prefix.digits <= 1 and final_length <= 4:
+                rarity += 0.2
+            elif prefix.digits > 2:
+                rarity -= 0.2
+            rarity = max(0.0, min(1.0, rarity))
+
+            length_score = max(0, 10 - abs(final_length - 6)) / 10.0
+            for _, tld_rarity, crypto in tld_terms:
+                activity = min(1.0, 0.5 + (0.3 if crypto else 0) + (0.2 if final_length <= 4 else 0)
+                               + (0.2 if keyword_value > 0.5 else 0))
+                best = max(best, self._combine(tables.weights, length_score, keyword_value, rarity,
+                                               tld_rarity, activity))
+        return best
+
+    def _combine(self, weights: Mapping[str, float], length_score: float, keyword_value: float,
+                 rarity: float, tld_rarity: float, activity: float) -> float:
+        score = (
+            weights['length'] * length_score +
+            weights['keyword_value'] * keyword_value +
+            weights['rarity'] * rarity +
+            weights['tld_rarity'] * tld_rarity +
+            weights['on_chain_activity'] * activity
+        )
+        return min(100.0, max(0.0, score * 100))
+
+# Global instance
+name_candidate_generator = NameCandidateGenerator()
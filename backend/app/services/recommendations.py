@@ -4,8 +4,9 @@ import random
 from datetime import datetime, timedelta
 
 from app.models.user import User
-from app.models.recommendation import Recommendation
+from app.models.recommendation import Recommendation, RecommendationFeedback
 from app.services.domain_scoring import domain_scoring_service
+from app.services.feature_store import feature_store
 
 class RecommendationService:
     def get_recommendations(
@@ -126,12 +127,38 @@ class RecommendationService:
         self, 
         db: Session, 
         recommendation_id: int, 
-        feedback: str
-    ) -> bool:
-        """Submit feedback on a recommendation."""
-        # In a real implementation, this would store feedback in database
-        # and use it to improve the recommendation model
-        return True
+        feedback: str,
+        domain: Optional[str] = None,
+        realized_price: Optional[int] = None,
+        user_id: Optional[int] = None
+    ) -> RecommendationFeedback:
+        """Store feedback on a recommendation, and the realized sale price if the domain traded.
+
+        Rows keep the model features of the analysis the advice was based on
+        (the feature store row main-real.py wrote when it analyzed the domain;
+        the apps share it through ``FEATURE_STORE_PATH``). Without
+        one, ``features`` is left empty and the row is not used for training;
+        rows with both features and a ``realized_price`` are the training data
+        for ``app.services.model_retraining``.
+        """
+        recommendation = db.get(Recommendation, recommendation_id)
+        if recommendation is not None and recommendation.domain is not None:
+            domain = recommendation.domain.name
+        if not domain:
+            raise ValueError(f"Recommendation {recommendation_id} has no known domain; the domain is required")
+        
+        stored = feature_store.get(domain)
+        row = RecommendationFeedback(
+            recommendation_id=recommendation.id if recommendation is not None else None,
+            user_id=user_id,
+            domain=domain,
+            feedback=feedback,
+            realized_price=realized_price,
+            features=[float(value) for value in stored.features] if stored is not None else None
+        )
+        db.add(row)
+        db.commit()
+        return row
 
     def get_recommendation_history(
         self, 
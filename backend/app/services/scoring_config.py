@@ -0,0 +1,208 @@
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Tuple
+
+from app.core.config import settings
+from app.services.domain_parser import DomainParser
+from app.services.keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+# Built-in tables, used as-is when no SCORING_CONFIG_PATH is set and as
+# defaults for any key the config file leaves out.
+DEFAULT_SCORING_CONFIG: Dict[str, Any] = {
+    # DomainScoringService
+    "keyword_values": {
+        "crypto": 0.9, "blockchain": 0.85, "nft": 0.8, "defi": 0.8,
+        "tech": 0.7, "ai": 0.8, "web3": 0.85, "metaverse": 0.8,
+        "finance": 0.6, "banking": 0.6, "trading": 0.7,
+        "gaming": 0.6, "play": 0.5, "game": 0.6,
+        "shop": 0.5, "store": 0.5, "buy": 0.5, "sell": 0.5,
+        "app": 0.6, "api": 0.7, "dev": 0.6, "code": 0.6,
+    },
+    "tld_rarity": {
+        "com": 0.3, "net": 0.4, "org": 0.4, "io": 0.7,
+        "eth": 0.9, "crypto": 0.9, "nft": 0.9, "dao": 0.9,
+        "ai": 0.8, "app": 0.7, "dev": 0.7, "tech": 0.6,
+    },
+    "crypto_tlds": ["eth", "crypto", "nft", "dao"],
+    "score_weights": {
+        "length": 0.15,
+        "keyword_value": 0.25,
+        "rarity": 0.20,
+        "tld_rarity": 0.20,
+        "on_chain_activity": 0.20,
+    },
+    # AIRecommendationService
+    "feature_weights": {
+        "length": 0.15,
+        "tld_popularity": 0.20,
+        "keyword_value": 0.25,
+        "market_volume": 0.20,
+        "price_trend": 0.10,
+        "social_sentiment": 0.10,
+    },
+    "tld_popularity": {
+        "eth": 1.0, "crypto": 0.9, "nft": 0.8, "dao": 0.7,
+        "com": 0.6, "org": 0.5, "net": 0.4, "io": 0.3,
+    },
+    # calculate_realistic_domain_score in main-simple.py / main-real-data.py
+    "realistic_tld_scores": {
+        "eth": 95, "crypto": 90, "nft": 85, "dao": 80,
+        "com": 70, "org": 60, "net": 50, "io": 75,
+        "xyz": 40, "app": 65, "dev": 55, "tech": 60,
+        "polygon": 75, "arbitrum": 70, "optimism": 65,
+    },
+    "high_value_keywords": [
+        "crypto", "nft", "defi", "web3", "ai", "meta", "blockchain", "dao", "game", "finance",
+    ],
+}
+
+REQUIRED_SCORE_WEIGHTS = ("length", "keyword_value", "rarity", "tld_rarity", "on_chain_activity")
+REQUIRED_FEATURE_WEIGHTS = (
+    "length", "tld_popularity", "keyword_value", "market_volume", "price_trend", "social_sentiment",
+)
+
+def _frozen_table(data: Mapping[str, Any], name: str) -> Mapping[str, float]:
+    try:
+        return MappingProxyType({str(key).lower(): float(value) for key, value in data.items()})
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError(f"Scoring config '{name}' must map names to numbers")
+
+def _string_list(data: Any, name: str) -> Tuple[str, ...]:
+    if isinstance(data, (str, bytes)) or not isinstance(data, (list, tuple, set, frozenset)):
+        raise ValueError(f"Scoring config '{name}' must be a list of strings")
+    return tuple(str(item).lower() for item in data)
+
+@dataclass(frozen=True)
+class ScoringConfig:
+    """Immutable snapshot of every scoring table, with its compiled matchers.
+
+    A snapshot is never modified after it is built; reloading creates a new
+    one. Callers read ``scoring_config_store.current`` once per operation and
+    use that snapshot throughout, so a reload never mixes tables mid-request.
+    """
+    version: str
+    source: str
+    keyword_values: Mapping[str, float]
+    tld_rarity: Mapping[str, float]
+    crypto_tlds: FrozenSet[str]
+    score_weights: Mapping[str, float]
+    feature_weights: Mapping[str, float]
+    tld_popularity: Mapping[str, float]
+    realistic_tld_scores: Mapping[str, float]
+    high_value_keywords: Tuple[str, ...]
+    loaded_at: datetime = field(default_factory=datetime.utcnow, compare=False)
+    keyword_matcher: KeywordMatcher = field(default=None, compare=False, repr=False)
+    high_value_matcher: KeywordMatcher = field(default=None, compare=False, repr=False)
+    parser: DomainParser = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any], source: str = "defaults") -> "ScoringConfig":
+        """Validate raw config data and compile it into a snapshot."""
+        tables = {
+            name: _frozen_table(data[name], name)
+            for name in ("keyword_values", "tld_rarity", "score_weights",
+                         "feature_weights", "tld_popularity", "realistic_tld_scores")
+        }
+        for name, required in (("score_weights", REQUIRED_SCORE_WEIGHTS),
+                               ("feature_weights", REQUIRED_FEATURE_WEIGHTS)):
+            missing = [key for key in required if key not in tables[name]]
+            if missing:
+                raise ValueError(f"Scoring config '{name}' is missing {', '.join(missing)}")
+
+        crypto_tlds = frozenset(_string_list(data["crypto_tlds"], "crypto_tlds"))
+        high_value_keywords = _string_list(data["high_value_keywords"], "high_value_keywords")
+
+        # Content hash unless the file pins an explicit version
+        canonical = json.dumps(
+            {**{name: dict(table) for name, table in tables.items()},
+             "crypto_tlds": sorted(crypto_tlds), "high_value_keywords": list(high_value_keywords)},
+            sort_keys=True,
+        )
+        version = str(data.get("version") or hashlib.sha256(canonical.encode()).hexdigest()[:12])
+
+        return cls(
+            version=version,
+            source=source,
+            crypto_tlds=crypto_tlds,
+            high_value_keywords=high_value_keywords,
+            keyword_matcher=KeywordMatcher(tables["keyword_values"]),
+            high_value_matcher=KeywordMatcher.from_keywords(high_value_keywords),
+            parser=DomainParser.default(
+                extra_suffixes=tables["tld_rarity"],
+                suffix_list_path=settings.PUBLIC_SUFFIX_LIST_PATH,
+            ),
+            **tables,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary for the config endpoint (tables included, compiled parts left out)."""
+        return {
+            "version": self.version,
+            "source": self.source,
+            "loaded_at": self.loaded_at.isoformat(),
+            "keyword_values": dict(self.keyword_values),
+            "tld_rarity": dict(self.tld_rarity),
+            "crypto_tlds": sorted(self.crypto_tlds),
+            "score_weights": dict(self.score_weights),
+            "feature_weights": dict(self.feature_weights),
+            "tld_popularity": dict(self.tld_popularity),
+            "realistic_tld_scores": dict(self.realistic_tld_scores),
+            "high_value_keywords": list(self.high_value_keywords),
+        }
+
+class ScoringConfigStore:
+    """Holds the current ``ScoringConfig`` and swaps it atomically on reload.
+
+    Reads are a single attribute access and never take the lock; the lock only
+    serializes concurrent reloads. A failed reload keeps the previous snapshot.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            self._current = self._load()
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading scoring config from {path}, using defaults: {str(e)}")
+            self._current = ScoringConfig.from_dict(DEFAULT_SCORING_CONFIG)
+
+    @property
+    def current(self) -> ScoringConfig:
+        return self._current
+
+    def reload(self) -> ScoringConfig:
+        """Rebuild the snapshot from the config source and publish it."""
+        with self._lock:
+            previous = self._current
+            config = self._load()
+            self._current = config
+        if config.version != previous.version:
+            logger.info(f"Scoring config reloaded: {previous.version} -> {config.version}")
+        return config
+
+    def ensure_version(self, version: Optional[str]) -> ScoringConfig:
+        """Reload if this process is behind ``version`` (used by scoring-pool workers)."""
+        config = self._current
+        if version and config.version != version:
+            config = self.reload()
+        return config
+
+    def _load(self) -> ScoringConfig:
+        data = dict(DEFAULT_SCORING_CONFIG)
+        if self.path:
+            with open(self.path, encoding="utf-8") as f:
+                overrides = json.load(f)
+            if not isinstance(overrides, dict):
+                raise ValueError("Scoring config file must contain a JSON object")
+            data.update(overrides)
+        return ScoringConfig.from_dict(data, source=self.path or "defaults")
+
+# Global instance
+scoring_config_store = ScoringConfigStore(settings.SCORING_CONFIG_PATH)
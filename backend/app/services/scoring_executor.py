@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, List, Optional, Sequence, Union
+
+from app.core.config import settings
+from app.services.domain_parser import ParsedDomain
+from app.services.domain_scoring import DomainScoreBatch, domain_scoring_service
+from app.services.scoring_config import scoring_config_store
+from app.services.trait_store import DomainTraitStore
+
+logger = logging.getLogger(__name__)
+
+def score_domain_chunk(
+    domains: Sequence[Union[str, ParsedDomain]],
+    config_version: Optional[str] = None
+) -> DomainScoreBatch:
+    """Scoring-pool entry point: score a chunk with the worker's own service instance.
+
+    Workers reload their scoring config first if the parent has moved on to a
+    newer ``config_version``.
+    """
+    scoring_config_store.ensure_version(config_version)
+    return domain_scoring_service.score_domains(domains)
+
+class ScoringExecutor:
+    """Shards CPU-bound scoring jobs across a process pool.
+
+    Work is split into chunks of ``chunk_size`` items, run on a lazily created
+    ``ProcessPoolExecutor`` and reassembled in input order. Jobs that fit in a
+    single chunk skip the pool and run on a thread instead, so they still stay
+    off the event loop without paying for pickling.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: Optional[int] = None):
+        self.max_workers = max_workers or settings.SCORING_WORKERS
+        self.chunk_size = chunk_size or settings.SCORING_CHUNK_SIZE
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()  # analysis threads share the pool with the event loop
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                logger.info(
+                    f"Started scoring pool (workers={self._pool._max_workers}, chunk_size={self.chunk_size})"
+                )
+            return self._pool
+
+    def _domain_chunk_fn(self) -> Callable[[Sequence[Any]], DomainScoreBatch]:
+        return partial(score_domain_chunk, config_version=scoring_config_store.current.version)
+
+    def _chunks(self, items: Sequence[Any]) -> List[Sequence[Any]]:
+        return [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker processes; the pool is recreated on next use."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    async def map_chunks(self, fn: Callable[[Sequence[Any]], Any], items: Sequence[Any]) -> List[Any]:
+        """Run ``fn`` over each chunk of ``items`` and return the chunk results in order."""
+        loop = asyncio.get_running_loop()
+        if len(items) <= self.chunk_size:
+            return [await loop.run_in_executor(None, fn, items)]
+        
+        pool = self._get_pool()
+        futures = [loop.run_in_executor(pool, fn, chunk) for chunk in self._chunks(items)]
+        return list(await asyncio.gather(*futures))
+
+    def map_chunks_sync(self, fn: Callable[[Sequence[Any]], Any], items: Sequence[Any]) -> List[Any]:
+        """Blocking variant of ``map_chunks`` for scripts and batch jobs."""
+        if len(items) <= self.chunk_size:
+            return [fn(items)]
+        return list(self._get_pool().map(fn, self._chunks(items)))
+
+    async def score_domains(
+        self,
+        domains: Sequence[Union[str, ParsedDomain]],
+        store: Optional[DomainTraitStore] = None
+    ) -> DomainScoreBatch:
+        """Score domains with ``DomainScoringService.score_domains`` off the event loop."""
+        batch = DomainScoreBatch.concatenate(await self.map_chunks(self._domain_chunk_fn(), list(domains)))
+        if store is not None:
+            store.add_batch(batch)
+        return batch
+
+    def score_domains_sync(
+        self,
+        domains: Sequence[Union[str, ParsedDomain]],
+        store: Optional[DomainTraitStore] = None
+    ) -> DomainScoreBatch:
+        """Blocking variant of ``score_domains``."""
+        batch = DomainScoreBatch.concatenate(self.map_chunks_sync(self._domain_chunk_fn(), list(domains)))
+        if store is not None:
+            store.add_batch(batch)
+        return batch
+
+# Global instance
+scoring_executor = ScoringExecutor()
@@ -0,0 +1,176 @@
+import bisect
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from app.schemas.domain import DomainScore, DomainTraits
+
+# One fixed-size record per scored domain; the name itself lives in a shared
+# UTF-8 buffer and the TLD is stored as a code into the interned TLD table.
+TRAIT_DTYPE = np.dtype([
+    ("score", np.float64),
+    ("valuation", np.int64),  # in USD cents
+    ("keyword_value", np.float64),
+    ("rarity", np.float64),
+    ("on_chain_activity", np.float64),
+    ("length", np.uint16),
+    ("tld_code", np.uint16),
+])
+
+MAX_TLD_CODES = np.iinfo(np.uint16).max + 1
+
+class DomainTraitStore:
+    """Columnar in-memory store of scored domains for ranking large sets.
+
+    Each domain costs one ``TRAIT_DTYPE`` record (52 bytes) plus its UTF-8 name,
+    instead of a ``DomainScore`` with nested model and reasoning string. Filled
+    from ``DomainScoreBatch`` results; reasoning text is only generated when a
+    single entry is materialized with ``get``.
+    """
+
+    def __init__(self, reasoner: Callable[[str, float, DomainTraits], str]):
+        self.reasoner = reasoner
+        self._tld_codes: Dict[str, int] = {}
+        self._tlds: List[str] = []
+        self._records = np.empty(0, dtype=TRAIT_DTYPE)
+        # One UTF-8 chunk per added batch, never re-joined; _chunk_starts holds
+        # the byte offset of each chunk's first name
+        self._name_chunks: List[bytes] = []
+        self._chunk_starts: List[int] = []
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._pending: List[tuple] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records) + sum(len(records) for records, _, _ in self._pending)
+
+    @property
+    def tlds(self) -> List[str]:
+        """Interned TLDs; a record's ``tld_code`` indexes into this list."""
+        return list(self._tlds)
+
+    def add_batch(self, batch) -> None:
+        """Append every row of a ``DomainScoreBatch``."""
+        count = len(batch)
+        if count == 0:
+            return
+
+        records = np.empty(count, dtype=TRAIT_DTYPE)
+        records["score"] = batch.scores
+        records["valuation"] = batch.valuations
+        records["keyword_value"] = batch.keyword_values
+        records["rarity"] = batch.rarities
+        records["on_chain_activity"] = batch.on_chain_activity
+        records["length"] = batch.lengths
+
+        encoded = [domain.encode("utf-8") for domain in batch.domains.tolist()]
+        lengths = np.fromiter((len(name) for name in encoded), dtype=np.int64, count=count)
+
+        with self._lock:
+            records["tld_code"] = self._intern_tlds(batch.tlds.tolist())
+            self._pending.append((records, b"".join(encoded), lengths))
+
+    def top_k(self, k: int, tld: Optional[str] = None) -> np.ndarray:
+        """Indices of the ``k`` highest-scoring domains, best first, optionally for one TLD."""
+        records = self._compact()
+        candidates = self.filter_by_tld(tld) if tld is not None else None
+        scores = records["score"] if candidates is None else records["score"][candidates]
+
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        # Order the survivors by score, breaking ties by insertion order
+        top = top[np.lexsort((top, -scores[top]))]
+        return top if candidates is None else candidates[top]
+
+    def filter_by_tld(self, tld: str) -> np.ndarray:
+        """Indices of all domains under ``tld``, in insertion order."""
+        records = self._compact()
+        code = self._tld_codes.get(tld.lower())
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(records["tld_code"] == code)
+
+    def domain(self, index: int) -> str:
+        self._compact()
+        start, end = int(self._offsets[index]), int(self._offsets[index + 1])
+        chunk = bisect.bisect_right(self._chunk_starts, start) - 1
+        base = self._chunk_starts[chunk]
+        return self._name_chunks[chunk][start - base:end - base].decode("utf-8")
+
+    def get(self, index: int) -> DomainScore:
+        """Materialize one entry as a full ``DomainScore``, including reasoning."""
+        record = self._compact()[index]
+        domain = self.domain(index)
+        traits = DomainTraits(
+            length=int(record["length"]),
+            tld=self._tlds[record["tld_code"]],
+            keyword_value=float(record["keyword_value"]),
+            rarity=float(record["rarity"]),
+            on_chain_activity=float(record["on_chain_activity"]),
+        )
+        score = float(record["score"])
+        return DomainScore(
+            domain=domain,
+            score=score,
+            valuation=int(record["valuation"]),
+            traits=traits,
+            reasoning=self.reasoner(domain, score, traits),
+        )
+
+    def iter_rows(self, indices: Optional[Sequence[int]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield rows shaped like ``DomainScoreBatch.iter_rows`` (no reasoning)."""
+        records = self._compact()
+        if indices is None:
+            indices = range(len(records))
+        for index in indices:
+            record = records[index]
+            yield {
+                "domain": self.domain(index),
+                "score": float(record["score"]),
+                "valuation": int(record["valuation"]),
+                "traits": {
+                    "length": int(record["length"]),
+                    "tld": self._tlds[record["tld_code"]],
+                    "keyword_value": float(record["keyword_value"]),
+                    "rarity": float(record["rarity"]),
+                    "on_chain_activity": float(record["on_chain_activity"]),
+                },
+            }
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held by records, names and offsets."""
+        self._compact()
+        return self._records.nbytes + sum(map(len, self._name_chunks)) + self._offsets.nbytes
+
+    def _intern_tlds(self, tlds: List[str]) -> np.ndarray:
+        codes = self._tld_codes
+        result = np.fromiter((codes.setdefault(tld, len(codes)) for tld in tlds), dtype=np.int64, count=len(tlds))
+        if len(codes) > MAX_TLD_CODES:
+            # Forget this batch's new TLDs so the codes still match self._tlds
+            for tld in list(codes)[len(self._tlds):]:
+                del codes[tld]
+            raise ValueError("Too many distinct TLDs for the trait store")
+        self._tlds.extend(list(codes)[len(self._tlds):])
+        return result.astype(np.uint16)
+
+    def _compact(self) -> np.ndarray:
+        """Fold pending batches into the main arrays and return the records."""
+        with self._lock:
+            if self._pending:
+                pending, self._pending = self._pending, []
+                self._records = np.concatenate([self._records] + [records for records, _, _ in pending])
+                lengths = np.concatenate([lengths for _, _, lengths in pending])
+                end = int(self._offsets[-1])
+                self._offsets = np.concatenate([self._offsets, end + np.cumsum(lengths)])
+                for _, names, _ in pending:
+                    self._chunk_starts.append(end)
+                    self._name_chunks.append(names)
+                    end += len(names)
+            return self._records
@@ -0,0 +1,66 @@
+import random
+from typing import Any, Dict, List
+
+# TLD mix roughly matching what the advisor sees: mostly .com and ENS names,
+# a tail of new gTLDs and Web3 TLDs, and some multi-label country suffixes.
+TLD_MIX = {
+    "com": 0.34, "eth": 0.16, "io": 0.06, "ai": 0.05, "net": 0.05, "org": 0.05,
+    "xyz": 0.04, "crypto": 0.04, "app": 0.03, "nft": 0.03, "co.uk": 0.03,
+    "dev": 0.02, "dao": 0.02, "tech": 0.02, "x": 0.02, "com.au": 0.01,
+    "polygon": 0.01, "github.io": 0.01, "zil": 0.01,
+}
+
+WORDS = [
+    "crypto", "blockchain", "nft", "defi", "tech", "ai", "web3", "metaverse",
+    "finance", "banking", "trading", "gaming", "play", "game", "shop", "store",
+    "buy", "sell", "app", "api", "dev", "code", "cloud", "data", "pay", "coin",
+    "token", "chain", "swap", "vault", "labs", "hub", "world", "digital", "smart",
+    "green", "home", "travel", "health", "news", "music", "art", "studio", "market",
+]
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+ALPHANUMERIC = ALPHABET + "0123456789"
+IDN_LABELS = ["münchen", "bücher", "café", "straße", "日本", "例え", "пример"]
+
+def _random_label(rng: random.Random) -> str:
+    """One second-level label, drawn from a mix of naming styles."""
+    style = rng.random()
+    if style < 0.35:
+        # Keyword compounds ("cryptovault", "web3-labs")
+        separator = "-" if rng.random() < 0.15 else ""
+        return separator.join(rng.sample(WORDS, rng.randint(1, 3)))
+    if style < 0.55:
+        # Short premium names ("x7", "abc")
+        return "".join(rng.choices(ALPHANUMERIC, k=rng.randint(1, 4)))
+    if style < 0.65:
+        # Numeric names ("888", "2024")
+        return "".join(rng.choices("0123456789", k=rng.randint(2, 6)))
+    if style < 0.67:
+        return rng.choice(IDN_LABELS) + str(rng.randint(0, 99))
+    # Random brandables of typical length
+    return "".join(rng.choices(ALPHABET, k=rng.randint(5, 15)))
+
+def generate_domains(size: int, seed: int = 42) -> List[str]:
+    """Generate a reproducible corpus of ``size`` domain names."""
+    rng = random.Random(seed)
+    tlds = rng.choices(list(TLD_MIX), weights=list(TLD_MIX.values()), k=size)
+    domains = []
+    for tld in tlds:
+        domain = f"{_random_label(rng)}.{tld}"
+        if rng.random() < 0.03:
+            domain = f"{rng.choice(['www', 'app', 'blog', 'pay'])}.{domain}"
+        domains.append(domain)
+    return domains
+
+def generate_market_data(size: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Generate candidate dicts shaped like the market data the AI service scores."""
+    rng = random.Random(seed + 1)
+    return [
+        {
+            "name": domain,
+            "market_volume": rng.uniform(0, 500000),
+            "price_change_24h": rng.uniform(-0.5, 0.5),
+            "social_sentiment": rng.uniform(-1.0, 1.0),
+        }
+        for domain in generate_domains(size, seed)
+    ]
@@ -0,0 +1,261 @@
+"""Scoring throughput benchmarks.
+
+Run from the backend directory:
+
+    python -m benchmarks.scoring                      # all targets, 1k/100k/1M names
+    python -m benchmarks.scoring --sizes 1000,100000 --targets domain_scoring
+    python -m benchmarks.scoring --update-baseline    # record the current numbers
+
+Every case (target x mode x corpus size) runs in a fresh process so peak RSS
+is measured per case. The run exits with status 1 when a case's names/sec
+falls more than ``--tolerance`` below the stored baseline.
+"""
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from benchmarks.corpus import generate_domains, generate_market_data
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE_PATH = os.path.join(BACKEND_DIR, "benchmarks", "baseline.json")
+DEFAULT_SIZES = [1000, 100000, 1000000]
+
+# Modes each target supports; the main-*.py helpers only score one name per call
+TARGET_MODES = {
+    "domain_scoring": ["single", "batch", "pool"],
+    "ai_scoring": ["single", "batch", "pool"],
+    "realistic_simple": ["single"],
+    "realistic_real_data": ["single"],
+}
+ALL_MODES = ["single", "batch", "pool"]
+
+def _load_script(filename: str, module_name: str):
+    """Import one of the standalone ``main-*.py`` servers as a module."""
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(BACKEND_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def _peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _time_calls(fn: Callable[[Any], Any], calls: Sequence[Any]) -> List[float]:
+    """Call ``fn`` once per argument and return each call's latency in seconds."""
+    latencies = []
+    clock = time.perf_counter
+    for arg in calls:
+        start = clock()
+        fn(arg)
+        latencies.append(clock() - start)
+    return latencies
+
+def _chunked(items: Sequence[Any], chunk_size: int) -> List[Sequence[Any]]:
+    return [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+def _build_case(target: str, mode: str, size: int, seed: int):
+    """Return ``(fn, calls)`` for one case; each element of ``calls`` is one timed call."""
+    from app.core.config import settings
+    from app.services.scoring_executor import scoring_executor
+    chunk_size = settings.SCORING_CHUNK_SIZE
+
+    if target == "domain_scoring":
+        from app.services.domain_scoring import domain_scoring_service
+        domains = generate_domains(size, seed)
+        domain_scoring_service.score_cache.clear()
+        if mode == "single":
+            return domain_scoring_service.score_domain, domains
+        if mode == "batch":
+            return domain_scoring_service.score_domains, _chunked(domains, chunk_size)
+        return scoring_executor.score_domains_sync, [domains]
+
+    if target == "ai_scoring":
+        from app.services.ai_recommendation_service import calculate_domain_score, score_market_data_chunk
+        market_data = generate_market_data(size, seed)
+        if mode == "single":
+            return calculate_domain_score, market_data
+        if mode == "batch":
+            return score_market_data_chunk, _chunked(market_data, chunk_size)
+        return lambda data: scoring_executor.map_chunks_sync(score_market_data_chunk, data), [market_data]
+
+    script = {"realistic_simple": "main-simple.py", "realistic_real_data": "main-real-data.py"}[target]
+    module = _load_script(script, target)
+    return module.calculate_realistic_domain_score, generate_domains(size, seed)
+
+def run_case(target: str, mode: str, size: int, seed: int) -> Dict[str, Any]:
+    """Run one benchmark case in the current process and return its measurements."""
+    fn, calls = _build_case(target, mode, size, seed)
+    latencies = np.array(_time_calls(fn, calls))
+    total = float(latencies.sum())
+
+    from app.services.scoring_executor import scoring_executor
+    scoring_executor.shutdown()
+
+    return {
+        "target": target,
+        "mode": mode,
+        "size": size,
+        "calls": len(latencies),
+        "seconds": total,
+        "names_per_sec": size / total if total > 0 else float("inf"),
+        "p50_ms": float(np.percentile(latencies, 50)) * 1000,
+        "p99_ms": float(np.percentile(latencies, 99)) * 1000,
+        "peak_rss_mb": _peak_rss_mb(),
+        "workers_peak_rss_mb": _peak_rss_mb(resource.RUSAGE_CHILDREN),
+    }
+
+def run_case_isolated(target: str, mode: str, size: int, seed: int) -> Dict[str, Any]:
+    """Run one case in a freshly spawned process so peak RSS covers only that case."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(run_case, target, mode, size, seed).result()
+
+def case_key(result: Dict[str, Any]) -> str:
+    return f"{result['target']}/{result['mode']}/{result['size']}"
+
+def environment_info() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_baseline(path: str, results: List[Dict[str, Any]], previous: Optional[Dict[str, Any]] = None):
+    """Write results as the new baseline, keeping entries for cases not re-run."""
+    cases = dict(previous.get("cases", {})) if previous else {}
+    for result in results:
+        cases[case_key(result)] = {
+            "names_per_sec": round(result["names_per_sec"], 1),
+            "p50_ms": round(result["p50_ms"], 4),
+            "p99_ms": round(result["p99_ms"], 4),
+            "peak_rss_mb": round(result["peak_rss_mb"], 1),
+        }
+    baseline = {"environment": environment_info(), "cases": dict(sorted(cases.items()))}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+def find_regressions(
+    results: List[Dict[str, Any]],
+    baseline: Dict[str, Any],
+    tolerance: float
+) -> List[str]:
+    """Describe every case whose throughput fell below baseline * (1 - tolerance)."""
+    regressions = []
+    cases = baseline.get("cases", {})
+    for result in results:
+        expected = cases.get(case_key(result))
+        if not expected:
+            continue
+        floor = expected["names_per_sec"] * (1 - tolerance)
+        if result["names_per_sec"] < floor:
+            regressions.append(
+                f"{case_key(result)}: {result['names_per_sec']:,.0f} names/sec "
+                f"< {floor:,.0f} (baseline {expected['names_per_sec']:,.0f}, tolerance {tolerance:.0%})"
+            )
+    return regressions
+
+def format_report(results: List[Dict[str, Any]], baseline: Optional[Dict[str, Any]] = None) -> str:
+    cases = baseline.get("cases", {}) if baseline else {}
+    header = (
+        f"{'case':<36} {'names/sec':>12} {'vs base':>8} {'p50 ms':>10} {'p99 ms':>10} "
+        f"{'peak RSS MB':>12} {'workers MB':>11}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        expected = cases.get(case_key(result))
+        change = f"{result['names_per_sec'] / expected['names_per_sec'] - 1:+.0%}" if expected else "-"
+        lines.append(
+            f"{case_key(result):<36} {result['names_per_sec']:>12,.0f} {change:>8} "
+            f"{result['p50_ms']:>10.4f} {result['p99_ms']:>10.4f} "
+            f"{result['peak_rss_mb']:>12.1f} {result['workers_peak_rss_mb']:>11.1f}"
+        )
+    return "\n".join(lines)
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark domain scoring throughput.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated corpus sizes (default: %(default)s)")
+    parser.add_argument("--targets", default=",".join(TARGET_MODES),
+                        help="comma-separated targets (default: %(default)s)")
+    parser.add_argument("--modes", default=",".join(ALL_MODES),
+                        help="comma-separated modes (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=42, help="corpus seed")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store this run as the baseline instead of checking against it")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed throughput drop before failing, as a fraction (default: %(default)s)")
+    parser.add_argument("--output", help="also write the raw results to this JSON file")
+    parser.add_argument("--no-isolate", action="store_true",
+                        help="run cases in this process (faster, but peak RSS accumulates)")
+    args = parser.parse_args(argv)
+
+    args.sizes = [int(size) for size in args.sizes.split(",") if size]
+    args.targets = [target for target in args.targets.split(",") if target]
+    args.modes = [mode for mode in args.modes.split(",") if mode]
+    unknown = [target for target in args.targets if target not in TARGET_MODES]
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(unknown)}")
+    return args
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    run = run_case if args.no_isolate else run_case_isolated
+
+    results = []
+    for size in args.sizes:
+        for target in args.targets:
+            for mode in TARGET_MODES[target]:
+                if mode not in args.modes:
+                    continue
+                print(f"running {target}/{mode}/{size} ...", file=sys.stderr, flush=True)
+                results.append(run(target, mode, size, args.seed))
+
+    baseline = load_baseline(args.baseline)
+    print(format_report(results, baseline))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment_info(), "results": results}, f, indent=2)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results, baseline)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one.")
+        return 0
+    if baseline.get("environment", {}).get("cpu_count") != os.cpu_count():
+        print("\nWarning: baseline was recorded on a machine with a different CPU count.")
+
+    regressions = find_regressions(results, baseline, args.tolerance)
+    if regressions:
+        print("\nThroughput regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+
+    print("\nNo throughput regressions.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 import uvicorn
 from dotenv import load_dotenv
 import os
 import asyncio
-import httpx
 from typing import List, Dict, Any
 from pydantic import BaseModel
 import logging
@@ -12,6 +12,12 @@ import hashlib
 import time
 from datetime import datetime, timedelta
 
+from app.core.config import settings
+from app.core.events import market_data_bus
+from app.core.http import http_clients
+from app.services.market_data_refresher import market_data_refresher
+from app.services.scoring_config import scoring_config_store
+
 # Load environment variables
 load_dotenv()
 
@@ -19,9 +25,7 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Cache for real data
-crypto_prices_cache = {}
-cache_timestamp = 0
+# Real data is refreshed in the background and read from the market data bus
 CACHE_DURATION = 300  # 5 minutes
 
 # Real data sources
@@ -30,89 +34,90 @@ ENS_API_URL = "https://api.ens.domains"
 UNSTOPPABLE_API_URL = "https://api.unstoppabledomains.com"
 
 async def get_real_crypto_prices():
+    """Get the latest crypto prices, fetching them only on a cold start."""
+    snapshot = market_data_bus.latest("crypto_prices", max_age=CACHE_DURATION)
+    if snapshot is None:
+        snapshot = await market_data_refresher.refresh("crypto_prices")
+    return snapshot.data if snapshot else {}
+
+async def fetch_crypto_prices():
     """Get real cryptocurrency prices from CoinGecko API."""
-    global crypto_prices_cache, cache_timestamp
-    current_time = asyncio.get_event_loop().time()
-    
-    # Return cached data if still valid
-    if current_time - cache_timestamp < CACHE_DURATION and crypto_prices_cache:
-        return crypto_prices_cache
-    
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{COINGECKO_API_URL}/simple/price",
-                params={
-                    "ids": "ethereum,matic-network,optimism,arbitrum,usd-coin,tether,bitcoin",
-                    "vs_currencies": "usd",
-                    "include_24hr_change": "true",
-                    "include_market_cap": "true"
+        response = await http_clients.get(
+            f"{COINGECKO_API_URL}/simple/price",
+            params={
+                "ids": "ethereum,matic-network,optimism,arbitrum,usd-coin,tether,bitcoin",
+                "vs_currencies": "usd",
+                "include_24hr_change": "true",
+                "include_market_cap": "true"
+            }
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            prices = {
+                "ETH": {
+                    "price": data.get("ethereum", {}).get("usd", 0),
+                    "change": data.get("ethereum", {}).get("usd_24h_change", 0),
+                    "market_cap": data.get("ethereum", {}).get("usd_market_cap", 0)
+                },
+                "MATIC": {
+                    "price": data.get("matic-network", {}).get("usd", 0),
+                    "change": data.get("matic-network", {}).get("usd_24h_change", 0),
+                    "market_cap": data.get("matic-network", {}).get("usd_market_cap", 0)
+                },
+                "OP": {
+                    "price": data.get("optimism", {}).get("usd", 0),
+                    "change": data.get("optimism", {}).get("usd_24h_change", 0),
+                    "market_cap": data.get("optimism", {}).get("usd_market_cap", 0)
+                },
+                "ARB": {
+                    "price": data.get("arbitrum", {}).get("usd", 0),
+                    "change": data.get("arbitrum", {}).get("usd_24h_change", 0),
+                    "market_cap": data.get("arbitrum", {}).get("usd_market_cap", 0)
+                },
+                "BTC": {
+                    "price": data.get("bitcoin", {}).get("usd", 0),
+                    "change": data.get("bitcoin", {}).get("usd_24h_change", 0),
+                    "market_cap": data.get("bitcoin", {}).get("usd_market_cap", 0)
                 },
-                timeout=10.0
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                crypto_prices_cache = {
-                    "ETH": {
-                        "price": data.get("ethereum", {}).get("usd", 0),
-                        "change": data.get("ethereum", {}).get("usd_24h_change", 0),
-                        "market_cap": data.get("ethereum", {}).get("usd_market_cap", 0)
-                    },
-                    "MATIC": {
-                        "price": data.get("matic-network", {}).get("usd", 0),
-                        "change": data.get("matic-network", {}).get("usd_24h_change", 0),
-                        "market_cap": data.get("matic-network", {}).get("usd_market_cap", 0)
-                    },
-                    "OP": {
-                        "price": data.get("optimism", {}).get("usd", 0),
-                        "change": data.get("optimism", {}).get("usd_24h_change", 0),
-                        "market_cap": data.get("optimism", {}).get("usd_market_cap", 0)
-                    },
-                    "ARB": {
-                        "price": data.get("arbitrum", {}).get("usd", 0),
-                        "change": data.get("arbitrum", {}).get("usd_24h_change", 0),
-                        "market_cap": data.get("arbitrum", {}).get("usd_market_cap", 0)
-                    },
-                    "BTC": {
-                        "price": data.get("bitcoin", {}).get("usd", 0),
-                        "change": data.get("bitcoin", {}).get("usd_24h_change", 0),
-                        "market_cap": data.get("bitcoin", {}).get("usd_market_cap", 0)
-                    },
-                    "USDC": {
-                        "price": data.get("usd-coin", {}).get("usd", 0),
-                        "change": data.get("usd-coin", {}).get("usd_24h_change", 0),
-                        "market_cap": data.get("usd-coin", {}).get("usd_market_cap", 0)
-                    },
-                    "USDT": {
-                        "price": data.get("tether", {}).get("usd", 0),
-                        "change": data.get("tether", {}).get("usd_24h_change", 0),
-                        "market_cap": data.get("tether", {}).get("usd_market_cap", 0)
-                    }
+                "USDC": {
+                    "price": data.get("usd-coin", {}).get("usd", 0),
+                    "change": data.get("usd-coin", {}).get("usd_24h_change", 0),
+                    "market_cap": data.get("usd-coin", {}).get("usd_market_cap", 0)
+                },
+                "USDT": {
+                    "price": data.get("tether", {}).get("usd", 0),
+                    "change": data.get("tether", {}).get("usd_24h_change", 0),
+                    "market_cap": data.get("tether", {}).get("usd_market_cap", 0)
                 }
-                cache_timestamp = current_time
-                logger.info("Updated crypto prices cache from CoinGecko")
-                return crypto_prices_cache
-            else:
-                logger.error(f"CoinGecko API error: {response.status_code}")
-                return {}
+            }
+            logger.info("Fetched crypto prices from CoinGecko")
+            return prices
+        else:
+            logger.error(f"CoinGecko API error: {response.status_code}")
+            return {}
                 
     except Exception as e:
         logger.error(f"Error fetching crypto prices: {str(e)}")
         return {}
 
+market_data_refresher.add_job("crypto_prices", fetch_crypto_prices, settings.MARKET_REFRESH_PRICES_SECONDS)
+
+# Upstreams whose HTTP clients the lifespan opens before serving
+UPSTREAM_URLS = [COINGECKO_API_URL, "https://api.ens.domains"]
+
 async def get_real_domain_data(domain: str):
     """Get real domain data from various sources."""
     try:
         # Try to get ENS data
-        async with httpx.AsyncClient() as client:
-            # This is a simplified approach - in production you'd use proper ENS APIs
-            response = await client.get(
-                f"https://api.ens.domains/v1/domains/{domain}",
-                timeout=5.0
-            )
-            if response.status_code == 200:
-                return response.json()
+        # This is a simplified approach - in production you'd use proper ENS APIs
+        response = await http_clients.get(
+            f"https://api.ens.domains/v1/domains/{domain}",
+            timeout=5.0
+        )
+        if response.status_code == 200:
+            return response.json()
     except Exception as e:
         logger.debug(f"Could not fetch ENS data for {domain}: {str(e)}")
     
@@ -127,17 +132,11 @@ def calculate_realistic_domain_score(domain: str) -> Dict[str, Any]:
     length_score = max(0, 100 - (len(name) - 3) * 5)  # 3 chars = 100, 20+ chars = 0
     
     # TLD popularity (realistic values based on actual usage)
-    tld_scores = {
-        'eth': 95, 'crypto': 90, 'nft': 85, 'dao': 80,
-        'com': 70, 'org': 60, 'net': 50, 'io': 75,
-        'xyz': 40, 'app': 65, 'dev': 55, 'tech': 60,
-        'polygon': 75, 'arbitrum': 70, 'optimism': 65
-    }
-    tld_score = tld_scores.get(tld.lower(), 30)
+    config = scoring_config_store.current
+    tld_score = config.realistic_tld_scores.get(tld.lower(), 30)
     
     # Keyword value (based on actual market trends)
-    high_value_keywords = ['crypto', 'nft', 'defi', 'web3', 'ai', 'meta', 'blockchain', 'dao', 'game', 'finance']
-    keyword_score = 80 if any(keyword in name.lower() for keyword in high_value_keywords) else 50
+    keyword_score = 80 if config.high_value_matcher.contains_any(name) else 50
     
     # Rarity (shorter names are rarer)
     rarity_score = max(20, 100 - len(name) * 3)
@@ -180,6 +179,16 @@ def calculate_realistic_domain_score(domain: str) -> Dict[str, Any]:
         }
     }
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Refresh market data in the background and keep pooled upstream HTTP connections."""
+    http_clients.open(UPSTREAM_URLS)
+    if settings.MARKET_REFRESH_ENABLED:
+        market_data_refresher.start()
+    yield
+    await market_data_refresher.stop()
+    await http_clients.aclose()
+
 # Create FastAPI app
 app = FastAPI(
     title="Doma Advisor API - Real Data",
@@ -187,6 +196,7 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -592,6 +602,16 @@ async def get_market_summary():
         "data_sources": ["CoinGecko API", "Market Analysis"]
     }
 
+@app.get("/api/http/stats")
+async def get_http_stats():
+    """Get per-host request counters and connection pool utilization."""
+    return http_clients.stats()
+
+@app.get("/api/market/refresh")
+async def get_market_refresh_stats():
+    """Get background market data refresh jobs and the snapshots they published."""
+    return market_data_refresher.stats()
+
 if __name__ == "__main__":
     uvicorn.run(
         "main-real-data:app",
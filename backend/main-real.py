@@ -1,18 +1,35 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
+from fastapi.responses import PlainTextResponse, StreamingResponse
 import uvicorn
 from dotenv import load_dotenv
 import os
 import asyncio
+import json
+import time
+from functools import partial
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 import logging
 
+from app.api.routes.auth import get_current_admin
+from app.core.config import settings
+from app.core.events import market_data_bus
+from app.core.http import http_clients
+from app.core.metrics import spans
+from app.core.profiling import PROFILE_HEADER, SamplingProfiler, load_profile, profile_requested, save_profile
+
 # Import our real data services
 from app.services.blockchain_service import BlockchainService
 from app.services.market_data_service import MarketDataService
 from app.services.ai_recommendation_service import AIRecommendationService
+from app.services.analysis_executor import analysis_executor
+from app.services.feature_store import feature_store
+from app.services.model_registry import model_registry
+from app.services.scoring_executor import scoring_executor
 from app.services.doma_integration import DomaIntegrationService
+from app.services.market_data_refresher import market_data_refresher
 
 # Load environment variables
 load_dotenv()
@@ -21,6 +38,23 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Refresh market data and follow retrained models in the background; keep pooled upstream HTTP connections."""
+    http_clients.open(UPSTREAM_URLS)
+    if settings.MARKET_REFRESH_ENABLED:
+        feature_store.start_following(market_data_bus, FEATURE_TOPICS)
+        market_data_refresher.start()
+    if settings.AI_MODEL_POLL_SECONDS > 0 and not settings.AI_MODEL_VERSION:
+        model_registry.start_watching(settings.AI_MODEL_POLL_SECONDS)
+    yield
+    await model_registry.stop_watching()
+    await market_data_refresher.stop()
+    await feature_store.stop_following()
+    await http_clients.aclose()
+    analysis_executor.shutdown()
+    scoring_executor.shutdown()
+
 # Create FastAPI app
 app = FastAPI(
     title="Doma Advisor API - Real Data",
@@ -28,6 +62,7 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -39,12 +74,70 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def instrument_requests(request: Request, call_next):
+    """Time each request per route and profile it when asked to via X-Profile."""
+    profiler = SamplingProfiler() if profile_requested(request.headers.get(PROFILE_HEADER)) else None
+    if profiler is not None:
+        profiler.start()
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        elapsed = time.perf_counter() - start
+        if profiler is not None:
+            profiler.stop()
+    
+    route = request.scope.get("route")
+    spans.observe(f"http {request.method} {route.path if route else 'unmatched'}", elapsed)
+    if profiler is not None:
+        response.headers["X-Profile-File"] = save_profile(profiler, f"{request.method} {request.url.path}")
+        response.headers["X-Profile-Samples"] = str(profiler.samples)
+    return response
+
 # Initialize services
 blockchain_service = BlockchainService()
 market_data_service = MarketDataService()
 ai_service = AIRecommendationService()
 doma_service = DomaIntegrationService()
 
+# Upstreams whose HTTP clients the lifespan opens before serving
+UPSTREAM_URLS = [
+    market_data_service.coingecko_base,
+    market_data_service.opensea_base,
+    "https://api.unstoppabledomains.com",
+]
+
+# Background refresh: published snapshots serve the default symbols and limits;
+# other symbol sets and limits are fetched through MarketDataService's cache
+DEFAULT_PRICE_SYMBOLS = ["ETH", "MATIC", "OP", "ARB"]
+ENS_MARKET_LIMIT = 20
+DOMA_TRENDING_LIMIT = 20
+MARKET_TRENDS_LIMIT = 20
+# Topics whose snapshots are domain candidate lists; the feature store
+# precomputes their model features as they are published
+FEATURE_TOPICS = ["market_trends", "doma_trending"]
+market_data_refresher.add_job(
+    "crypto_prices",
+    partial(market_data_service.get_crypto_prices, DEFAULT_PRICE_SYMBOLS, fresh=True),
+    settings.MARKET_REFRESH_PRICES_SECONDS
+)
+market_data_refresher.add_job(
+    "ens_market",
+    partial(market_data_service.get_ens_market_data, ENS_MARKET_LIMIT, fresh=True),
+    settings.MARKET_REFRESH_ENS_SECONDS
+)
+market_data_refresher.add_job(
+    "doma_trending",
+    partial(doma_service.get_trending_domains, DOMA_TRENDING_LIMIT),
+    settings.MARKET_REFRESH_DOMA_SECONDS
+)
+market_data_refresher.add_job(
+    "market_trends",
+    partial(market_data_service.get_market_trends, limit=MARKET_TRENDS_LIMIT),
+    settings.MARKET_REFRESH_TRENDS_SECONDS
+)
+
 # Pydantic models
 class DomainScore(BaseModel):
     domain: str
@@ -96,6 +189,10 @@ class UserProfile(BaseModel):
     budget: float
     preferences: Dict[str, Any]
 
+class ShadowModelRequest(BaseModel):
+    version: str
+    sample_rate: float = 0.1
+
 @app.get("/")
 async def root():
     return {
@@ -131,10 +228,11 @@ async def get_domain_score(domain: str):
         # Get domain info from blockchain
         domain_info = None
         
-        if domain.endswith('.eth'):
-            domain_info = await blockchain_service.get_ens_domain_info(domain)
-        elif any(domain.endswith(suffix) for suffix in ['.crypto', '.nft', '.dao']):
-            domain_info = await blockchain_service.get_unstoppable_domain_info(domain)
+        with spans.span("chain_lookup"):
+            if domain.endswith('.eth'):
+                domain_info = await blockchain_service.get_ens_domain_info(domain)
+            elif any(domain.endswith(suffix) for suffix in ['.crypto', '.nft', '.dao']):
+                domain_info = await blockchain_service.get_unstoppable_domain_info(domain)
         
         if not domain_info:
             # Fallback to basic domain data
@@ -146,7 +244,8 @@ async def get_domain_score(domain: str):
             }
         
         # Get market data
-        market_data = await market_data_service.get_domain_market_data(domain)
+        with spans.span("market_lookup"):
+            market_data = await market_data_service.get_domain_market_data(domain)
         
         # Combine blockchain and market data
         combined_data = {**domain_info, **market_data}
@@ -231,7 +330,14 @@ async def get_recommendations(
         }
         
         # Get trending domains as candidate pool
-        market_data = await market_data_service.get_market_trends(limit=limit*2)
+        with spans.span("market_lookup"):
+            snapshot = None
+            if limit * 2 <= MARKET_TRENDS_LIMIT:
+                snapshot = await market_data_refresher.latest("market_trends")
+            if snapshot is not None:
+                market_data = snapshot.data[:limit * 2]
+            else:
+                market_data = await market_data_service.get_market_trends(limit=limit*2)
         
         # Get AI recommendations
         recommendations = await ai_service.get_investment_recommendations(
@@ -400,6 +506,11 @@ async def get_unstoppable_domain(domain: str):
 async def get_ens_market_data(limit: int = 20):
     """Get real ENS market data from OpenSea."""
     try:
+        if limit <= ENS_MARKET_LIMIT:
+            snapshot = await market_data_refresher.latest("ens_market")
+            if snapshot is not None:
+                return {**snapshot.data, "recent_sales": snapshot.data["recent_sales"][:limit]}
+        
         market_data = await market_data_service.get_ens_market_data(limit)
         return market_data
         
@@ -411,7 +522,12 @@ async def get_ens_market_data(limit: int = 20):
 async def get_crypto_prices(symbols: str = "ETH,MATIC,OP,ARB"):
     """Get real-time cryptocurrency prices."""
     try:
-        symbol_list = [s.strip() for s in symbols.split(",")]
+        symbol_list = [s.strip().upper() for s in symbols.split(",")]
+        if set(symbol_list) <= set(DEFAULT_PRICE_SYMBOLS):
+            snapshot = await market_data_refresher.latest("crypto_prices")
+            if snapshot is not None:
+                return {symbol: snapshot.data[symbol] for symbol in symbol_list if symbol in snapshot.data}
+        
         prices = await market_data_service.get_crypto_prices(symbol_list)
         return prices
         
@@ -425,16 +541,18 @@ async def analyze_domain_ai(domain: str):
     try:
         # Get domain data
         domain_info = None
-        if domain.endswith('.eth'):
-            domain_info = await blockchain_service.get_ens_domain_info(domain)
-        elif any(domain.endswith(suffix) for suffix in ['.crypto', '.nft', '.dao']):
-            domain_info = await blockchain_service.get_unstoppable_domain_info(domain)
+        with spans.span("chain_lookup"):
+            if domain.endswith('.eth'):
+                domain_info = await blockchain_service.get_ens_domain_info(domain)
+            elif any(domain.endswith(suffix) for suffix in ['.crypto', '.nft', '.dao']):
+                domain_info = await blockchain_service.get_unstoppable_domain_info(domain)
         
         if not domain_info:
             domain_info = {"name": domain}
         
         # Get market data
-        market_data = await market_data_service.get_domain_market_data(domain)
+        with spans.span("market_lookup"):
+            market_data = await market_data_service.get_domain_market_data(domain)
         
         # Combine data
         combined_data = {**domain_info, **market_data}
@@ -451,6 +569,110 @@ async def analyze_domain_ai(domain: str):
         logger.error(f"Error analyzing domain {domain}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/ai/stats")
+async def get_ai_stats():
+    """Get the loaded model version and analysis pool queue depth and latencies."""
+    return {
+        "model_version": ai_service.model_version,
+        "executor": analysis_executor.stats(),
+        "models": model_registry.stats(),
+        "analysis_cache": ai_service.analysis_cache.stats(),
+        "feature_store": feature_store.stats(),
+        "spans": spans.stats(),
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Per-stage latency histograms in the Prometheus text format (METRICS_ENABLED)."""
+    if not spans.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return spans.render_prometheus()
+
+@app.get("/debug/profiles/{name}", response_class=PlainTextResponse)
+async def get_profile(name: str):
+    """Download a request profile as folded stacks (flamegraph.pl, speedscope)."""
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    try:
+        return load_profile(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OSError:
+        raise HTTPException(status_code=404, detail=f"Profile {name} not found")
+
+@app.get("/api/ai/models")
+async def list_ai_models():
+    """List the model versions in the registry."""
+    return {
+        "live_version": model_registry.version,
+        "versions": model_registry.list_versions(),
+    }
+
+@app.post("/api/ai/models/{version}/activate")
+async def activate_ai_model(version: str, admin=Depends(get_current_admin)):
+    """Swap the live model to ``version`` without a restart (admins only)."""
+    try:
+        model = model_registry.activate(version)
+        return {"live_version": model.version, "metadata": model.metadata}
+    except (ValueError, OSError) as e:
+        raise HTTPException(status_code=400, detail=f"Cannot activate model {version}: {str(e)}")
+
+@app.post("/api/ai/models/shadow")
+async def set_shadow_model(request: ShadowModelRequest, admin=Depends(get_current_admin)):
+    """Run a candidate model in shadow on a sample of predictions (admins only)."""
+    try:
+        model_registry.set_shadow(request.version, request.sample_rate)
+        return model_registry.stats()["shadow"]
+    except (ValueError, OSError) as e:
+        raise HTTPException(status_code=400, detail=f"Cannot shadow model {request.version}: {str(e)}")
+
+@app.delete("/api/ai/models/shadow")
+async def clear_shadow_model(admin=Depends(get_current_admin)):
+    """Stop shadow evaluation and return the final comparison (admins only)."""
+    return {"shadow": model_registry.clear_shadow()}
+
+@app.get("/api/http/stats")
+async def get_http_stats():
+    """Get per-host request counters and connection pool utilization."""
+    return http_clients.stats()
+
+@app.get("/api/market/refresh")
+async def get_market_refresh_stats():
+    """Get background market data refresh jobs and the snapshots they published."""
+    return market_data_refresher.stats()
+
+@app.get("/api/market/stream")
+async def stream_market_data(request: Request, topic: Optional[str] = None):
+    """Push market data snapshots to the client as server-sent events."""
+    queue = market_data_bus.subscribe(topic)
+    
+    def event(snapshot) -> str:
+        payload = {"version": snapshot.version, "published_at": snapshot.published_at.isoformat(), "data": snapshot.data}
+        return f"event: {snapshot.topic}\ndata: {json.dumps(payload, default=str)}\n\n"
+    
+    async def events():
+        try:
+            # Current state first, then every new snapshot as it is published
+            topics = [topic] if topic else list(market_data_refresher.jobs)
+            for name in topics:
+                snapshot = market_data_bus.latest(name)
+                if snapshot is not None:
+                    yield event(snapshot)
+            while not await request.is_disconnected():
+                try:
+                    yield event(await asyncio.wait_for(queue.get(), 15))
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            market_data_bus.unsubscribe(queue)
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@app.get("/api/market/cache")
+async def get_market_cache_stats():
+    """Get upstream market data cache hit, stale-hit and coalescing counters."""
+    return market_data_service.cache.stats()
+
 if __name__ == "__main__":
     uvicorn.run(
         "main-real:app",
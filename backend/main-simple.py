@@ -1,16 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 import uvicorn
 from dotenv import load_dotenv
 import os
 import random
 import asyncio
-import httpx
 from typing import List, Dict, Any
 from pydantic import BaseModel
 import logging
 from datetime import datetime
 
+from app.core.config import settings
+from app.core.events import market_data_bus
+from app.core.http import http_clients
+from app.services.market_data_refresher import market_data_refresher
+from app.services.scoring_config import scoring_config_store
+
 # Load environment variables
 load_dotenv()
 
@@ -18,53 +24,61 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Cache for real data
-crypto_prices_cache = {}
-cache_timestamp = 0
+# Real data is refreshed in the background and read from the market data bus
 CACHE_DURATION = 300  # 5 minutes
+DOMA_TRENDING_LIMIT = 20
 
 async def get_real_crypto_prices():
+    """Get the latest crypto prices, fetching them only on a cold start."""
+    snapshot = market_data_bus.latest("crypto_prices", max_age=CACHE_DURATION)
+    if snapshot is None:
+        snapshot = await market_data_refresher.refresh("crypto_prices")
+    return snapshot.data if snapshot else {}
+
+async def fetch_crypto_prices():
     """Get real cryptocurrency prices from CoinGecko API."""
-    global crypto_prices_cache, cache_timestamp
-    current_time = asyncio.get_event_loop().time()
-    
-    # Return cached data if still valid
-    if current_time - cache_timestamp < CACHE_DURATION and crypto_prices_cache:
-        return crypto_prices_cache
-    
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://api.coingecko.com/api/v3/simple/price",
-                params={
-                    "ids": "ethereum,matic-network,optimism,arbitrum,usd-coin,tether",
-                    "vs_currencies": "usd",
-                    "include_24hr_change": "true"
-                },
-                timeout=10.0
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                crypto_prices_cache = {
-                    "ETH": {"price": data.get("ethereum", {}).get("usd", 0), "change": data.get("ethereum", {}).get("usd_24h_change", 0)},
-                    "MATIC": {"price": data.get("matic-network", {}).get("usd", 0), "change": data.get("matic-network", {}).get("usd_24h_change", 0)},
-                    "OP": {"price": data.get("optimism", {}).get("usd", 0), "change": data.get("optimism", {}).get("usd_24h_change", 0)},
-                    "ARB": {"price": data.get("arbitrum", {}).get("usd", 0), "change": data.get("arbitrum", {}).get("usd_24h_change", 0)},
-                    "USDC": {"price": data.get("usd-coin", {}).get("usd", 0), "change": data.get("usd-coin", {}).get("usd_24h_change", 0)},
-                    "USDT": {"price": data.get("tether", {}).get("usd", 0), "change": data.get("tether", {}).get("usd_24h_change", 0)}
-                }
-                cache_timestamp = current_time
-                logger.info("Updated crypto prices cache")
-                return crypto_prices_cache
-            else:
-                logger.error(f"CoinGecko API error: {response.status_code}")
-                return {}
+        response = await http_clients.get(
+            "https://api.coingecko.com/api/v3/simple/price",
+            params={
+                "ids": "ethereum,matic-network,optimism,arbitrum,usd-coin,tether",
+                "vs_currencies": "usd",
+                "include_24hr_change": "true"
+            }
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            prices = {
+                "ETH": {"price": data.get("ethereum", {}).get("usd", 0), "change": data.get("ethereum", {}).get("usd_24h_change", 0)},
+                "MATIC": {"price": data.get("matic-network", {}).get("usd", 0), "change": data.get("matic-network", {}).get("usd_24h_change", 0)},
+                "OP": {"price": data.get("optimism", {}).get("usd", 0), "change": data.get("optimism", {}).get("usd_24h_change", 0)},
+                "ARB": {"price": data.get("arbitrum", {}).get("usd", 0), "change": data.get("arbitrum", {}).get("usd_24h_change", 0)},
+                "USDC": {"price": data.get("usd-coin", {}).get("usd", 0), "change": data.get("usd-coin", {}).get("usd_24h_change", 0)},
+                "USDT": {"price": data.get("tether", {}).get("usd", 0), "change": data.get("tether", {}).get("usd_24h_change", 0)}
+            }
+            logger.info("Fetched crypto prices")
+            return prices
+        else:
+            logger.error(f"CoinGecko API error: {response.status_code}")
+            return {}
                 
     except Exception as e:
         logger.error(f"Error fetching crypto prices: {str(e)}")
         return {}
 
+async def fetch_doma_trending():
+    """Get trending domains from Doma Protocol testnet."""
+    # Import the real Doma integration service
+    from app.services.doma_integration_real import DomaIntegrationService
+    return await DomaIntegrationService().get_trending_domains(DOMA_TRENDING_LIMIT)
+
+market_data_refresher.add_job("crypto_prices", fetch_crypto_prices, settings.MARKET_REFRESH_PRICES_SECONDS)
+market_data_refresher.add_job("doma_trending", fetch_doma_trending, settings.MARKET_REFRESH_DOMA_SECONDS)
+
+# Upstreams whose HTTP clients the lifespan opens before serving
+UPSTREAM_URLS = ["https://api.coingecko.com"]
+
 def calculate_realistic_domain_score(domain: str) -> Dict[str, Any]:
     """Calculate a more realistic domain score based on actual domain characteristics."""
     name = domain.split('.')[0] if '.' in domain else domain
@@ -74,16 +88,11 @@ def calculate_realistic_domain_score(domain: str) -> Dict[str, Any]:
     length_score = max(0, 100 - (len(name) - 3) * 5)  # 3 chars = 100, 20+ chars = 0
     
     # TLD popularity (realistic values)
-    tld_scores = {
-        'eth': 95, 'crypto': 90, 'nft': 85, 'dao': 80,
-        'com': 70, 'org': 60, 'net': 50, 'io': 75,
-        'xyz': 40, 'app': 65, 'dev': 55, 'tech': 60
-    }
-    tld_score = tld_scores.get(tld.lower(), 30)
+    config = scoring_config_store.current
+    tld_score = config.realistic_tld_scores.get(tld.lower(), 30)
     
     # Keyword value (simplified)
-    high_value_keywords = ['crypto', 'nft', 'defi', 'web3', 'ai', 'meta', 'blockchain', 'dao']
-    keyword_score = 80 if any(keyword in name.lower() for keyword in high_value_keywords) else 50
+    keyword_score = 80 if config.high_value_matcher.contains_any(name) else 50
     
     # Rarity (shorter names are rarer)
     rarity_score = max(20, 100 - len(name) * 3)
@@ -116,6 +125,16 @@ def calculate_realistic_domain_score(domain: str) -> Dict[str, Any]:
         }
     }
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Refresh market data in the background and keep pooled upstream HTTP connections."""
+    http_clients.open(UPSTREAM_URLS)
+    if settings.MARKET_REFRESH_ENABLED:
+        market_data_refresher.start()
+    yield
+    await market_data_refresher.stop()
+    await http_clients.aclose()
+
 # Create FastAPI app
 app = FastAPI(
     title="Doma Advisor API",
@@ -123,6 +142,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -378,6 +398,12 @@ async def get_portfolio(user_id: str):
 @app.get("/api/doma/trending")
 async def get_trending_domains(limit: int = 20):
     """Get trending domains from Doma Protocol testnet."""
+    # Served from the background refresh when it covers the requested limit
+    if limit <= DOMA_TRENDING_LIMIT:
+        snapshot = await market_data_refresher.latest("doma_trending")
+        if snapshot is not None:
+            return snapshot.data[:limit]
+    
     try:
         # Import the real Doma integration service
         from app.services.doma_integration_real import DomaIntegrationService
@@ -539,6 +565,16 @@ async def execute_doma_trade(request: DomainTradeRequest):
             "timestamp": datetime.utcnow().isoformat()
         }
 
+@app.get("/api/http/stats")
+async def get_http_stats():
+    """Get per-host request counters and connection pool utilization."""
+    return http_clients.stats()
+
+@app.get("/api/market/refresh")
+async def get_market_refresh_stats():
+    """Get background market data refresh jobs and the snapshots they published."""
+    return market_data_refresher.stats()
+
 if __name__ == "__main__":
     uvicorn.run(
         "main-simple:app",
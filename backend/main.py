@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
@@ -9,6 +10,9 @@ from app.api.routes import auth, domains, portfolio, recommendations, trends
 from app.core.config import settings
 from app.core.database import engine
 from app.models import Base
+from app.services.analysis_executor import analysis_executor
+from app.services.model_retraining import model_retrainer
+from app.services.scoring_executor import scoring_executor
 
 # Load environment variables
 load_dotenv()
@@ -16,6 +20,16 @@ load_dotenv()
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Retrain the model in the background and stop the worker pools on shutdown."""
+    if settings.AI_RETRAIN_ENABLED:
+        model_retrainer.start()
+    yield
+    await model_retrainer.stop()
+    analysis_executor.shutdown()
+    scoring_executor.shutdown()
+
 # Create FastAPI app
 app = FastAPI(
     title="Doma Advisor API",
@@ -23,6 +37,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware